@@ -0,0 +1,91 @@
+"""Many concurrent lookups from one event loop with AsyncAxl, against the local stand-in server.
+
+    python benchmarks/async_client.py [--lookups 200] [--concurrency 50] [--delay 0.05]
+                                      [--phones 20000]
+
+Each lookup is a run_sql_query() that the server takes `--delay` seconds to answer. The same
+lookups are made one after another with axl and concurrently with AsyncAxl. Then both list
+`--phones` phones with get_phones(), 1,000 to a page, which AsyncAxl can't overlap; it should
+keep up with axl rather than lose time to handling the pages.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from ciscoaxl import AsyncAxl, axl
+from mock_axl import MockAXLServer, PhoneInventory
+
+SQL_RESPONSE = (
+    '<ns:executeSQLQueryResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+    "<return><row><name>SEP001122334455</name></row></return></ns:executeSQLQueryResponse>"
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--phones", type=int, default=20000)
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+    query = "select name from device"
+    options = dict(operations=["executeSQLQuery"])
+
+    with MockAXLServer(responder=lambda op, body: SQL_RESPONSE, delay=args.delay) as server:
+        ucm = axl("u", "p", "127.0.0.1", "12.5", cucm_port=server.port, **options)
+        start = time.perf_counter()
+        for _ in range(args.lookups):
+            assert ucm.run_sql_query(query)["num_rows"] == 1
+        sync_time = time.perf_counter() - start
+
+        async def run_async() -> float:
+            async with AsyncAxl(
+                "u", "p", "127.0.0.1", "12.5", cucm_port=server.port,
+                max_concurrency=args.concurrency, **options
+            ) as aucm:
+                start = time.perf_counter()
+                results = await asyncio.gather(
+                    *(aucm.run_sql_query(query) for _ in range(args.lookups))
+                )
+                elapsed = time.perf_counter() - start
+            assert all(r["num_rows"] == 1 for r in results)
+            return elapsed
+
+        async_time = asyncio.run(run_async())
+
+    tags = {"name": "", "description": ""}
+    options = dict(operations=["listPhone"], page_size=1000)
+    with MockAXLServer(responder=PhoneInventory(args.phones)) as server:
+        ucm = axl("u", "p", "127.0.0.1", "12.5", cucm_port=server.port, **options)
+        start = time.perf_counter()
+        assert len(ucm.get_phones(tagfilter=tags)) == args.phones
+        sync_list_time = time.perf_counter() - start
+
+        async def list_async() -> float:
+            async with AsyncAxl(
+                "u", "p", "127.0.0.1", "12.5", cucm_port=server.port, **options
+            ) as aucm:
+                start = time.perf_counter()
+                assert len(await aucm.get_phones(tagfilter=tags)) == args.phones
+                return time.perf_counter() - start
+
+        async_list_time = asyncio.run(list_async())
+
+    print(f"{'client':<28} {'seconds':>8} {'lookups/s':>10}")
+    for name, seconds in (
+        ("axl, sequential", sync_time),
+        (f"AsyncAxl, {args.concurrency} in flight", async_time),
+    ):
+        print(f"{name:<28} {seconds:>8.2f} {args.lookups / seconds:>10.0f}")
+    print(f"\n{'get_phones()':<28} {'seconds':>8}")
+    for name, seconds in (("axl", sync_list_time), ("AsyncAxl", async_list_time)):
+        print(f"{name:<28} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Provisioning throughput of add_directory_number() in a loop versus axl.bulk().
+
+    python benchmarks/bulk.py [--lines 500] [--delay 0.05] [--workers 4 16]
+
+The local stand-in server (benchmarks/mock_axl.py, in its own process) takes `--delay`
+seconds to answer each addLine, standing in for the time UCM spends writing to its database.
+"""
+
+import argparse
+import os
+import time
+
+from ciscoaxl import axl
+from mock_axl import server_process
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 16])
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+    items = [{"pattern": str(1000 + i), "partition": "Internal_PT"} for i in range(args.lines)]
+
+    with server_process(delay=args.delay) as port:
+        ucm = axl(
+            "u", "p", "127.0.0.1", "12.5", cucm_port=port,
+            operations=["addLine"], pool_maxsize=max(args.workers),
+        )
+        print(f"{'mode':<16} {'seconds':>8} {'lines/s':>8}")
+        start = time.perf_counter()
+        results = [ucm.add_directory_number(**item) for item in items]
+        elapsed = time.perf_counter() - start
+        assert not any(isinstance(r, Exception) for r in results)
+        print(f"{'loop':<16} {elapsed:>8.2f} {args.lines / elapsed:>8.0f}")
+        for workers in args.workers:
+            start = time.perf_counter()
+            results = ucm.bulk("add_directory_number", items, workers=workers)
+            elapsed = time.perf_counter() - start
+            assert len(results) == args.lines
+            assert not any(isinstance(r, Exception) for r in results)
+            name = f"bulk, {workers} workers"
+            print(f"{name:<16} {elapsed:>8.2f} {args.lines / elapsed:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
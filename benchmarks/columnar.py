@@ -0,0 +1,90 @@
+"""Time and peak memory of loading a SQL export as row dicts versus as columns.
+
+    python benchmarks/columnar.py [--rows 100000]
+
+The local stand-in server (benchmarks/mock_axl.py, in its own process) answers `select * from
+device` with a synthetic table of `--rows` rows: a unique pkid, name and description, and a
+low-cardinality tkmodel and isactive. Each mode runs in a fresh process and keeps its result
+until it reports how far its peak RSS rose above what it used once the client was connected.
+The pandas modes run only when pandas is installed.
+"""
+
+import argparse
+import importlib.util
+import os
+import resource
+import subprocess  # nosec
+import sys
+import time
+
+QUERY = "select pkid, name, description, tkmodel, isactive from device order by pkid"
+TYPES = {"tkmodel": "int", "isactive": "bool"}
+MODES = (
+    "run_sql_query",
+    "run_sql_query, pandas",
+    "sql_columns",
+    "sql_columns, typed",
+    "sql_columns, pandas",
+)
+
+
+def child(mode: str, port: int) -> None:
+    from ciscoaxl import axl
+
+    ucm = axl("u", "p", "127.0.0.1", "12.5", cucm_port=port, operations=["executeSQLQuery"])
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    cpu = time.process_time()
+    if mode == "run_sql_query":
+        result = ucm.run_sql_query(QUERY)["rows"]
+    elif mode == "run_sql_query, pandas":
+        import pandas
+
+        result = pandas.DataFrame(ucm.run_sql_query(QUERY)["rows"])
+        result = result.astype({"tkmodel": int, "isactive": "category"})
+    elif mode == "sql_columns":
+        result = ucm.sql_columns(QUERY)
+    elif mode == "sql_columns, typed":
+        result = ucm.sql_columns(QUERY, types=TYPES)
+    else:
+        result = ucm.sql_columns(QUERY, types=TYPES).to_pandas()
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rows = getattr(result, "num_rows", None) or len(result)
+    print(f"{mode:<24} {rows:>8} {elapsed:>8.2f} {cpu:>8.2f} "
+          f"{(peak - baseline) / 1024:>8.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PORT"))
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+    if args.child:
+        child(args.child[0], int(args.child[1]))
+        return
+
+    from mock_axl import DeviceTable, server_process
+
+    # found rather than imported, so it doesn't add to the children's starting RSS
+    if importlib.util.find_spec("pandas") is None:
+        modes = [mode for mode in MODES if "pandas" not in mode]
+    else:
+        modes = list(MODES)
+    # not in this process: a child starts with the peak RSS of the process it was forked from
+    with server_process(responder=DeviceTable(args.rows)) as port:
+        print(f"{'mode':<24} {'rows':>8} {'seconds':>8} {'CPU s':>8} {'peak MB':>8}")
+        for mode in modes:
+            subprocess.run(  # nosec
+                [sys.executable, __file__, "--child", mode, str(port)],
+                check=True,
+                stderr=subprocess.DEVNULL,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Request throughput from many threads sharing one session, against a local TLS stand-in server.
+
+    python benchmarks/connection_pool.py [--threads 32] [--requests 2000]
+
+Compares a plain requests Session (what axl() used to build) with the AXLAdapter session
+from ciscoaxl.transport, with and without TLS session reuse. Halfway through, every pooled
+connection is dropped, as UCM does with idle ones, so the second half has to reconnect. Also
+reports how many TLS handshakes the server saw and how many of those resumed an earlier session.
+"""
+
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from requests import Session
+
+from ciscoaxl.transport import build_session
+from mock_axl import MockAXLServer
+
+BODY = b'<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"/>'
+
+
+def run(session: Session, url: str, cert: str, threads: int, requests: int) -> float:
+    headers = {"SOAPAction": '"CUCM:DB ver=12.5 getPhone"', "Content-Type": "text/xml"}
+
+    def call(_):
+        # per request, a REQUESTS_CA_BUNDLE in the environment would override session.verify
+        session.post(url, data=BODY, headers=headers, timeout=10, verify=cert).content
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(call, range(requests // 2)))
+        session.get_adapter(url).poolmanager.clear()
+        list(pool.map(call, range(requests - requests // 2)))
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    # "Connection pool is full" warnings are expected for the plain session
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+
+    with MockAXLServer() as server:
+        url = f"https://127.0.0.1:{server.port}/axl/"
+
+        plain = Session()
+        plain.auth = ("u", "p")
+        sessions = {
+            "plain Session": plain,
+            "AXLAdapter, no TLS reuse": build_session(
+                ("u", "p"), pool_maxsize=args.threads, tls_session_reuse=False
+            ),
+            "AXLAdapter": build_session(("u", "p"), pool_maxsize=args.threads),
+        }
+        print(f"{'session':<26} {'req/s':>8} {'handshakes':>11} {'resumed':>8}")
+        for name, session in sessions.items():
+            server.reset()
+            rate = run(session, url, str(server.cert), args.threads, args.requests)
+            stats = server.stats
+            print(f"{name:<26} {rate:>8.0f} {stats['handshakes']:>11} {stats['resumed']:>8}")
+            session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Import time of the package and its lightweight modules, tracked across releases.
+
+    python benchmarks/import_time.py [--runs 7] [--record]
+
+Every measurement runs in a fresh interpreter. --record appends the medians to
+benchmarks/import_time.csv, tagged with the package version from pyproject.toml, so that
+regressions show up when the file is compared between releases.
+"""
+
+import argparse
+import csv
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY = Path(__file__).resolve().parent / "import_time.csv"
+MODULES = [
+    "ciscoaxl",
+    "ciscoaxl.exceptions",
+    "ciscoaxl.helpers",
+    "ciscoaxl.axl",
+]
+
+
+def _package_version() -> str:
+    match = re.search(
+        r'^version = "([^"]+)"', (ROOT / "pyproject.toml").read_text(), re.MULTILINE
+    )
+    return match.group(1) if match else "unknown"
+
+
+def measure(module: str, runs: int) -> float:
+    """Median wall time in ms of `import module` in a fresh interpreter, minus interpreter startup"""
+
+    def run(statement: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True, cwd=ROOT)  # nosec
+        return time.perf_counter() - start
+
+    baseline = statistics.median(run("pass") for _ in range(runs))
+    return max(0.0, statistics.median(run(f"import {module}") for _ in range(runs)) - baseline) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+
+    version = _package_version()
+    python = platform.python_version()
+    rows = []
+    print(f"{'module':<24} {'ms':>8}")
+    for module in MODULES:
+        ms = measure(module, args.runs)
+        rows.append([version, python, module, f"{ms:.1f}"])
+        print(f"{module:<24} {ms:>8.1f}")
+
+    if args.record:
+        new_file = not HISTORY.exists()
+        with open(HISTORY, "a", newline="") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(["version", "python", "module", "ms"])
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""A local TLS stand-in for the CUCM AXL endpoint, used by the benchmarks.
+
+The server answers GET /axl/ with 200 (the axl() connectivity check) and every SOAP POST with
+whatever its `responder` returns for the operation named in the SOAPAction header. Like UCM, it
+hands out a JSESSIONID cookie and accepts it in place of credentials.
+With a `capacity`, it answers 503 to requests beyond that many in progress, as UCM throttles AXL,
+or with `overflow="queue"` makes them wait for their turn, as a busy UCM does.
+It counts TLS handshakes, resumed sessions, requests, authentications and throttled requests
+so benchmarks can report on them.
+"""
+
+import bisect
+import contextlib
+import multiprocessing
+import re
+import secrets
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+SOAP_ENVELOPE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">'
+    "<soapenv:Body>{body}</soapenv:Body></soapenv:Envelope>"
+)
+
+
+def default_responder(operation: str, request: bytes) -> str:
+    """Answers any operation with an empty <return/>, which is valid for every AXL response"""
+    return (
+        f'<ns:{operation}Response xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+        f"<return></return></ns:{operation}Response>"
+    )
+
+
+class PhoneInventory:
+    """Responder serving listPhone from a synthetic inventory of `count` phones.
+
+    Honours skip/first and a `name` searchCriteria with a trailing % (e.g. 'SEP0A%'). Names
+    are SEP followed by 12 hex digits, spread evenly over the hex range like MAC addresses.
+    Also answers executeSQLQuery 'select count(*) ... like ...' with the number of matches.
+    Like UCM, it refuses requests for more than `max_rows` records with a "Query request too
+    large" fault, and takes `skip_cost` seconds per 1,000 rows skipped, because the database
+    still walks every row before the offset.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        description: str = "Synthetic phone",
+        max_rows: Optional[int] = None,
+        skip_cost: float = 0.0,
+    ) -> None:
+        step = 16 ** 12 // max(count, 1)
+        self.names = [f"SEP{i * step:012X}" for i in range(count)]
+        self.description = description
+        self.max_rows = max_rows
+        self.skip_cost = skip_cost
+
+    def matching(self, pattern: str) -> List[str]:
+        prefix = pattern.rstrip("%")
+        if "%" in prefix or "_" in prefix:
+            regex = re.compile(re.escape(pattern).replace("%", ".*").replace("_", "."))
+            return [n for n in self.names if regex.fullmatch(n)]
+        start = bisect.bisect_left(self.names, prefix)
+        end = bisect.bisect_left(self.names, prefix + "\uffff") if pattern.endswith("%") else (
+            start + (start < len(self.names) and self.names[start] == prefix)
+        )
+        return self.names[start:end]
+
+    def record(self, name: str) -> str:
+        return (
+            f'<phone uuid="{{{name[3:11]}-0000-0000-0000-{name[3:15]}}}">'
+            f"<name>{name}</name><description>{self.description}</description>"
+            "<product>Cisco 8865</product><protocol>SIP</protocol>"
+            "<locationName>Hub_None</locationName>"
+            "<callingSearchSpaceName>Internal</callingSearchSpaceName></phone>"
+        )
+
+    def count(self, request: str) -> str:
+        pattern = re.search(r"like\s+'([^']*)'", request, re.IGNORECASE)
+        count = len(self.matching(pattern.group(1) if pattern else "%"))
+        return (
+            '<ns:executeSQLQueryResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+            f"<return><row><count>{count}</count></row></return></ns:executeSQLQueryResponse>"
+        )
+
+    def __call__(self, operation: str, request: bytes) -> str:
+        text = request.decode()
+        if operation == "executeSQLQuery":
+            return self.count(text)
+        pattern = re.search(r"<name>([^<]*)</name>", text)
+        skip = re.search(r"<skip>(\d+)</skip>", text)
+        first = re.search(r"<first>(\d+)</first>", text)
+        names = self.matching(pattern.group(1) if pattern else "%")
+        start = int(skip.group(1)) if skip else 0
+        end = start + int(first.group(1)) if first else len(names)
+        if self.skip_cost and start:
+            threading.Event().wait(self.skip_cost * start / 1000)
+        if self.max_rows and min(end, len(names)) - start > self.max_rows:
+            return 500, (
+                "<soapenv:Fault><faultcode>soapenv:Server</faultcode><faultstring>"
+                f"Query request too large. Total rows matched: {len(names)} rows. "
+                f"Suggestive Row Fetch: less than {self.max_rows + 1} rows"
+                "</faultstring></soapenv:Fault>"
+            )
+        rows = "".join(self.record(n) for n in names[start:end])
+        return (
+            f'<ns:{operation}Response xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+            f"<return>{rows}</return></ns:{operation}Response>"
+        )
+
+
+class DeviceTable:
+    """Responder serving executeSQLQuery from a synthetic `device` table of `count` rows.
+
+    Honours Informix's SKIP/FIRST (e.g. 'select skip 1000 first 500 ...') and answers
+    'select count(*) ...' with the row count. Rows have pkid, name, description, tkmodel and
+    isactive columns. Like UCM, it refuses results of more than `max_rows` rows with a
+    "Query request too large" fault.
+    """
+
+    def __init__(self, count: int, max_rows: Optional[int] = None) -> None:
+        self.count = count
+        self.max_rows = max_rows
+
+    @staticmethod
+    def row(i: int) -> str:
+        return (
+            f"<row><pkid>{i:08x}-0000-4000-8000-{i:012x}</pkid><name>SEP{i:012X}</name>"
+            f"<description>Phone {i}</description><tkmodel>{36213 + i % 7}</tkmodel>"
+            f"<isactive>{'t' if i % 5 else 'f'}</isactive></row>"
+        )
+
+    def __call__(self, operation: str, request: bytes) -> str:
+        sql = re.search(r"<sql>([^<]*)</sql>", request.decode()).group(1).lower()
+        if "count(*)" in sql:
+            rows = f"<row><count>{self.count}</count></row>"
+        else:
+            skip = re.search(r"\bskip\s+(\d+)", sql)
+            first = re.search(r"\bfirst\s+(\d+)", sql)
+            start = min(int(skip.group(1)), self.count) if skip else 0
+            end = min(start + int(first.group(1)), self.count) if first else self.count
+            if self.max_rows and end - start > self.max_rows:
+                return 500, (
+                    "<soapenv:Fault><faultcode>soapenv:Server</faultcode><faultstring>"
+                    f"Query request too large. Total rows matched: {end - start} rows. "
+                    f"Suggestive Row Fetch: less than {self.max_rows + 1} rows"
+                    "</faultstring></soapenv:Fault>"
+                )
+            rows = "".join(self.row(i) for i in range(start, end))
+        return (
+            f'<ns:{operation}Response xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+            f"<return>{rows}</return></ns:{operation}Response>"
+        )
+
+
+def make_certificate(directory: Path) -> Path:
+    """Creates a self-signed certificate for 127.0.0.1/localhost with the openssl CLI
+
+    :return: Path to a PEM file holding both the certificate and its key
+    """
+    pem = directory / "server.pem"
+    subprocess.run(  # nosec
+        [
+            shutil.which("openssl") or "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=IP:127.0.0.1,DNS:localhost",
+            "-keyout",
+            str(pem),
+            "-out",
+            str(directory / "cert.pem"),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    pem.write_text(pem.read_text() + (directory / "cert.pem").read_text())
+    return pem
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        # handshake here rather than in accept() so it doesn't serialize the server
+        # headers and body go out in separate writes, don't let Nagle hold the body back
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.request.do_handshake()
+        self.server.count("handshakes")
+        if self.request.session_reused:
+            self.server.count("resumed")
+        super().setup()
+
+    def _reply(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        # credentials are checked whenever they are sent, even alongside a valid session
+        if self.headers.get("Authorization", "").startswith("Basic "):
+            self.server.count("authentications")
+            if self.server.auth_delay:
+                threading.Event().wait(self.server.auth_delay)
+            self._session = self.server.new_session()
+            return True
+        match = re.search(r"JSESSIONID=(\w+)", self.headers.get("Cookie", ""))
+        self._session = None
+        return bool(match) and self.server.valid_session(match.group(1))
+
+    def send_response(self, code, message=None) -> None:
+        super().send_response(code, message)
+        if getattr(self, "_session", None):
+            self.send_header("Set-Cookie", f"JSESSIONID={self._session}; Path=/; Secure")
+            self._session = None
+
+    def do_GET(self) -> None:
+        if not self._authorized():
+            self._reply(401, b"")
+            return
+        self._reply(200, b"")
+
+    def do_POST(self) -> None:
+        request = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.count("requests")
+        if not self._authorized():
+            self._reply(401, b"")
+            return
+        if not self.server.admit():
+            self.server.count("throttled")
+            self._reply(503, b"AXL service is too busy")
+            return
+        try:
+            match = re.search(r"(\w+)\"?$", self.headers.get("SOAPAction", ""))
+            operation = match.group(1) if match else ""
+            if self.server.delay:
+                threading.Event().wait(self.server.delay)
+            body = self.server.responder(operation, request)
+        finally:
+            self.server.leave()
+        if isinstance(body, tuple):
+            status, body = body
+        else:
+            status = 200
+        self._reply(status, SOAP_ENVELOPE.format(body=body).encode())
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class MockAXLServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        responder: Callable[[str, bytes], str] = default_responder,
+        delay: float = 0.0,
+        auth_delay: float = 0.0,
+        capacity: Optional[int] = None,
+        overflow: str = "reject",
+    ) -> None:
+        """
+        :param responder: Called with (operation, request body), returns the SOAP body XML
+            or a (status, body) tuple
+        :param delay: Seconds to wait before answering each POST, to stand in for server work
+        :param auth_delay: Seconds each credential check takes, to stand in for LDAP
+        :param capacity: Requests served at once, default no limit
+        :param overflow: What happens to requests beyond `capacity`: 'reject' answers 503,
+            'queue' makes them wait
+        """
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.responder = responder
+        self.delay = delay
+        self.auth_delay = auth_delay
+        self.capacity = capacity
+        self.overflow = overflow
+        self.active = 0
+        self._slots = threading.Semaphore(capacity or 1)
+        self.stats: Dict[str, int] = {
+            "handshakes": 0,
+            "resumed": 0,
+            "requests": 0,
+            "authentications": 0,
+            "throttled": 0,
+        }
+        self._sessions: Set[str] = set()
+        self._lock = threading.Lock()
+        self._tmp = Path(tempfile.mkdtemp())
+        self.cert = make_certificate(self._tmp)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(str(self.cert))
+        self.socket = context.wrap_socket(
+            self.socket, server_side=True, do_handshake_on_connect=False
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    def handle_error(self, request, client_address) -> None:
+        # clients that reject the self-signed certificate are expected
+        if not isinstance(sys.exc_info()[1], (ssl.SSLError, ConnectionError)):
+            super().handle_error(request, client_address)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def admit(self) -> bool:
+        """Takes one of the `capacity` slots, False when they are all taken"""
+        if self.capacity is not None and self.overflow == "queue":
+            self._slots.acquire()
+            return True
+        with self._lock:
+            if self.capacity is not None and self.active >= self.capacity:
+                return False
+            self.active += 1
+            return True
+
+    def leave(self) -> None:
+        if self.capacity is not None and self.overflow == "queue":
+            self._slots.release()
+            return
+        with self._lock:
+            self.active -= 1
+
+    def new_session(self) -> str:
+        session = secrets.token_hex(16)
+        with self._lock:
+            self._sessions.add(session)
+        return session
+
+    def valid_session(self, session: str) -> bool:
+        return session in self._sessions
+
+    def expire_sessions(self) -> None:
+        """Forgets every session, as UCM does when they time out"""
+        with self._lock:
+            self._sessions.clear()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats = {k: 0 for k in self.stats}
+
+    def __enter__(self) -> "MockAXLServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+
+def _serve(kwargs: dict, ports, stop) -> None:
+    with MockAXLServer(**kwargs) as server:
+        ports.put(server.port)
+        stop.wait()
+
+
+@contextlib.contextmanager
+def server_process(**kwargs) -> Iterator[int]:
+    """Runs a MockAXLServer in a child process, so it doesn't compete with the client for
+    the GIL. Stats aren't available this way.
+
+    :param kwargs: Passed on to MockAXLServer
+    :return: The server's port
+    """
+    context = multiprocessing.get_context("fork")
+    ports = context.Queue()
+    stop = context.Event()
+    process = context.Process(target=_serve, args=(kwargs, ports, stop), daemon=True)
+    process.start()
+    try:
+        yield ports.get(timeout=30)
+    finally:
+        stop.set()
+        process.join(timeout=10)
@@ -0,0 +1,79 @@
+"""Schema load time and memory for the full AXL schema against an operation subset.
+
+    python benchmarks/operation_subset.py [--version 12.5] [listPhone getPhone ...]
+
+Each case runs in its own interpreter so resident memory is measured from a clean start.
+The on-disk schema cache is disabled so both cases are genuine parses; the subset itself is
+built (and cached) by the parent process before timing starts.
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+DEFAULT_OPERATIONS = [
+    "listPhone",
+    "getPhone",
+    "addPhone",
+    "updatePhone",
+    "removePhone",
+    "listLine",
+    "getLine",
+    "addLine",
+    "updateLine",
+    "listUser",
+    "getUser",
+    "updateUser",
+    "executeSQLQuery",
+    "executeSQLUpdate",
+]
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def child(version: str, operations: list) -> None:
+    from zeep.transports import Transport
+    from ciscoaxl import schema
+
+    baseline = _rss_mb()
+    start = time.perf_counter()
+    document = schema.load_document(
+        version, schema.default_settings(), Transport(), cache=False, operations=operations
+    )
+    elapsed = time.perf_counter() - start
+    label = f"{len(operations)} ops" if operations else "full"
+    count = sum(1 for _ in document.types.types)
+    print(f"{label:>10} {count:>10} {elapsed:>10.2f} {_rss_mb() - baseline:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--version", default="12.5")
+    parser.add_argument("--child", action="store_true")
+    parser.add_argument("operations", nargs="*")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.version, args.operations)
+        return
+
+    from ciscoaxl import subset
+
+    operations = args.operations or DEFAULT_OPERATIONS
+    subset.build_subset(args.version, operations)
+    print(f"{'schema':>10} {'types':>10} {'seconds':>10} {'RSS +MB':>12}")
+    for ops in ([], operations):
+        subprocess.run(  # nosec
+            [sys.executable, __file__, "--child", "--version", args.version, *ops],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
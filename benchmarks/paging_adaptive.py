@@ -0,0 +1,61 @@
+"""Fixed versus adaptive page sizes, for wide records (UCM caps the rows per request) and thin
+records (small, quick pages).
+
+    python benchmarks/paging_adaptive.py [--phones 20000] [--delay 0.3]
+
+The local stand-in server (benchmarks/mock_axl.py, in its own process) takes `--delay` seconds
+per request. For the wide inventory it refuses requests for more than 400 rows, as UCM does
+when a response would exceed its memory limit.
+"""
+
+import argparse
+import os
+import time
+
+from zeep.exceptions import Fault
+
+from ciscoaxl import axl
+from mock_axl import PhoneInventory, server_process
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--phones", type=int, default=20000)
+    parser.add_argument("--delay", type=float, default=0.3)
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+
+    inventories = {
+        "thin": PhoneInventory(args.phones),
+        "wide": PhoneInventory(args.phones, description="x" * 2000, max_rows=400),
+    }
+    print(
+        f"{'records':<8} {'paging':<9} {'seconds':>8} {'requests':>9} {'faults':>7} "
+        f"{'page sizes':>12}"
+    )
+    for name, inventory in inventories.items():
+        with server_process(responder=inventory, delay=args.delay) as port:
+            for adaptive in (False, True):
+                ucm = axl(
+                    "u", "p", "127.0.0.1", "12.5", cucm_port=port,
+                    operations=["listPhone"], adaptive_paging=adaptive,
+                )
+                start = time.perf_counter()
+                try:
+                    count = sum(1 for _ in ucm.iter_phones(tagfilter={"name": ""}))
+                    assert count == args.phones
+                    elapsed = f"{time.perf_counter() - start:>8.2f}"
+                except Fault:
+                    elapsed = f"{'Fault':>8}"
+                stats = ucm.last_paging_stats
+                sizes = f"{stats.smallest_page_size}-{stats.largest_page_size}"
+                print(
+                    f"{name:<8} {'adaptive' if adaptive else 'fixed':<9} {elapsed} "
+                    f"{stats.requests:>9} {stats.faults:>7} {sizes:>12}"
+                )
+
+
+if __name__ == "__main__":
+    main()
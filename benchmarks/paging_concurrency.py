@@ -0,0 +1,47 @@
+"""Time to list an inventory with pages fetched one after another or several at once.
+
+    python benchmarks/paging_concurrency.py [--phones 10000] [--page-size 500] [--delay 1.0]
+
+The local stand-in server (benchmarks/mock_axl.py, in its own process) takes `--delay`
+seconds to produce each page, standing in for the time UCM spends querying its database.
+"""
+
+import argparse
+import os
+import time
+
+from ciscoaxl import axl
+from mock_axl import PhoneInventory, server_process
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--phones", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+
+    inventory = PhoneInventory(args.phones)
+    with server_process(responder=inventory, delay=args.delay) as port:
+        ucm = axl(
+            "u", "p", "127.0.0.1", "12.5", cucm_port=port,
+            operations=["listPhone"], page_size=args.page_size,
+        )
+        print(f"{'workers':>7} {'seconds':>8} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            ucm.page_workers = workers
+            start = time.perf_counter()
+            names = [phone["name"] for phone in ucm.iter_phones(tagfilter={"name": ""})]
+            elapsed = time.perf_counter() - start
+            assert names == inventory.names
+            baseline = baseline or elapsed
+            print(f"{workers:>7} {elapsed:>8.2f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Peak memory of get_phones() versus iter_phones() over a large synthetic inventory.
+
+    python benchmarks/paging_memory.py [--phones 60000] [--page-size 1000]
+
+The local stand-in server (benchmarks/mock_axl.py) serves the inventory. Each mode runs in a
+fresh process, which reports how far its peak RSS rose above what it used once the client
+was connected.
+"""
+
+import argparse
+import os
+import resource
+import subprocess  # nosec
+import sys
+import time
+
+
+def child(mode: str, port: int, page_size: int) -> None:
+    from ciscoaxl import axl
+
+    ucm = axl("u", "p", "127.0.0.1", "12.5", cucm_port=port, operations=["listPhone"])
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "get_phones":
+        count = len(ucm.get_phones(page_size=page_size))
+    else:
+        count = 0
+        for phone in ucm.iter_phones(page_size=page_size):
+            count += phone["name"] is not None
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode:<12} {count:>8} {elapsed:>8.1f} {(peak - baseline) / 1024:>10.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--phones", type=int, default=60000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PORT"))
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+    if args.child:
+        child(args.child[0], int(args.child[1]), args.page_size)
+        return
+
+    from mock_axl import MockAXLServer, PhoneInventory
+
+    with MockAXLServer(responder=PhoneInventory(args.phones)) as server:
+        print(f"{'mode':<12} {'phones':>8} {'seconds':>8} {'peak MB':>10}")
+        for mode in ("get_phones", "iter_phones"):
+            subprocess.run(  # nosec
+                [sys.executable, __file__, "--page-size", str(args.page_size),
+                 "--child", mode, str(server.port)],
+                check=True,
+                stderr=subprocess.DEVNULL,
+            )
+
+
+if __name__ == "__main__":
+    main()
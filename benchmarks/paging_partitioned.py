@@ -0,0 +1,69 @@
+"""Time to list a large inventory with skip offsets versus prefix partitions.
+
+    python benchmarks/paging_partitioned.py [--phones 50000] [--page-size 1000]
+        [--delay 0.1] [--skip-cost 0.02] [--partition-size 5000]
+
+The local stand-in server (benchmarks/mock_axl.py, in its own process) takes `--delay`
+seconds per request plus `--skip-cost` seconds per 1,000 rows skipped, the way UCM's
+database walks every row before the offset. Partitions are checked for left out records with
+one deep request at the end, or with a SQL count(*) per split prefix.
+"""
+
+import argparse
+import os
+import time
+
+from ciscoaxl import axl
+from mock_axl import PhoneInventory, server_process
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--phones", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--delay", type=float, default=0.1)
+    parser.add_argument("--skip-cost", type=float, default=0.02)
+    parser.add_argument("--partition-size", type=int, default=5000)
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+
+    inventory = PhoneInventory(args.phones, skip_cost=args.skip_cost)
+    with server_process(responder=inventory, delay=args.delay) as port:
+        ucm = axl(
+            "u", "p", "127.0.0.1", "12.5", cucm_port=port,
+            operations=["executeSQLQuery", "listPhone"], page_size=args.page_size,
+        )
+
+        def count(prefix: str) -> int:
+            query = f"select count(*) from device where name like '{prefix}%'"
+            return int(ucm.run_sql_query(query)["rows"][0]["count"])
+
+        modes = [
+            ("skip", 1, lambda: ucm.iter_phones(tagfilter={"name": ""})),
+            ("skip", 4, lambda: ucm.iter_phones(tagfilter={"name": ""})),
+        ]
+        for workers in (1, 4):
+            for mode, counter in (("partitioned", None), ("+ count", count)):
+                modes.append((
+                    mode,
+                    workers,
+                    lambda counter=counter: ucm.iter_partitioned(
+                        "listPhone", {"name": "SEP%"}, {"name": ""},
+                        partition_size=args.partition_size, count=counter,
+                    ),
+                ))
+        print(f"{'mode':<12} {'workers':>7} {'requests':>8} {'seconds':>8}")
+        for mode, workers, listing in modes:
+            ucm.page_workers = workers
+            start = time.perf_counter()
+            names = [phone["name"] for phone in listing()]
+            elapsed = time.perf_counter() - start
+            assert names == inventory.names
+            requests = ucm.last_paging_stats.requests
+            print(f"{mode:<12} {workers:>7} {requests:>8} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Listing time when the caller does work on every page, with and without read-ahead.
+
+    python benchmarks/paging_prefetch.py [--phones 5000] [--page-size 500] [--delay 0.5] [--work 0.5]
+
+The local stand-in server (benchmarks/mock_axl.py, in its own process) takes `--delay` seconds
+per page, and the caller spends `--work` seconds on each page it receives.
+"""
+
+import argparse
+import os
+import time
+
+from ciscoaxl import axl
+from mock_axl import PhoneInventory, server_process
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--phones", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--work", type=float, default=0.5)
+    parser.add_argument("--prefetch", type=int, nargs="+", default=[0, 1, 2])
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+
+    with server_process(responder=PhoneInventory(args.phones), delay=args.delay) as port:
+        ucm = axl(
+            "u", "p", "127.0.0.1", "12.5", cucm_port=port,
+            operations=["listPhone"], page_size=args.page_size,
+        )
+        print(f"{'prefetch':>8} {'seconds':>8}")
+        for prefetch in args.prefetch:
+            start = time.perf_counter()
+            for page in ucm.iter_pages(
+                "listPhone", {"name": "%"}, {"name": ""}, prefetch=prefetch
+            ):
+                # stands in for the caller's own processing, which releases the GIL
+                time.sleep(args.work)
+            print(f"{prefetch:>8} {time.perf_counter() - start:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
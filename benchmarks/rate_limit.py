@@ -0,0 +1,88 @@
+"""Latency of interactive calls while a batch job floods the same server, with and without a
+budget for the batch job's class of operations.
+
+    python benchmarks/rate_limit.py [--threads 16] [--seconds 5] [--capacity 4] [--delay 0.05]
+        [--sql-rate 40]
+
+The local stand-in server (benchmarks/mock_axl.py, in its own process) serves `--capacity`
+requests at once, taking `--delay` seconds each, and queues the rest. `--threads` threads run
+executeSQLQuery as fast as they can for `--seconds` while one more thread makes getPhone calls
+one after another.
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ciscoaxl import axl
+from mock_axl import default_responder, server_process
+
+SQL_RESPONSE = (
+    '<ns:executeSQLQueryResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+    "<return><row><name>SEP001122334455</name></row></return></ns:executeSQLQueryResponse>"
+)
+
+
+def respond(operation: str, request: bytes) -> str:
+    if operation == "executeSQLQuery":
+        return SQL_RESPONSE
+    return default_responder(operation, request)
+
+
+def run(ucm: axl, threads: int, seconds: float) -> tuple:
+    stop = threading.Event()
+
+    def batch() -> int:
+        count = 0
+        while not stop.is_set():
+            ucm.run_sql_query("select name from device")
+            count += 1
+        return count
+
+    latencies = []
+    with ThreadPoolExecutor(threads) as pool:
+        futures = [pool.submit(batch) for _ in range(threads)]
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            ucm.client.getPhone(name="SEP001122334455")
+            latencies.append(time.perf_counter() - start)
+        stop.set()
+        queries = sum(f.result() for f in futures)
+    return queries / seconds, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--capacity", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--sql-rate", type=float, default=40)
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+
+    with server_process(
+        responder=respond, delay=args.delay, capacity=args.capacity, overflow="queue"
+    ) as port:
+        print(f"{'budget':<16} {'sql/s':>6} {'getPhone ms p50':>16} {'p95':>6}")
+        budgets = (("none", None), (f"sql {args.sql_rate:g}/s", {"sql": (args.sql_rate, 4)}))
+        for name, rate_limit in budgets:
+            ucm = axl(
+                "u", "p", "127.0.0.1", "12.5", cucm_port=port,
+                operations=["executeSQLQuery", "getPhone"],
+                pool_maxsize=args.threads + 1, rate_limit=rate_limit,
+            )
+            rate, latencies = run(ucm, args.threads, args.seconds)
+            p50 = statistics.median(latencies) * 1000
+            p95 = statistics.quantiles(latencies, n=20)[-1] * 1000
+            print(f"{name:<16} {rate:>6.0f} {p50:>16.0f} {p95:>6.0f}")
+
+
+if __name__ == "__main__":
+    main()
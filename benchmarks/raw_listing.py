@@ -0,0 +1,86 @@
+"""CPU time and peak memory of parsing a list* response with zeep versus the raw XML fast path.
+
+    python benchmarks/raw_listing.py [--rows 1000] [--repeat 20] [--fixture response.xml]
+
+Without `--fixture`, the response is a listPhone page of `--rows` records recorded from the
+local stand-in server's inventory (benchmarks/mock_axl.py). A recorded UCM response (the whole
+SOAP envelope, e.g. saved from a HistoryPlugin) can be passed with `--fixture` and
+`--operation`/`--item`. Both paths parse the same bytes; no network is involved.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import requests
+from zeep import Client
+from zeep.transports import Transport
+
+from ciscoaxl import schema
+from ciscoaxl.rawxml import parse_records
+from mock_axl import SOAP_ENVELOPE, PhoneInventory
+
+TAGS = ["name", "description", "product", "protocol", "locationName", "callingSearchSpaceName"]
+
+
+def recorded_page(rows: int) -> bytes:
+    inventory = PhoneInventory(rows)
+    request = f"<skip>0</skip><first>{rows}</first>".encode()
+    return SOAP_ENVELOPE.format(body=inventory("listPhone", request)).encode()
+
+
+def measure(parse, repeat: int) -> tuple:
+    start = time.process_time()
+    for _ in range(repeat):
+        records = parse()
+    cpu = (time.process_time() - start) / repeat
+    tracemalloc.start()
+    records = parse()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(records), cpu, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--fixture")
+    parser.add_argument("--operation", default="listPhone")
+    parser.add_argument("--item", default="phone")
+    parser.add_argument("--version", default="12.5")
+    args = parser.parse_args()
+    if args.fixture:
+        with open(args.fixture, "rb") as fixture:
+            content = fixture.read()
+    else:
+        content = recorded_page(args.rows)
+
+    document = schema.load_document(
+        args.version, schema.default_settings(), Transport(), cache=False
+    )
+    client = Client(document, settings=schema.default_settings())
+    binding = client.service._binding
+    operation = binding.get(args.operation)
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+
+    def zeep_path() -> list:
+        result = binding.process_reply(client, operation, response)["return"]
+        return [dict(record.__values__) for record in result[args.item]]
+
+    paths = (
+        ("zeep", zeep_path),
+        ("raw, dicts", lambda: parse_records(content, args.item)),
+        ("raw, tuples", lambda: parse_records(content, args.item, TAGS)),
+    )
+    print(f"{len(content) / 1024:.0f} KB response")
+    print(f"{'path':<12} {'records':>8} {'ms/page':>8} {'peak MB':>8}")
+    for name, parse in paths:
+        count, cpu, peak = measure(parse, args.repeat)
+        print(f"{name:<12} {count:>8} {cpu * 1000:>8.1f} {peak / 2 ** 20:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
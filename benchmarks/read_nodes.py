@@ -0,0 +1,75 @@
+"""Read throughput with every request on the publisher versus spread over several nodes.
+
+    python benchmarks/read_nodes.py [--lookups 300] [--workers 12] [--capacity 2] [--delay 0.05]
+
+Three local stand-in servers (benchmarks/mock_axl.py, each in its own process) play the
+publisher and two subscribers. Each serves `--capacity` requests at once, taking `--delay`
+seconds each, and queues the rest. The lookups are run_sql_query() calls made through
+axl.bulk(). The last run adds a node that refuses connections, to show it being taken out of
+rotation.
+"""
+
+import argparse
+import contextlib
+import os
+import socket
+import time
+
+from ciscoaxl import axl
+from mock_axl import server_process
+
+SQL_RESPONSE = (
+    '<ns:executeSQLQueryResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+    "<return><row><name>SEP001122334455</name></row></return></ns:executeSQLQueryResponse>"
+)
+
+
+def respond(operation: str, request: bytes) -> str:
+    return SQL_RESPONSE
+
+
+def closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lookups", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=12)
+    parser.add_argument("--capacity", type=int, default=2)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+    items = [{"query": "select name from device"}] * args.lookups
+    server = dict(responder=respond, delay=args.delay, capacity=args.capacity, overflow="queue")
+
+    with contextlib.ExitStack() as stack:
+        ports = [stack.enter_context(server_process(**server)) for _ in range(3)]
+        nodes = [f"127.0.0.1:{port}" for port in ports]
+        print(f"{'nodes':<28} {'seconds':>8} {'lookups/s':>10}")
+        for name, options in (
+            ("publisher only", {}),
+            ("3, round_robin", dict(read_nodes=nodes)),
+            ("3, least_loaded", dict(read_nodes=nodes, read_strategy="least_loaded")),
+            ("3 + 1 down, round_robin", dict(read_nodes=nodes + [f"127.0.0.1:{closed_port()}"])),
+        ):
+            ucm = axl(
+                "u", "p", "127.0.0.1", "12.5", cucm_port=ports[0],
+                operations=["executeSQLQuery"], pool_maxsize=args.workers, **options,
+            )
+            start = time.perf_counter()
+            results = ucm.bulk("run_sql_query", items, workers=args.workers)
+            elapsed = time.perf_counter() - start
+            assert all(r["num_rows"] == 1 for r in results)
+            print(f"{name:<28} {elapsed:>8.2f} {args.lookups / elapsed:>10.0f}")
+        for url, state in ucm.nodes.state().items():
+            print(f"  {url:<32} healthy={state['healthy']!s:<5} requests={state['requests']:<4} "
+                  f"failures={state['failures']} p50={(state['p50_latency'] or 0) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
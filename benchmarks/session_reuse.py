@@ -0,0 +1,60 @@
+"""Cost of authenticating every request versus reusing the UCM session cookie.
+
+    python benchmarks/session_reuse.py [--threads 8] [--requests 1000] [--auth-delay 0.02]
+
+Runs the same requests against the local stand-in server (benchmarks/mock_axl.py), once with
+credentials on every request and once reusing the session cookie. Halfway through the
+second run every session is expired, to show the client re-authenticating on its own.
+`--auth-delay` stands in for the time UCM spends checking credentials (e.g. against LDAP).
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ciscoaxl.transport import SessionCookieAuth, build_session
+from mock_axl import MockAXLServer
+
+BODY = b'<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"/>'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--auth-delay", type=float, default=0.02)
+    args = parser.parse_args()
+    headers = {"SOAPAction": '"CUCM:DB ver=12.5 getPhone"', "Content-Type": "text/xml"}
+    # a CA bundle from the environment would override session.verify
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+
+    with MockAXLServer(auth_delay=args.auth_delay) as server:
+        url = f"https://127.0.0.1:{server.port}/axl/"
+        print(f"{'mode':<16} {'req/s':>8} {'server auths':>13} {'client auths':>13} {'errors':>7}")
+        for reuse in (False, True):
+            server.reset()
+            auth = SessionCookieAuth("u", "p", reuse_session=reuse)
+            session = build_session(auth, verify=str(server.cert), pool_maxsize=args.threads)
+
+            def call(i):
+                if reuse and i == args.requests // 2:
+                    server.expire_sessions()
+                return session.post(url, data=BODY, headers=headers, timeout=10).status_code
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as pool:
+                codes = list(pool.map(call, range(args.requests)))
+            rate = args.requests / (time.perf_counter() - start)
+            errors = sum(code != 200 for code in codes)
+            name = "session cookie" if reuse else "basic auth"
+            print(
+                f"{name:<16} {rate:>8.0f} {server.stats['authentications']:>13} "
+                f"{auth.round_trips:>13} {errors:>7}"
+            )
+            session.close()
+
+
+if __name__ == "__main__":
+    main()
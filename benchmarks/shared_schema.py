@@ -0,0 +1,75 @@
+"""Construction time and memory for many clients of one schema version,
+with and without the process-wide shared schema registry.
+
+    python benchmarks/shared_schema.py [--clients 40] [--version 12.5]
+
+Each mode runs in its own interpreter so resident memory is measured from a clean start.
+The on-disk schema cache is disabled so every private copy is a genuine parse.
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+AXL_BINDING = "{http://www.cisco.com/AXLAPIService/}AXLAPIBinding"
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def child(mode: str, clients: int, version: str) -> None:
+    from zeep import Client
+    from zeep.transports import Transport
+    from ciscoaxl import schema
+
+    held = []
+    start = time.perf_counter()
+    for i in range(clients):
+        settings = schema.default_settings()
+        transport = Transport()
+        if mode == "shared":
+            document = schema.get_shared_document(version, cache=False)
+        else:
+            document = schema.load_document(version, settings, transport, cache=False)
+        client = Client(document, settings=settings, transport=transport)
+        service = client.create_service(AXL_BINDING, f"https://cucm{i}:8443/axl/")
+        held.append((client, service))
+    elapsed = time.perf_counter() - start
+    print(f"{mode:>8} {clients:>8} {elapsed:>10.2f} {_rss_mb():>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--version", default="12.5")
+    parser.add_argument("--child", choices=("private", "shared"))
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.clients, args.version)
+        return
+
+    print(f"{'mode':>8} {'clients':>8} {'seconds':>10} {'peak RSS MB':>12}")
+    for mode in ("private", "shared"):
+        subprocess.run(  # nosec
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                mode,
+                "--clients",
+                str(args.clients),
+                "--version",
+                args.version,
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""An export larger than UCM's result limit, as one query and in chunks run one at a time or
+several at once.
+
+    python benchmarks/sql_chunked.py [--rows 100000] [--max-rows 10000] [--delay 0.2]
+
+The local stand-in server (benchmarks/mock_axl.py, in its own process) serves a synthetic
+`device` table of `--rows` rows, takes `--delay` seconds per request and, like UCM, refuses
+results of more than `--max-rows` rows as too large. run_sql_query() and "auto", which is
+iter_sql_query() without a chunk_size, try the whole query first, then run it again in chunks
+of the size UCM suggests. run_sql_query() collects every row as a dictionary before returning.
+"""
+
+import argparse
+import os
+import time
+
+from ciscoaxl import axl
+from mock_axl import DeviceTable, server_process
+
+QUERY = "select pkid, name, description, tkmodel, isactive from device order by pkid"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--max-rows", type=int, default=10000)
+    parser.add_argument("--delay", type=float, default=0.2)
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+
+    responder = DeviceTable(args.rows, max_rows=args.max_rows)
+    with server_process(responder=responder, delay=args.delay) as port:
+        ucm = axl(
+            "u", "p", "127.0.0.1", "12.5", cucm_port=port, operations=["executeSQLQuery"],
+            pool_maxsize=8,
+        )
+        print(f"{'mode':<28} {'rows':>8} {'requests':>8} {'faults':>6} {'seconds':>8}")
+        modes = (
+            ("run_sql_query", None),
+            ("iter_sql_query, auto", {}),
+            (f"chunks of {2 * args.max_rows}", {"chunk_size": 2 * args.max_rows}),
+            ("chunks of max-rows", {"chunk_size": args.max_rows}),
+            ("chunks of max-rows, 4 wide", {"chunk_size": args.max_rows, "workers": 4}),
+        )
+        for name, options in modes:
+            ucm.last_paging_stats = None
+            start = time.perf_counter()
+            if options is None:
+                rows = ucm.run_sql_query(QUERY)["num_rows"]
+            else:
+                rows = sum(1 for _ in ucm.iter_sql_query(QUERY, **options))
+            elapsed = time.perf_counter() - start
+            stats = ucm.last_paging_stats
+            requests = stats.requests if stats else 1
+            faults = stats.faults if stats else 1 - bool(rows)
+            print(f"{name:<28} {rows:>8} {requests:>8} {faults:>6} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
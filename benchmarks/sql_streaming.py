@@ -0,0 +1,66 @@
+"""Time and peak memory of run_sql_query() versus iter_sql_query() on a large export.
+
+    python benchmarks/sql_streaming.py [--rows 100000]
+
+The local stand-in server (benchmarks/mock_axl.py, in this process) answers `select * from device` with a
+synthetic table of `--rows` rows. Each mode runs in a fresh process, which reports how far
+its peak RSS rose above what it used once the client was connected, and the CPU time the
+client itself spent.
+"""
+
+import argparse
+import os
+import resource
+import subprocess  # nosec
+import sys
+import time
+
+QUERY = "select pkid, name, description, tkmodel, isactive from device"
+TYPES = {"pkid": "uuid", "tkmodel": "int", "isactive": "bool"}
+
+
+def child(mode: str, port: int) -> None:
+    from ciscoaxl import axl
+
+    ucm = axl("u", "p", "127.0.0.1", "12.5", cucm_port=port, operations=["executeSQLQuery"])
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    cpu = time.process_time()
+    if mode == "run_sql_query":
+        count = sum(1 for row in ucm.run_sql_query(QUERY)["rows"] if row["name"])
+    elif mode == "iter_sql_query":
+        count = sum(1 for row in ucm.iter_sql_query(QUERY) if row.name)
+    else:
+        count = sum(1 for row in ucm.iter_sql_query(QUERY, types=TYPES) if row.isactive is not None)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode:<22} {count:>8} {elapsed:>8.2f} {cpu:>8.2f} {(peak - baseline) / 1024:>8.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PORT"))
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+    if args.child:
+        child(args.child[0], int(args.child[1]))
+        return
+
+    from mock_axl import DeviceTable, MockAXLServer
+
+    with MockAXLServer(responder=DeviceTable(args.rows)) as server:
+        print(f"{'mode':<22} {'rows':>8} {'seconds':>8} {'CPU s':>8} {'peak MB':>8}")
+        for mode in ("run_sql_query", "iter_sql_query", "iter_sql_query, typed"):
+            subprocess.run(  # nosec
+                [sys.executable, __file__, "--child", mode, str(server.port)],
+                check=True,
+                stderr=subprocess.DEVNULL,
+            )
+
+
+if __name__ == "__main__":
+    main()
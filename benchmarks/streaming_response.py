@@ -0,0 +1,75 @@
+"""Peak memory of decoding one very large list* response whole versus streamed off the socket.
+
+    python benchmarks/streaming_response.py [--phones 50000]
+
+The local stand-in server (benchmarks/mock_axl.py) answers a single listPhone, with no paging,
+holding `--phones` records. Each mode runs in a fresh process, which reports how far its peak
+RSS rose above what it used once the client was connected, and how long it took until the
+first record was available.
+"""
+
+import argparse
+import os
+import resource
+import subprocess  # nosec
+import sys
+import time
+
+CRITERIA = {"name": "%"}
+TAGS = {"name": "", "description": "", "product": "", "locationName": ""}
+
+
+def child(mode: str, port: int) -> None:
+    from ciscoaxl import axl
+    from ciscoaxl.rawxml import parse_records
+
+    ucm = axl("u", "p", "127.0.0.1", "12.5", cucm_port=port, operations=["listPhone"])
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    first = None
+    count = 0
+    if mode == "zeep":
+        for phone in ucm.client.listPhone(searchCriteria=CRITERIA, returnedTags=TAGS)["return"]["phone"]:
+            first = first or time.perf_counter()
+            count += 1
+    elif mode == "raw, whole":
+        with ucm._zeep.settings(raw_response=True):
+            content = ucm.client.listPhone(searchCriteria=CRITERIA, returnedTags=TAGS).content
+        for phone in parse_records(content, "phone"):
+            first = first or time.perf_counter()
+            count += 1
+    else:
+        for phone in ucm.iter_response("listPhone", searchCriteria=CRITERIA, returnedTags=TAGS):
+            first = first or time.perf_counter()
+            count += 1
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode:<12} {count:>8} {first - start:>10.2f} {elapsed:>8.2f} {(peak - baseline) / 1024:>8.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--phones", type=int, default=50000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PORT"))
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+    if args.child:
+        child(args.child[0], int(args.child[1]))
+        return
+
+    from mock_axl import MockAXLServer, PhoneInventory
+
+    with MockAXLServer(responder=PhoneInventory(args.phones)) as server:
+        print(f"{'mode':<12} {'phones':>8} {'first (s)':>10} {'seconds':>8} {'peak MB':>8}")
+        for mode in ("zeep", "raw, whole", "streamed"):
+            subprocess.run(  # nosec
+                [sys.executable, __file__, "--child", mode, str(server.port)],
+                check=True,
+                stderr=subprocess.DEVNULL,
+            )
+
+
+if __name__ == "__main__":
+    main()
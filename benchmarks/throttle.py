@@ -0,0 +1,67 @@
+"""Many threads making lookups against a server that throttles, with and without the
+ThrottleController.
+
+    python benchmarks/throttle.py [--lookups 400] [--threads 32] [--capacity 4] [--delay 0.05]
+
+The local stand-in server (benchmarks/mock_axl.py, in its own process) serves `--capacity`
+requests at once, taking `--delay` seconds each, and answers 503 to the rest, as UCM does when
+it throttles AXL. Each lookup is a run_sql_query(), which reports a failed request as 0 rows.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ciscoaxl import axl
+from ciscoaxl.transport import ThrottleController
+from mock_axl import server_process
+
+SQL_RESPONSE = (
+    '<ns:executeSQLQueryResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+    "<return><row><name>SEP001122334455</name></row></return></ns:executeSQLQueryResponse>"
+)
+
+
+def respond(operation: str, request: bytes) -> str:
+    return SQL_RESPONSE
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lookups", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--capacity", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+    # a CA bundle from the environment would override the unverified fallback session
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+
+    with server_process(responder=respond, delay=args.delay, capacity=args.capacity) as port:
+        print(f"{'client':<20} {'ok':>5} {'failed':>6} {'requests':>8} {'seconds':>8} {'ok/s':>6}")
+        for name, throttle in (
+            ("no throttle", False),
+            ("ThrottleController", ThrottleController(max_concurrency=args.threads)),
+        ):
+            ucm = axl(
+                "u", "p", "127.0.0.1", "12.5", cucm_port=port, operations=["executeSQLQuery"],
+                pool_maxsize=args.threads, throttle=throttle,
+            )
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as pool:
+                rows = list(pool.map(
+                    lambda _: ucm.run_sql_query("select name from device")["num_rows"],
+                    range(args.lookups),
+                ))
+            elapsed = time.perf_counter() - start
+            ok = sum(rows)
+            requests = throttle.requests if throttle else args.lookups
+            print(f"{name:<20} {ok:>5} {args.lookups - ok:>6} {requests:>8} {elapsed:>8.2f} "
+                  f"{ok / elapsed:>6.0f}")
+            if throttle:
+                print(throttle)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Wall time for a batch of worker processes starting at once, per transport cache backend.
+
+    python benchmarks/transport_cache.py [--workers 8] [--version 12.5] [--schema-cache]
+
+Each worker does what axl() does at startup minus the network probe: create the transport
+(and its cache) and load the schema through it. By default the on-disk schema cache is off,
+so the schema files really go through the transport cache; pass --schema-cache to measure
+the usual setup where only the cache construction itself is left.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def worker(mode: str, version: str, schema_cache: bool) -> None:
+    from zeep.transports import Transport
+    from ciscoaxl import schema
+    from ciscoaxl.transport import make_cache
+
+    transport = Transport(timeout=10, cache=make_cache(None if mode == "none" else mode))
+    schema.load_document(
+        version, schema.default_settings(), transport, cache=schema_cache
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--version", default="12.5")
+    parser.add_argument("--schema-cache", action="store_true")
+    parser.add_argument("--worker", default=None)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.version, args.schema_cache)
+        return
+
+    if args.schema_cache:
+        from ciscoaxl import schema
+
+        schema.build_cache(args.version)
+
+    shared_db = os.path.join(tempfile.mkdtemp(), "zeep.db")
+    print(f"{'cache':>12} {'workers':>8} {'seconds':>10}")
+    for mode in ("none", "memory", "sqlite", shared_db):
+        command = [sys.executable, __file__, "--worker", mode, "--version", args.version]
+        if args.schema_cache:
+            command.append("--schema-cache")
+        start = time.perf_counter()
+        procs = [subprocess.Popen(command) for _ in range(args.workers)]  # nosec
+        if any(p.wait() for p in procs):
+            raise SystemExit(f"a worker failed with cache {mode!r}")
+        label = "shared path" if mode == shared_db else mode
+        print(f"{label:>12} {args.workers:>8} {time.perf_counter() - start:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,40 @@
-from .axl import *
+"""Cisco CUCM AXL library.
+
+Importing the package is kept cheap: zeep, requests and friends are only imported once
+something that needs them (like the ``axl`` class) is first used.
+"""
+
+import importlib
+import sys
+import types
+
+# public name -> module defining it, imported on first access
+_LAZY_ATTRIBUTES = {
+    "axl": "ciscoaxl.axl",
+    "AsyncAxl": "ciscoaxl.aio",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+class _LazyPackage(types.ModuleType):
+    def __getattr__(self, name: str):
+        module_name = _LAZY_ATTRIBUTES.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name), name)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name: str, value) -> None:
+        # importing the ciscoaxl.axl submodule binds it on the package under the same
+        # name as the class it defines; `ciscoaxl.axl` has always been the class
+        if name in _LAZY_ATTRIBUTES and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_LAZY_ATTRIBUTES))
+
+
+sys.modules[__name__].__class__ = _LazyPackage
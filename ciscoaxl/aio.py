@@ -0,0 +1,508 @@
+"""asyncio front end to the axl class, on zeep's httpx based async transport.
+
+``AsyncAxl`` has a coroutine for every public ``axl`` method with the same name, arguments,
+return values and Fault handling. AXL requests are sent with ``zeep.AsyncClient`` over one
+pooled, cookie-authenticated ``httpx.AsyncClient``, so an event loop can keep hundreds of
+lookups in flight without a thread per call:
+
+    async with AsyncAxl(username, password, cucm, "12.5", max_concurrency=50) as ucm:
+        phones = await asyncio.gather(*(ucm.get_phone(name=n) for n in names))
+
+The coroutines don't duplicate the ``axl`` methods. Each one runs the ``axl`` method itself
+against a stand-in for the zeep service: when the method makes its next AXL call, the call is
+made asynchronously, and the method is run again with the responses received so far (or the
+Fault raised) handed back in order, until it returns. The code around the calls only builds
+requests and reads responses, so running it again is cheap and gives the same calls.
+
+httpx comes with the ``async`` extra: ``pip install ciscoaxl[async]``.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import random
+import ssl
+from typing import Any, Callable, List, Optional
+
+from requests.auth import _basic_auth_str
+from zeep import AsyncClient
+from zeep.proxy import AsyncServiceProxy
+from zeep.transports import AsyncTransport
+
+from ciscoaxl import schema
+from ciscoaxl.axl import axl
+from ciscoaxl.transport import SessionCookieAuth, _retry_after, operation_name
+
+try:
+    import httpx
+except ImportError:  # the async extra isn't installed
+    httpx = None
+
+# axl methods that talk to UCM, by name prefix
+_METHOD_PREFIXES = (
+    "get_",
+    "list_",
+    "add_",
+    "update_",
+    "delete_",
+    "do_",
+    "reset_",
+    "sql_",
+    "run_sql_",
+)
+# methods that stream raw responses off a requests session, which the async transport hasn't got
+_SYNC_ONLY = ("list_columns", "sql_columns")
+_BINDING = "{http://www.cisco.com/AXLAPIService/}AXLAPIBinding"
+
+# the replay an axl method is being run in, by the task running it
+_replaying: contextvars.ContextVar = contextvars.ContextVar("ciscoaxl_replaying", default=None)
+# size of the last response received by the task
+_response_size: contextvars.ContextVar = contextvars.ContextVar(
+    "ciscoaxl_response_size", default=None
+)
+
+
+class _Deferred(BaseException):
+    """Raised out of an axl method being replayed at the AXL call it hasn't had a response
+    for yet. A BaseException, so the method's own ``except Exception`` doesn't catch it.
+    """
+
+    def __init__(self, operation: str, args: tuple, kwargs: dict) -> None:
+        super().__init__(operation)
+        self.operation = operation
+        self.args_ = args
+        self.kwargs = kwargs
+
+
+def _record_lists(response: Any) -> List[tuple]:
+    """The lists of records in a response's <return>, each with a snapshot of its items"""
+    try:
+        result = response["return"]
+        values = [result[key] for key in result] if result is not None else []
+    except (KeyError, TypeError):
+        return []
+    return [(value, tuple(value)) for value in values if isinstance(value, list)]
+
+
+class _Outcome(object):
+    """An AXL call made for a replayed method, and its response or exception"""
+
+    __slots__ = ("operation", "args", "kwargs", "response", "error", "speculative", "lists")
+
+    def __init__(self, operation, args, kwargs, response=None, error=None, speculative=False):
+        self.operation = operation
+        self.args = args
+        self.kwargs = kwargs
+        self.response = response
+        self.error = error
+        # fetched ahead of the method asking for it, e.g. the next page of a listing
+        self.speculative = speculative
+        self.lists = None
+
+    def matches(self, operation: str, args: tuple, kwargs: dict) -> bool:
+        return (operation, args, kwargs) == (self.operation, self.args, self.kwargs)
+
+    def result(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        if self.lists is None:
+            # the methods only read responses, except that Paginator pops the records off
+            # their lists; remember what those held in case a later replay reads this again
+            self.lists = _record_lists(self.response)
+        else:
+            for records, items in self.lists:
+                records[:] = items
+        return self.response
+
+
+class _ReplayService(object):
+    """Stands in for the zeep service while an axl method is replayed. AXL calls already made
+    return their response, or raise their exception, in order; the next one raises _Deferred.
+    """
+
+    def __init__(self, outcomes: List[_Outcome]) -> None:
+        self.outcomes = outcomes
+        self._position = 0
+
+    def __getattr__(self, operation: str) -> Callable:
+        def call(*args, **kwargs):
+            position = self._position
+            self._position += 1
+            if position < len(self.outcomes):
+                outcome = self.outcomes[position]
+                if outcome.matches(operation, args, kwargs):
+                    return outcome.result()
+                if not outcome.speculative:
+                    raise RuntimeError(
+                        f"replayed call {position} is {operation}, but {outcome.operation} was made"
+                    )
+                # fetched ahead for nothing
+                del self.outcomes[position:]
+            raise _Deferred(operation, args, kwargs)
+
+        return call
+
+
+class _ReplayAxl(axl):
+    """The axl object an AsyncAxl runs its methods on: AXL calls go to the replay in progress"""
+
+    _async_client = None
+
+    @property
+    def client(self):
+        service = _replaying.get()
+        if service is None:
+            raise RuntimeError("AsyncAxl's axl methods only run inside its coroutines")
+        return service
+
+    @property
+    def _zeep(self):
+        return self._async_client
+
+    def warmup(self):
+        return None
+
+
+class _SessionCookieFlow(httpx.Auth if httpx is not None else object):
+    """SessionCookieAuth for httpx: credentials only until UCM hands out a session cookie,
+    and once more when that session has expired. Shares the round_trips count.
+    """
+
+    def __init__(self, auth: SessionCookieAuth) -> None:
+        self.auth = auth
+
+    def _has_session(self, request) -> bool:
+        cookies = request.headers.get("Cookie", "")
+        names = {c.split("=", 1)[0].strip() for c in cookies.split(";")}
+        return any(name in names for name in self.auth.SESSION_COOKIES)
+
+    def auth_flow(self, request):
+        if self.auth.reuse_session and self._has_session(request):
+            response = yield request
+            if response.status_code != 401:
+                return
+            # the session expired, whatever UCM sets on the retry takes its place
+            del request.headers["Cookie"]
+        request.headers["Authorization"] = _basic_auth_str(self.auth.username, self.auth.password)
+        response = yield request
+        self.auth._count_round_trip(response)
+
+
+class AsyncAXLTransport(AsyncTransport):
+    """zeep AsyncTransport with the rate limits and throttle handling of AXLTransport"""
+
+    def __init__(self, *args, throttle=None, rate_limiter=None, **kwargs) -> None:
+        """
+        :param throttle: ThrottleController limiting requests in flight and retrying
+            throttled ones, defaults to None (no limit)
+        :param rate_limiter: RateLimiter whose budgets requests wait for, defaults to None
+        """
+        super().__init__(*args, **kwargs)
+        self.throttle = throttle
+        self.rate_limiter = rate_limiter
+        self._released = None
+
+    async def _acquire(self) -> int:
+        if self._released is None:
+            self._released = asyncio.Event()
+        while True:
+            ticket, wait = self.throttle.try_acquire()
+            if ticket is not None:
+                return ticket
+            # woken by the next release, or at the end of the backoff
+            self._released.clear()
+            try:
+                await asyncio.wait_for(self._released.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def _release(self, ticket: int, throttled: bool, retry_after: Optional[float] = None):
+        self.throttle.release(ticket, throttled, retry_after)
+        self._released.set()
+
+    async def post(self, address, message, headers):
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve(operation_name(headers))
+            if wait:
+                await asyncio.sleep(wait)
+        if self.throttle is None:
+            response = await super().post(address, message, headers)
+            _response_size.set(len(response.content))
+            return response
+        retries = self.throttle.retries_for(operation_name(headers))
+        attempt = 0
+        while True:
+            ticket = await self._acquire()
+            try:
+                response = await super().post(address, message, headers)
+            except BaseException:
+                self._release(ticket, False)
+                raise
+            throttled = self.throttle.is_throttled(response)
+            self._release(ticket, throttled, _retry_after(response) if throttled else None)
+            if not throttled or attempt >= retries:
+                _response_size.set(len(response.content))
+                return response
+            self.throttle.retrying()
+            # full jitter, so the throttled requests don't all come back at once
+            ceiling = min(self.throttle.max_backoff, self.throttle.backoff * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0, ceiling))  # nosec
+            attempt += 1
+
+    def last_response_size(self) -> Optional[int]:
+        """Size in bytes of the calling task's last response"""
+        return _response_size.get()
+
+    async def aclose(self):
+        await super().aclose()
+        self.wsdl_client.close()
+
+
+def _certificate_error(error: BaseException) -> bool:
+    while error is not None:
+        if isinstance(error, ssl.SSLCertVerificationError):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class AsyncAxl(object):
+    """
+    Coroutine flavoured axl. Takes the same arguments as axl, plus max_concurrency.
+    Connects lazily; await warmup() to connect up front. Needs httpx (the async extra).
+    """
+
+    def __init__(
+        self, username, password, cucm, cucm_version, max_concurrency=20, **axl_options
+    ):
+        """
+        :param username: axl username
+        :param password: axl password
+        :param cucm: UCM IP address
+        :param cucm_version: UCM version
+        :param max_concurrency: number of AXL requests allowed in flight at once, default 20
+        :param axl_options: any other axl() keyword argument, e.g. cucm_port or operations.
+            Listings page one request at a time (the event loop provides the concurrency),
+            without adaptive page sizes, raw listings or read_nodes
+
+        example usage:
+        >>> ucm = AsyncAxl('axl_user', 'axl_pass', '192.168.200.10', '12.5')
+        >>> phone = await ucm.get_phone(name='SEP001122334455')
+        """
+        if httpx is None:
+            raise ImportError("AsyncAxl needs httpx: pip install ciscoaxl[async]")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if axl_options.get("read_nodes"):
+            raise ValueError("AsyncAxl doesn't support read_nodes")
+        axl_options.update(
+            lazy=True, page_workers=1, page_prefetch=0, adaptive_paging=False, raw_listings=False
+        )
+        # sizes the throttle's limit
+        axl_options.setdefault("pool_maxsize", max_concurrency)
+        self._axl = _ReplayAxl(username, password, cucm, cucm_version, **axl_options)
+        self.max_concurrency = max_concurrency
+        self._service = None
+        self._semaphore = None
+        self._connect_lock = None
+
+    @property
+    def client(self):
+        """
+        zeep AsyncServiceProxy for AXL, e.g. await ucm.client.getPhone(name=...)
+        :return: AsyncServiceProxy, None until connected
+        """
+        return self._service
+
+    async def _probe(self, http) -> int:
+        # streamed and closed right away, only the status matters
+        async with http.stream("GET", self._axl._axl_url) as response:
+            return response.status_code
+
+    def _http_client(self, verify: bool):
+        return httpx.AsyncClient(
+            auth=_SessionCookieFlow(self._axl._auth),
+            verify=verify,
+            timeout=httpx.Timeout(None, connect=10),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+
+    async def _connect(self):
+        url = self._axl._axl_url
+        http = self._http_client(verify=True)
+        try:
+            try:
+                status = await self._probe(http)
+            except httpx.ConnectError as error:
+                if not _certificate_error(error):
+                    raise
+                await http.aclose()
+                if self._axl.strict_ssl:
+                    raise error from None
+                # retry with verify set False
+                http = self._http_client(verify=False)
+                status = await self._probe(http)
+        except httpx.ConnectError as error:
+            await http.aclose()
+            if _certificate_error(error):
+                raise
+            raise Exception(f"{url} cannot be found, please try again") from None
+        if status in (401, 403, 404):
+            await http.aclose()
+        if status == 401:
+            raise Exception("[401 Unauthorized]: Please check your username and password")
+        elif status == 403:
+            raise Exception(
+                f"[403 Forbidden]: Please ensure the user '{self._axl.username}' "
+                "has AXL access set up"
+            )
+        elif status == 404:
+            raise Exception(f"[404 Not Found]: AXL not found, please check your URL ({url})")
+        return http
+
+    async def warmup(self):
+        """
+        Check connectivity and load the schema without blocking the event loop
+        :return: None
+        """
+        if self._service is not None:
+            return
+        if self._connect_lock is None:
+            # created here rather than in __init__, so it binds to the running loop
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._service is not None:
+                return
+            settings = schema.default_settings()
+            loop = asyncio.get_running_loop()
+            # the schema load is CPU bound, the probe network bound, overlap them
+            document = loop.run_in_executor(None, self._axl._load_document, settings)
+            http = await self._connect()
+            try:
+                document = await document
+            except BaseException:
+                await http.aclose()
+                raise
+            transport = AsyncAXLTransport(
+                client=http,
+                cache=self._axl.transport_cache,
+                throttle=self._axl.throttle,
+                rate_limiter=self._axl.rate_limiter,
+            )
+            client = AsyncClient(document, settings=settings, transport=transport)
+            self._axl._async_client = client
+            self._service = AsyncServiceProxy(
+                client, client.wsdl.bindings[_BINDING], address=self._axl._axl_url
+            )
+
+    async def _send(self, operation: str, args: tuple, kwargs: dict) -> Any:
+        await self.warmup()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await getattr(self._service, operation)(*args, **kwargs)
+
+    async def _run(self, name: str, args: tuple, kwargs: dict) -> Any:
+        """Runs the axl method `name`, making its AXL calls asynchronously"""
+        await self.warmup()
+        method = getattr(self._axl, name)
+        outcomes: List[_Outcome] = []
+        while True:
+            token = _replaying.set(_ReplayService(outcomes))
+            try:
+                return method(*args, **kwargs)
+            except _Deferred as deferred:
+                call = deferred
+            finally:
+                _replaying.reset(token)
+            await self._make(outcomes, call.operation, call.args_, call.kwargs)
+
+    async def _make(self, outcomes: List[_Outcome], operation: str, args: tuple, kwargs: dict):
+        """Makes the AXL call a replayed method is waiting for. For a list* page, the rest
+        of the pages are requested too, so a listing is replayed once rather than per page.
+        """
+        speculative = False
+        while True:
+            outcome = _Outcome(operation, args, kwargs, speculative=speculative)
+            outcomes.append(outcome)
+            try:
+                outcome.response = await self._send(operation, args, kwargs)
+            except Exception as error:
+                outcome.error = error
+                return
+            first = kwargs.get("first")
+            if not (operation.startswith("list") and first and "skip" in kwargs):
+                return
+            result = outcome.response["return"]
+            item_name = operation[4].lower() + operation[5:]
+            if result is None or item_name not in result or len(result[item_name] or ()) < first:
+                # a short page is the last one, as for Paginator
+                return
+            kwargs = dict(kwargs, skip=kwargs["skip"] + first)
+            speculative = True
+
+    async def call(self, operation, *args, **kwargs):
+        """
+        Call any AXL operation directly, like axl.client.<operation>(...)
+        :param operation: AXL operation name, e.g. 'listPhone'
+        :return: the zeep response, Faults are raised
+        """
+        return await self._send(operation, args, kwargs)
+
+    @property
+    def auth_round_trips(self):
+        """
+        Number of requests UCM had to authenticate, see axl.auth_round_trips
+        :return: int
+        """
+        return self._axl.auth_round_trips
+
+    @property
+    def throttle(self):
+        """
+        The ThrottleController pacing requests, see axl.throttle
+        :return: ThrottleController or None
+        """
+        return self._axl.throttle
+
+    @property
+    def rate_limiter(self):
+        """
+        The RateLimiter budgeting requests, see axl.rate_limiter
+        :return: RateLimiter or None
+        """
+        return self._axl.rate_limiter
+
+    async def close(self):
+        """
+        Close the connections
+        :return: None
+        """
+        if self._service is not None:
+            await self._axl._async_client.transport.aclose()
+            self._service = None
+
+    async def __aenter__(self):
+        await self.warmup()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def _make_coroutine(name: str, method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def coroutine(self, *args, **kwargs):
+        return await self._run(name, args, kwargs)
+
+    return coroutine
+
+
+for _name, _method in inspect.getmembers(axl, inspect.isfunction):
+    if _name.startswith(_METHOD_PREFIXES) and _name not in _SYNC_ONLY:
+        setattr(AsyncAxl, _name, _make_coroutine(_name, _method))
+del _name, _method
@@ -10,18 +10,38 @@ Links:
 """
 
 import sys
-from pathlib import Path
-import os
 import json
-from requests import Session
 from requests.exceptions import SSLError, ConnectionError
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import urllib3
-from zeep import Client, Settings, Plugin
+from zeep import Client, Plugin
 from zeep.transports import Transport
-from zeep.cache import SqliteCache
 from zeep.plugins import HistoryPlugin
 from zeep.exceptions import Fault
+from ciscoaxl import schema
+from ciscoaxl.bulk import run_bulk
+from ciscoaxl.columnar import ColumnarResult
+from ciscoaxl.rawxml import RawListOperation
+from ciscoaxl.sql import SQLChunks, chunk_query, iter_sql_rows
+from ciscoaxl.paging import (
+    HEX_ALPHABET,
+    AdaptivePageSize,
+    Paginator,
+    PagingStats,
+    PrefixPartitioner,
+    suggested_rows,
+)
+from ciscoaxl.transport import (
+    AXLTransport,
+    NodePool,
+    RateLimiter,
+    SessionCookieAuth,
+    ThrottleController,
+    build_session,
+    make_cache,
+)
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -33,7 +53,35 @@ class axl(object):
     Python 3.6
     """
 
-    def __init__(self, username, password, cucm, cucm_version, cucm_port=8443, strict_ssl=False):
+    def __init__(
+        self,
+        username,
+        password,
+        cucm,
+        cucm_version,
+        cucm_port=8443,
+        strict_ssl=False,
+        schema_cache=True,
+        shared_schema=True,
+        lazy=False,
+        operations=None,
+        transport_cache=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        keep_alive=True,
+        tls_session_reuse=True,
+        session_reuse=True,
+        page_size=1000,
+        page_workers=1,
+        page_prefetch=0,
+        adaptive_paging=False,
+        throttle=True,
+        rate_limit=None,
+        read_nodes=None,
+        read_strategy="round_robin",
+        raw_listings=False,
+    ):
         """
         :param username: axl username
         :param password: axl password
@@ -41,34 +89,207 @@ class axl(object):
         :param cucm_version: UCM version
         :param cucm_port: UCM TCP port
         :param strict_ssl: do not work around an SSL failure, default False
+        :param schema_cache: keep a pre-parsed copy of the schema on disk, default True.
+            It lives in the user's cache directory ($XDG_CACHE_HOME/ciscoaxl); pass a directory
+            path to store it somewhere else
+        :param shared_schema: share one parsed schema between every axl object of the same
+            cucm_version in this process, default True
+        :param lazy: return immediately and defer the connectivity check and schema load
+            until the first AXL call (or warmup()), default False
+        :param operations: only load these AXL operations (e.g. ['listPhone', 'getPhone']) from
+            the schema, for faster startup and less memory. Methods using any other operation
+            will fail. Default loads all of them
+        :param transport_cache: cache for documents zeep loads through its transport: None,
+            'memory', 'sqlite', a path to a SQLite file or a zeep.cache.Base object, default None.
+            The bundled schema is read from local files, so most setups don't need one
+        :param pool_connections: number of per-host connection pools to keep, default 10
+        :param pool_maxsize: connections kept open to UCM, raise it to the number of threads
+            sharing this object, default 10
+        :param pool_block: make threads wait for a free pooled connection rather than opening
+            extra ones, default False
+        :param keep_alive: enable TCP keep-alive on pooled connections, default True
+        :param tls_session_reuse: resume the previous TLS session on new connections, default True
+        :param session_reuse: once UCM has set a session cookie, send it instead of the
+            credentials so UCM doesn't authenticate every request again, default True
+        :param page_size: records requested per list* call by the get_*/iter_* listing
+            methods, default 1000. Lower it if UCM rejects responses as too large
+        :param page_workers: pages the listing methods request at the same time, default 1.
+            Records still come back in order. Keep it at or below pool_maxsize
+        :param page_prefetch: pages the listing methods fetch ahead on a background thread
+            while the caller works through the current one, default 0
+        :param adaptive_paging: let the listing methods adjust the page size (starting from
+            page_size) to the size and latency of UCM's responses, and shrink it when UCM
+            refuses a request as too large. True, or a ciscoaxl.paging.AdaptivePageSize to
+            set the bounds and targets, default False. See last_paging_stats
+        :param throttle: when UCM throttles a request (HTTP 503 or a throttling fault), lower
+            the number of requests allowed in flight until UCM keeps up, and back off and
+            retry it if it is a read (get*, list*, executeSQLQuery). True (at most
+            pool_maxsize in flight), a ciscoaxl.transport.ThrottleController, or False to
+            send requests as they come, default True. See throttle.state()
+        :param rate_limit: requests per second allowed for each class of operations, shared by
+            every thread using this object, e.g. {'read': 20, 'write': 5, 'sql': (2, 4)} where
+            a tuple is (rate, burst). Classes are 'read' (get*/list*), 'sql' (executeSQL*) and
+            'write' (the rest). A ciscoaxl.transport.RateLimiter for custom classes, default
+            None (no limit). See rate_limiter.state()
+        :param read_nodes: cluster nodes ('host' or 'host:port') to spread reads (get*, list*,
+            executeSQLQuery) over, e.g. [cucm, 'cucm-sub1', 'cucm-sub2'] to include the
+            publisher. Writes always go to cucm, and nodes that stop answering are taken out
+            of rotation for a while. Default None sends everything to cucm. See nodes.state()
+        :param read_strategy: how reads pick a node, 'round_robin' or 'least_loaded',
+            default 'round_robin'
+        :param raw_listings: parse list* responses straight from the XML into plain
+            dictionaries instead of building zeep objects, which takes a fraction of the CPU
+            and memory on large listings, default False. References such as locationName
+            come back as their name rather than {'_value_1': name, 'uuid': ...}
 
         example usage:
         >>> from axl import AXL
         >>> ucm = AXL('axl_user', 'axl_pass', '192.168.200.10')
         """
 
-        cwd = os.path.dirname(os.path.abspath(__file__))
-        if os.name == "posix":
-            wsdl = Path(f"{cwd}/schema/{cucm_version}/AXLAPI.wsdl").as_uri()
-        else:
-            wsdl = str(Path(f"{cwd}/schema/{cucm_version}/AXLAPI.wsdl").absolute())
-        session = Session()
-        session.auth = (username, password)
+        self.username = username
+        self.password = password
+        self.wsdl = schema.wsdl_location(cucm_version)
+        self.cucm = cucm
+        self.cucm_version = cucm_version
+        self.cucm_port = cucm_port
+        self.strict_ssl = strict_ssl
+        self.schema_cache = schema_cache
+        self.shared_schema = shared_schema
+        self.operations = operations
+        self.page_size = page_size
+        self.page_workers = page_workers
+        self.page_prefetch = page_prefetch
+        if adaptive_paging is True:
+            adaptive_paging = AdaptivePageSize()
+        self.adaptive_paging = adaptive_paging or None
+        self.raw_listings = raw_listings
+        self.last_paging_stats = None
+        self.transport_cache = make_cache(transport_cache)
+        if throttle is True:
+            throttle = ThrottleController(max_concurrency=pool_maxsize)
+        self.throttle = throttle or None
+        if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+        self.rate_limiter = rate_limit
+        self._auth = SessionCookieAuth(username, password, reuse_session=session_reuse)
+        self._adapter_options = dict(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            tls_session_reuse=tls_session_reuse,
+        )
+        self.UUID_PATTERN = re.compile(
+            r"^[\da-f]{8}-([\da-f]{4}-){3}[\da-f]{12}$", re.IGNORECASE
+        )
+        self._axl_url = f"https://{cucm}:{cucm_port}/axl/"
+        self.nodes = None
+        if read_nodes:
+            self.nodes = NodePool(
+                self._axl_url,
+                [
+                    f"https://{node if ':' in node else f'{node}:{cucm_port}'}/axl/"
+                    for node in read_nodes
+                ],
+                strategy=read_strategy,
+            )
+        self._zeep_client = None
+        self._service = None
+        self._connect_lock = threading.Lock()
+
+        if not lazy:
+            self.warmup()
+
+    @property
+    def _zeep(self):
+        if self._zeep_client is None:
+            self.warmup()
+        return self._zeep_client
+
+    @property
+    def client(self):
+        if self._service is None:
+            self.warmup()
+        return self._service
+
+    @property
+    def auth_round_trips(self):
+        """
+        Number of requests sent with credentials, i.e. that UCM had to authenticate
+        :return: int
+        """
+        return self._auth.round_trips
+
+    def warmup(self):
+        """
+        Check connectivity to the AXL service and load the schema, if that hasn't happened yet.
+        Only needed for lazy objects, to pay the startup cost at a time of your choosing.
+        Safe to call from several threads; the work is only done once.
+        :return: None
+        """
+        if self._service is not None:
+            return
+        with self._connect_lock:
+            if self._service is not None:
+                return
+            settings = schema.default_settings()
+            # the probe is network bound and the schema load CPU bound, overlap them
+            loader = ThreadPoolExecutor(max_workers=1)
+            try:
+                document = loader.submit(self._load_document, settings)
+                session = self._open_session()
+                document = document.result()
+            finally:
+                # don't hold up a failed probe waiting for the schema
+                loader.shutdown(wait=False)
+            transport = AXLTransport(
+                session=session,
+                timeout=10,
+                cache=self.transport_cache,
+                throttle=self.throttle,
+                rate_limiter=self.rate_limiter,
+                nodes=self.nodes,
+            )
+            axl_client = Client(document, settings=settings, transport=transport)
+            service = axl_client.create_service(
+                "{http://www.cisco.com/AXLAPIService/}AXLAPIBinding", self._axl_url
+            )
+            self._zeep_client = axl_client
+            self._service = service
+
+    @staticmethod
+    def _probe(session, url):
+        """
+        Send the connectivity check and release its connection
+        :param session: requests Session to check
+        :param url: AXL endpoint
+        :return: HTTP status code
+        """
+        # closed right away, an unread streamed response would otherwise
+        # keep its connection checked out of the pool
+        with session.get(url, stream=True, timeout=10) as response:
+            return response.status_code
+
+    def _open_session(self):
+        """
+        Open an authenticated session and validate it against the AXL endpoint
+        :return: requests Session
+        """
+        session = build_session(self._auth, **self._adapter_options)
 
         # validate session before assigning to Transport
-        url = f"https://{cucm}:{cucm_port}/axl/"
+        url = self._axl_url
         try:
-            ret_code = session.get(url, stream=True, timeout=10).status_code
+            ret_code = self._probe(session, url)
         except SSLError:
-            if strict_ssl:
+            if self.strict_ssl:
                 raise
 
             # retry with verify set False
             session.close()
-            session = Session()
-            session.auth = (username, password)
-            session.verify = False
-            ret_code = session.get(url, stream=True, timeout=10).status_code
+            session = build_session(self._auth, verify=False, **self._adapter_options)
+            ret_code = self._probe(session, url)
         except ConnectionError:
             raise Exception(f"{url} cannot be found, please try again") from None
         if ret_code == 401:
@@ -77,33 +298,299 @@ class axl(object):
             )
         elif ret_code == 403:
             raise Exception(
-                f"[403 Forbidden]: Please ensure the user '{username}' has AXL access set up"
+                f"[403 Forbidden]: Please ensure the user '{self.username}' has AXL access set up"
             )
         elif ret_code == 404:
             raise Exception(
                 f"[404 Not Found]: AXL not found, please check your URL ({url})"
             )
+        return session
+
+    def _load_document(self, settings):
+        """
+        Load the parsed schema document for this object's cucm_version
+        :param settings: zeep settings used when the schema isn't shared
+        :return: zeep WSDL Document
+        """
+        cache = bool(self.schema_cache)
+        cache_dir = None if isinstance(self.schema_cache, bool) else self.schema_cache
+        if self.shared_schema:
+            return schema.get_shared_document(
+                self.cucm_version,
+                cache=cache,
+                cache_dir=cache_dir,
+                operations=self.operations,
+                transport_cache=self.transport_cache,
+            )
+        else:
+            # the transport only reads the local schema files, the
+            # client gets the authenticated one once the probe is done
+            return schema.load_document(
+                self.cucm_version,
+                settings,
+                Transport(cache=self.transport_cache),
+                cache=cache,
+                cache_dir=cache_dir,
+                operations=self.operations,
+            )
 
-        settings = Settings(
-            strict=False, xml_huge_tree=True, xsd_ignore_sequence_order=True
+    def _paginate(
+        self,
+        operation,
+        item_name,
+        search_criteria,
+        returned_tags,
+        page_size,
+        workers=None,
+        total=None,
+        prefetch=None,
+        raw=None,
+        tuples=False,
+    ):
+        """
+        Page through a list* operation
+        :param operation: AXL operation name, e.g. 'listPhone'
+        :param item_name: name of the records in the response, e.g. 'phone'
+        :param search_criteria: searchCriteria of the request
+        :param returned_tags: returnedTags of the request
+        :param page_size: records per request, None for the object's page_size
+        :param workers: pages requested at once, None for the object's page_workers
+        :param total: number of matching records, if known
+        :param prefetch: pages fetched ahead, None for the object's page_prefetch
+        :param raw: parse responses with the raw XML fast path, None for the object's
+            raw_listings
+        :param tuples: return records as tuples in returned_tags order (implies raw)
+        :return: Paginator
+        """
+        paginator = Paginator(
+            self._list_operation(operation, item_name, raw, tuples),
+            item_name,
+            search_criteria,
+            returned_tags,
+            page_size or self.page_size,
+            workers=workers or self.page_workers,
+            total=total,
+            prefetch=self.page_prefetch if prefetch is None else prefetch,
+            adaptive=self.adaptive_paging,
+            response_size=self._zeep.transport.last_response_size,
+            stats=PagingStats(),
         )
-        transport = Transport(session=session, timeout=10, cache=SqliteCache())
-        axl_client = Client(wsdl, settings=settings, transport=transport)
+        self.last_paging_stats = paginator.stats
+        return paginator
 
-        self._zeep = axl_client
-        self.username = username
-        self.password = password
-        self.wsdl = wsdl
-        self.cucm = cucm
-        self.cucm_version = cucm_version
-        self.UUID_PATTERN = re.compile(
-            r"^[\da-f]{8}-([\da-f]{4}-){3}[\da-f]{12}$", re.IGNORECASE
+    def _list_operation(self, operation, item_name, raw=None, tuples=False):
+        """
+        The callable a Paginator uses for a list* operation
+        :param operation: AXL operation name, e.g. 'listPhone'
+        :param item_name: name of the records in the response, e.g. 'phone'
+        :param raw: use the raw XML fast path, None for the object's raw_listings
+        :param tuples: return records as tuples (implies raw)
+        :return: the zeep operation or a RawListOperation
+        """
+        if tuples or (self.raw_listings if raw is None else raw):
+            return RawListOperation(
+                self._zeep, self.client, operation, item_name, tuples=tuples
+            )
+        return getattr(self.client, operation)
+
+    def iter_pages(
+        self,
+        operation,
+        search_criteria,
+        returned_tags,
+        page_size=None,
+        workers=None,
+        total=None,
+        prefetch=None,
+        raw=None,
+        tuples=False,
+    ):
+        """
+        Page through any list* operation, e.g. to process records in batches
+        :param operation: AXL list operation, e.g. 'listPhone'
+        :param search_criteria: searchCriteria, e.g. {"name": "SEP%"}
+        :param returned_tags: returnedTags, e.g. {"name": "", "description": ""}
+        :param page_size: records requested per page, default is the object's page_size
+        :param workers: pages requested at the same time, default is the object's page_workers
+        :param total: number of matching records if known (e.g. from a SQL count), so
+            concurrent requests stop exactly at the end
+        :param prefetch: pages to fetch ahead of the caller, default is the object's page_prefetch
+        :param raw: parse responses with the raw XML fast path into plain dictionaries,
+            default is the object's raw_listings
+        :param tuples: yield records as tuples in returned_tags order, parsed with the fast path
+        :return: generator of lists of result dictionaries, Faults are raised
+        """
+        # listCss -> css, listH323Gateway -> h323Gateway
+        item_name = operation[4].lower() + operation[5:]
+        yield from self._paginate(
+            operation,
+            item_name,
+            search_criteria,
+            returned_tags,
+            page_size,
+            workers=workers,
+            total=total,
+            prefetch=prefetch,
+            raw=raw,
+            tuples=tuples,
+        ).pages()
+
+    def list_columns(
+        self,
+        operation,
+        search_criteria,
+        returned_tags,
+        dictionary=True,
+        page_size=None,
+        workers=None,
+        prefetch=None,
+    ):
+        """
+        Page through a list* operation and collect the records column by column, one column
+        per returned tag, e.g. ucm.list_columns("listPhone", {"name": "%"},
+        {"name": "", "devicePoolName": ""})["devicePoolName"]
+        :param operation: AXL list operation, e.g. 'listPhone'
+        :param search_criteria: searchCriteria, e.g. {"name": "SEP%"}
+        :param returned_tags: returnedTags, e.g. {"name": "", "devicePoolName": ""}
+        :param dictionary: dictionary-encode string columns, True (default) for every column
+            with few enough distinct values, False for none, or a list of tag names
+        :param page_size: records requested per page, default is the object's page_size
+        :param workers: pages requested at the same time, default is the object's page_workers
+        :param prefetch: pages to fetch ahead of the caller, default is the object's page_prefetch
+        :return: ColumnarResult mapping tag names to columns, Faults are raised
+        """
+        result = ColumnarResult(list(returned_tags), dictionary=dictionary)
+        for page in self.iter_pages(
+            operation,
+            search_criteria,
+            returned_tags,
+            page_size,
+            workers=workers,
+            prefetch=prefetch,
+            tuples=True,
+        ):
+            for record in page:
+                result.append(record)
+        return result
+
+    def iter_partitioned(
+        self,
+        operation,
+        search_criteria,
+        returned_tags,
+        key=None,
+        alphabet=HEX_ALPHABET,
+        partition_size=10000,
+        page_size=None,
+        workers=None,
+        raw=None,
+        tuples=False,
+        count=None,
+    ):
+        """
+        List a large prefix search partition by partition instead of with ever deeper skips,
+        e.g. ucm.iter_partitioned("listPhone", {"name": "SEP%"}, {"name": ""})
+        :param operation: AXL list operation, e.g. 'listPhone'
+        :param search_criteria: searchCriteria with a prefix search, e.g. {"name": "SEP%"}
+        :param returned_tags: returnedTags, e.g. {"name": "", "description": ""}
+        :param key: searchCriteria field holding the prefix, default is the first one
+        :param alphabet: every character that can follow the prefix (case matters),
+            default is hex digits as in device names. A record continuing with any other
+            character raises ValueError once the partitions have been listed
+        :param partition_size: most records listed with skip before a partition is split
+        :param page_size: records requested per page, default is the object's page_size
+        :param workers: partitions listed at the same time, default is the object's page_workers
+        :param raw: parse responses with the raw XML fast path into plain dictionaries,
+            default is the object's raw_listings
+        :param tuples: yield records as tuples in returned_tags order, parsed with the fast path
+        :param count: function returning how many records start with a given prefix, e.g.
+            from a SQL count(*). Split partitions are then checked against it; without one,
+            a single request skipping every listed record checks them at the end
+        :return: generator of result dictionaries, Faults are raised
+        """
+        item_name = operation[4].lower() + operation[5:]
+        partitioner = PrefixPartitioner(
+            self._list_operation(operation, item_name, raw, tuples),
+            item_name,
+            search_criteria,
+            returned_tags,
+            key=key,
+            alphabet=alphabet,
+            partition_size=partition_size,
+            page_size=page_size or self.page_size,
+            workers=workers or self.page_workers,
+            count=count,
+            response_size=self._zeep.transport.last_response_size,
         )
-        self.client = axl_client.create_service(
-            "{http://www.cisco.com/AXLAPIService/}AXLAPIBinding",
-            f"https://{cucm}:{cucm_port}/axl/",
+        self.last_paging_stats = partitioner.stats
+        yield from partitioner
+
+    def iter_response(self, operation, item_name=None, tuples=False, **kwargs):
+        """
+        Call an AXL operation once and yield the records of its response as they come off the
+        socket, so even a single response of hundreds of MB never has to fit in memory,
+        e.g. ucm.iter_response("executeSQLQuery", sql="select name from device")
+        :param operation: AXL operation, e.g. 'listPhone' or 'executeSQLQuery'
+        :param item_name: name of the records in the response, default is derived from a
+            list* operation ('listPhone' -> 'phone') or 'row' for executeSQLQuery
+        :param tuples: yield tuples in returnedTags order instead of dictionaries
+        :param kwargs: arguments of the operation, e.g. searchCriteria and returnedTags
+        :return: generator of plain dictionaries (or tuples), Faults are raised
+        """
+        if item_name is None:
+            if operation == "executeSQLQuery":
+                item_name = "row"
+            elif operation.startswith("list"):
+                item_name = operation[4].lower() + operation[5:]
+            else:
+                raise ValueError(f"item_name is needed for {operation}")
+        raw = RawListOperation(self._zeep, self.client, operation, item_name, tuples=tuples)
+        yield from raw.records(**kwargs)
+
+    def iter_bulk(
+        self, operation, items, workers=None, ordered=True, progress=None
+    ):
+        """
+        Call a method once for each set of arguments, several at a time,
+        e.g. ucm.iter_bulk("add_phone", [{"name": "SEP001122334455"}, ...], workers=8)
+        :param operation: axl method name, e.g. 'add_phone', or an AXL operation, e.g. 'addPhone'
+        :param items: iterable of keyword argument dictionaries, one per call
+        :param workers: calls in flight at once, default is pool_maxsize
+        :param ordered: yield in input order, False to yield as calls complete, default True
+        :param progress: called with (done, total, index, result) as each result is yielded,
+            total is None if items has no len()
+        :return: generator of (index, result) tuples, where result is what the call returned
+            or the exception (e.g. Fault) it raised
+        """
+        func = getattr(self, operation, None)
+        if not callable(func):
+            func = getattr(self.client, operation)
+        yield from run_bulk(
+            func,
+            items,
+            workers=workers or self._adapter_options["pool_maxsize"],
+            ordered=ordered,
+            progress=progress,
         )
 
+    def bulk(self, operation, items, workers=None, progress=None):
+        """
+        Call a method once for each set of arguments, several at a time,
+        e.g. ucm.bulk("add_directory_number", [{"pattern": "1000"}, {"pattern": "1001"}])
+        :param operation: axl method name, e.g. 'add_phone', or an AXL operation, e.g. 'addPhone'
+        :param items: iterable of keyword argument dictionaries, one per call
+        :param workers: calls in flight at once, default is pool_maxsize
+        :param progress: called with (done, total, index, result) as each result comes in
+        :return: list of results in input order, each what the call returned or the
+            exception (e.g. Fault) it raised
+        """
+        return [
+            result
+            for _, result in self.iter_bulk(
+                operation, items, workers=workers, progress=progress
+            )
+        ]
+
     def get_locations(
         self,
         tagfilter={
@@ -112,24 +599,50 @@ class axl(object):
             "withinVideoBandwidth": "",
             "withinImmersiveKbits": "",
         },
+        page_size=None,
     ):
         """
         Get location details
         :param mini: return a list of tuples of location details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listLocation({"name": "%"}, returnedTags=tagfilter,)[
-                "return"
-            ]["location"]
+            return list(self.iter_locations(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_locations(
+        self,
+        tagfilter={
+            "name": "",
+            "withinAudioBandwidth": "",
+            "withinVideoBandwidth": "",
+            "withinImmersiveKbits": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_locations, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listLocation", "location", {"name": "%"}, tagfilter, page_size
+        )
+
     def run_sql_query(self, query):
+        """
+        Execute SQL query and collect the rows as dictionaries. A result UCM refuses as too
+        large is fetched in chunks when the query can be, see iter_sql_query
+        :param query: SQL Query to execute
+        :return: dictionary of num_rows, query and (when num_rows > 0) rows, Faults are
+            kept in last_exception
+        """
         result = {"num_rows": 0, "query": query}
 
         try:
-            sql_result = self.client.executeSQLQuery(sql=query)
+            sql_result = self._execute_sql_query(query)
         except Exception as fault:
             sql_result = None
             self.last_exception = fault
@@ -151,14 +664,136 @@ class axl(object):
 
         return result
 
+    def iter_sql_query(self, query, types=None, chunk_size=None, workers=None, prefetch=None):
+        """
+        Execute SQL query and yield the rows as they arrive, without holding the result in
+        memory, e.g. for row in ucm.iter_sql_query("select pkid, name from device"): row.name
+        A SELECT with an ORDER BY that UCM refuses as too large is run again in chunks of
+        the size UCM suggests, rewritten with SKIP and FIRST. Order by a unique column, e.g.
+        'order by pkid', so the chunks add up to the whole result. Without an ORDER BY the
+        chunks could skip or repeat rows, so UCM's Fault is raised instead.
+        :param query: SQL Query to execute
+        :param types: convert columns as they are read, e.g. {"pkid": "uuid", "tkmodel": "int",
+            "isactive": "bool"}. Types are 'str', 'int', 'float', 'bool', 'uuid' or any
+            function taking the column text. Empty columns are None. Default leaves every
+            column a string
+        :param chunk_size: run the query in chunks of this many rows from the start. Chunks
+            shrink when UCM refuses one as too large. See last_paging_stats. Raises
+            ValueError if the query can't be chunked, e.g. has no ORDER BY
+        :param workers: chunks requested at the same time, default is the object's page_workers
+        :param prefetch: chunks fetched ahead of the caller, default is the object's page_prefetch
+        :return: generator of named tuples sharing one header (row._fields), Faults are raised
+        """
+        if chunk_size is None:
+            try:
+                yield from self._sql_rows(query, types)
+                return
+            except Fault as fault:
+                # raised before any row, the response is a fault or nothing
+                chunk_size = suggested_rows(fault)
+                if chunk_size is None or not self._can_chunk(query):
+                    raise
+        yield from self._sql_chunks(
+            lambda chunk: self._sql_rows(chunk, types), query, chunk_size, workers, prefetch
+        )
+
+    def _sql_chunks(self, execute, query, chunk_size, workers=None, prefetch=None):
+        """
+        Run a SELECT a chunk at a time, see iter_sql_query
+        :param execute: runs one chunk's query and returns its rows
+        :param query: SQL Query to execute
+        :param chunk_size: rows in the first chunk
+        :param workers: chunks requested at the same time, default is the object's page_workers
+        :param prefetch: chunks fetched ahead of the caller, default is the object's page_prefetch
+        :return: generator of the rows execute returns
+        """
+        paginator = Paginator(
+            SQLChunks(execute, query),
+            "row",
+            {},
+            {},
+            chunk_size,
+            workers=workers or self.page_workers,
+            prefetch=self.page_prefetch if prefetch is None else prefetch,
+            adaptive=self.adaptive_paging
+            or AdaptivePageSize(min_page_size=1, max_page_size=chunk_size),
+            response_size=self._zeep.transport.last_response_size,
+            stats=PagingStats(),
+        )
+        self.last_paging_stats = paginator.stats
+        yield from paginator
+
+    def _execute_sql_query(self, query):
+        """
+        Call executeSQLQuery, running the query again in chunks if UCM refuses the result as
+        too large and the query can be chunked
+        :param query: SQL Query to execute
+        :return: the executeSQLQuery response, {'return': {'row': [rows]}} or {'return': None}
+        """
+        try:
+            return self.client.executeSQLQuery(sql=query)
+        except Fault as fault:
+            chunk_size = suggested_rows(fault)
+            if chunk_size is None or not self._can_chunk(query):
+                raise
+
+        def execute(chunk):
+            response = self.client.executeSQLQuery(sql=chunk)["return"]
+            return response["row"] if response is not None else []
+
+        rows = list(self._sql_chunks(execute, query, chunk_size))
+        return {"return": {"row": rows} if rows else None}
+
+    def _sql_rows(self, query, types=None):
+        """
+        Stream the rows of one executeSQLQuery
+        :param query: SQL Query to execute
+        :param types: column conversions, see iter_sql_query
+        :return: generator of named tuples
+        """
+        raw = RawListOperation(self._zeep, self.client, "executeSQLQuery", "row")
+        with raw.response_body(sql=query) as body:
+            yield from iter_sql_rows(body, types)
+
+    @staticmethod
+    def _can_chunk(query):
+        try:
+            chunk_query(query, 0, 1)
+        except ValueError:
+            return False
+        return True
+
+    def sql_columns(
+        self, query, types=None, dictionary=True, chunk_size=None, workers=None, prefetch=None
+    ):
+        """
+        Execute SQL query and collect the result column by column, e.g. for pandas or NumPy:
+        ucm.sql_columns("select name, tkmodel from device", types={"tkmodel": "int"}).to_pandas()
+        :param query: SQL Query to execute
+        :param types: column types as for iter_sql_query. 'int', 'float' and 'bool' columns
+            are stored in typed arrays
+        :param dictionary: dictionary-encode string columns, True (default) for every column
+            with few enough distinct values, False for none, or a list of column names
+        :param chunk_size: see iter_sql_query
+        :param workers: see iter_sql_query
+        :param prefetch: see iter_sql_query
+        :return: ColumnarResult mapping column names to columns, Faults are raised
+        """
+        return ColumnarResult.from_rows(
+            self.iter_sql_query(query, types, chunk_size, workers, prefetch),
+            types=types,
+            dictionary=dictionary,
+        )
+
     def sql_query(self, query):
         """
-        Execute SQL query
+        Execute SQL query. A result UCM refuses as too large is fetched in chunks when the
+        query can be, see iter_sql_query
         :param query: SQL Query to execute
         :return: result dictionary
         """
         try:
-            return self.client.executeSQLQuery(query)["return"]
+            return self._execute_sql_query(query)["return"]
         except Fault as e:
             return e
 
@@ -180,19 +815,36 @@ class axl(object):
             "ldapDn": "",
             "userSearchBase": "",
         },
+        page_size=None,
     ):
         """
         Get LDAP Syncs
+        :param page_size: records requested per page, default is the object's page_size
         :return: result dictionary
         """
         try:
-            return self.client.listLdapDirectory(
-                {"name": "%"},
-                returnedTags=tagfilter,
-            )["return"]["ldapDirectory"]
+            return list(self.iter_ldap_dir(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_ldap_dir(
+        self,
+        tagfilter={
+            "name": "",
+            "ldapDn": "",
+            "userSearchBase": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_ldap_dir, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listLdapDirectory", "ldapDirectory", {"name": "%"}, tagfilter, page_size
+        )
+
     def do_ldap_sync(self, uuid):
         """
         Do LDAP Sync
@@ -381,19 +1033,28 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_regions(self, tagfilter={"uuid": "", "name": ""}):
+    def get_regions(self, tagfilter={"uuid": "", "name": ""}, page_size=None):
         """
         Get region details
         :param mini: return a list of tuples of region details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listRegion({"name": "%"}, returnedTags=tagfilter)[
-                "return"
-            ]["region"]
+            return list(self.iter_regions(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_regions(self, tagfilter={"uuid": "", "name": ""}, page_size=None):
+        """
+        Iterate over the same records as get_regions, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listRegion", "region", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_region(self, **args):
         """
         Get region information
@@ -425,9 +1086,7 @@ class axl(object):
         :return:
         """
         # Get all Regions
-        all_regions = self.client.listRegion({"name": "%"}, returnedTags={"name": ""})
-        # Make list of region names
-        region_names = [str(i["name"]) for i in all_regions["return"]["region"]]
+        region_names = [str(i["name"]) for i in self.iter_regions({"name": ""})]
         # Build list of dictionaries to add to region api call
         region_list = []
 
@@ -488,19 +1147,28 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_srsts(self, tagfilter={"uuid": ""}):
+    def get_srsts(self, tagfilter={"uuid": ""}, page_size=None):
         """
         Get all SRST details
         :param mini: return a list of tuples of SRST details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listSrst({"name": "%"}, returnedTags=tagfilter)[
-                "return"
-            ]["srst"]
+            return list(self.iter_srsts(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_srsts(self, tagfilter={"uuid": ""}, page_size=None):
+        """
+        Iterate over the same records as get_srsts, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listSrst", "srst", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_srst(self, **args):
         """
         Get SRST information
@@ -567,19 +1235,41 @@ class axl(object):
             "srstName": "",
             # 'localRouteGroup': [0],
         },
+        page_size=None,
     ):
         """
         Get a dictionary of device pools
         :param mini: return a list of tuples of device pool info
+        :param page_size: records requested per page, default is the object's page_size
         :return: a list of dictionary's of device pools information
         """
         try:
-            return self.client.listDevicePool({"name": "%"}, returnedTags=tagfilter,)[
-                "return"
-            ]["devicePool"]
+            return list(self.iter_device_pools(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_device_pools(
+        self,
+        tagfilter={
+            "name": "",
+            "dateTimeSettingName": "",
+            "callManagerGroupName": "",
+            "mediaResourceListName": "",
+            "regionName": "",
+            "srstName": "",
+            # 'localRouteGroup': [0],
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_device_pools, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listDevicePool", "devicePool", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_device_pool(self, **args):
         """
         Get device pool parameters
@@ -679,20 +1369,42 @@ class axl(object):
             "devicePoolName": "",
             "locationName": "",
         },
+        page_size=None,
     ):
         """
         Get conference bridges
         :param mini: List of tuples of conference bridge details
+        :param page_size: records requested per page, default is the object's page_size
         :return: results dictionary
         """
         try:
-            return self.client.listConferenceBridge(
-                {"name": "%"},
-                returnedTags=tagfilter,
-            )["return"]["conferenceBridge"]
+            return list(self.iter_conference_bridges(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_conference_bridges(
+        self,
+        tagfilter={
+            "name": "",
+            "description": "",
+            "devicePoolName": "",
+            "locationName": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_conference_bridges, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listConferenceBridge",
+            "conferenceBridge",
+            {"name": "%"},
+            tagfilter,
+            page_size,
+        )
+
     def get_conference_bridge(self, **args):
         """
         Get conference bridge parameters
@@ -766,20 +1478,35 @@ class axl(object):
             return e
 
     def get_transcoders(
-        self, tagfilter={"name": "", "description": "", "devicePoolName": ""}
+        self,
+        tagfilter={"name": "", "description": "", "devicePoolName": ""},
+        page_size=None,
     ):
         """
         Get transcoders
         :param mini: List of tuples of transcoder details
+        :param page_size: records requested per page, default is the object's page_size
         :return: results dictionary
         """
         try:
-            return self.client.listTranscoder({"name": "%"}, returnedTags=tagfilter,)[
-                "return"
-            ]["transcoder"]
+            return list(self.iter_transcoders(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_transcoders(
+        self,
+        tagfilter={"name": "", "description": "", "devicePoolName": ""},
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_transcoders, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listTranscoder", "transcoder", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_transcoder(self, **args):
         """
         Get conference bridge parameters
@@ -844,19 +1571,34 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_mtps(self, tagfilter={"name": "", "description": "", "devicePoolName": ""}):
+    def get_mtps(
+        self,
+        tagfilter={"name": "", "description": "", "devicePoolName": ""},
+        page_size=None,
+    ):
         """
         Get mtps
         :param mini: List of tuples of transcoder details
+        :param page_size: records requested per page, default is the object's page_size
         :return: results dictionary
         """
         try:
-            return self.client.listMtp({"name": "%"}, returnedTags=tagfilter,)[
-                "return"
-            ]["mtp"]
+            return list(self.iter_mtps(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_mtps(
+        self,
+        tagfilter={"name": "", "description": "", "devicePoolName": ""},
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_mtps, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate("listMtp", "mtp", {"name": "%"}, tagfilter, page_size)
+
     def get_mtp(self, **args):
         """
         Get mtp parameters
@@ -930,19 +1672,39 @@ class axl(object):
             "locationName": "",
             "sigDigits": "",
         },
+        page_size=None,
     ):
         """
         Get H323 Gateways
         :param mini: List of tuples of H323 Gateway details
+        :param page_size: records requested per page, default is the object's page_size
         :return: results dictionary
         """
         try:
-            return self.client.listH323Gateway({"name": "%"}, returnedTags=tagfilter,)[
-                "return"
-            ]["h323Gateway"]
+            return list(self.iter_h323_gateways(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_h323_gateways(
+        self,
+        tagfilter={
+            "name": "",
+            "description": "",
+            "devicePoolName": "",
+            "locationName": "",
+            "sigDigits": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_h323_gateways, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listH323Gateway", "h323Gateway", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_h323_gateway(self, **args):
         """
         Get H323 Gateway parameters
@@ -1016,19 +1778,32 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_route_groups(self, tagfilter={"name": "", "distributionAlgorithm": ""}):
+    def get_route_groups(
+        self, tagfilter={"name": "", "distributionAlgorithm": ""}, page_size=None
+    ):
         """
         Get route groups
         :param mini: return a list of tuples of route group details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listRouteGroup({"name": "%"}, returnedTags=tagfilter)[
-                "return"
-            ]["routeGroup"]
+            return list(self.iter_route_groups(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_route_groups(
+        self, tagfilter={"name": "", "distributionAlgorithm": ""}, page_size=None
+    ):
+        """
+        Iterate over the same records as get_route_groups, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listRouteGroup", "routeGroup", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_route_group(self, **args):
         """
         Get route group
@@ -1095,19 +1870,30 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_route_lists(self, tagfilter={"name": "", "description": ""}):
+    def get_route_lists(self, tagfilter={"name": "", "description": ""}, page_size=None):
         """
         Get route lists
         :param mini: return a list of tuples of route list details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listRouteList({"name": "%"}, returnedTags=tagfilter)[
-                "return"
-            ]["routeList"]
+            return list(self.iter_route_lists(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_route_lists(
+        self, tagfilter={"name": "", "description": ""}, page_size=None
+    ):
+        """
+        Iterate over the same records as get_route_lists, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listRouteList", "routeList", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_route_list(self, **args):
         """
         Get route list
@@ -1204,19 +1990,28 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_partitions(self, tagfilter={"name": "", "description": ""}):
+    def get_partitions(self, tagfilter={"name": "", "description": ""}, page_size=None):
         """
         Get partitions
         :param mini: return a list of tuples of partition details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listRoutePartition(
-                {"name": "%"}, returnedTags=tagfilter
-            )["return"]["routePartition"]
+            return list(self.iter_partitions(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_partitions(self, tagfilter={"name": "", "description": ""}, page_size=None):
+        """
+        Iterate over the same records as get_partitions, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listRoutePartition", "routePartition", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_partition(self, **args):
         """
         Get partition details
@@ -1276,19 +2071,30 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_calling_search_spaces(self, tagfilter={"name": "", "description": ""}):
+    def get_calling_search_spaces(
+        self, tagfilter={"name": "", "description": ""}, page_size=None
+    ):
         """
         Get calling search spaces
         :param mini: return a list of tuples of css details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listCss({"name": "%"}, returnedTags=tagfilter)["return"][
-                "css"
-            ]
+            return list(self.iter_calling_search_spaces(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_calling_search_spaces(
+        self, tagfilter={"name": "", "description": ""}, page_size=None
+    ):
+        """
+        Iterate over the same records as get_calling_search_spaces, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate("listCss", "css", {"name": "%"}, tagfilter, page_size)
+
     def get_calling_search_space(self, **args):
         """
         Get Calling search space details
@@ -1359,21 +2165,31 @@ class axl(object):
             return e
 
     def get_route_patterns(
-        self, tagfilter={"pattern": "", "description": "", "uuid": ""}
+        self, tagfilter={"pattern": "", "description": "", "uuid": ""}, page_size=None
     ):
         """
         Get route patterns
         :param mini: return a list of tuples of route pattern details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listRoutePattern(
-                {"pattern": "%"},
-                returnedTags=tagfilter,
-            )["return"]["routePattern"]
+            return list(self.iter_route_patterns(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_route_patterns(
+        self, tagfilter={"pattern": "", "description": "", "uuid": ""}, page_size=None
+    ):
+        """
+        Iterate over the same records as get_route_patterns, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listRoutePattern", "routePattern", {"pattern": "%"}, tagfilter, page_size
+        )
+
     def get_route_pattern(self, pattern="", uuid=""):
         """
         Get route pattern
@@ -1483,19 +2299,36 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_media_resource_groups(self, tagfilter={"name": "", "description": ""}):
+    def get_media_resource_groups(
+        self, tagfilter={"name": "", "description": ""}, page_size=None
+    ):
         """
         Get media resource groups
         :param mini: return a list of tuples of route pattern details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listMediaResourceGroup(
-                {"name": "%"}, returnedTags=tagfilter
-            )["return"]["mediaResourceGroup"]
+            return list(self.iter_media_resource_groups(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_media_resource_groups(
+        self, tagfilter={"name": "", "description": ""}, page_size=None
+    ):
+        """
+        Iterate over the same records as get_media_resource_groups, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listMediaResourceGroup",
+            "mediaResourceGroup",
+            {"name": "%"},
+            tagfilter,
+            page_size,
+        )
+
     def get_media_resource_group(self, **args):
         """
         Get a media resource group details
@@ -1560,19 +2393,32 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_media_resource_group_lists(self, tagfilter={"name": ""}):
+    def get_media_resource_group_lists(self, tagfilter={"name": ""}, page_size=None):
         """
         Get media resource groups
         :param mini: return a list of tuples of route pattern details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listMediaResourceList(
-                {"name": "%"}, returnedTags=tagfilter
-            )["return"]["mediaResourceList"]
+            return list(self.iter_media_resource_group_lists(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_media_resource_group_lists(self, tagfilter={"name": ""}, page_size=None):
+        """
+        Iterate over the same records as get_media_resource_group_lists, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listMediaResourceList",
+            "mediaResourceList",
+            {"name": "%"},
+            tagfilter,
+            page_size,
+        )
+
     def get_media_resource_group_list(self, name):
         """
         Get a media resource group list details
@@ -1637,19 +2483,37 @@ class axl(object):
             "description": "",
             "routePartitionName": "",
         },
+        page_size=None,
     ):
         """
         Get directory numbers
         :param mini: return a list of tuples of directory number details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listLine({"pattern": "%"}, returnedTags=tagfilter,)[
-                "return"
-            ]["line"]
+            return list(self.iter_directory_numbers(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_directory_numbers(
+        self,
+        tagfilter={
+            "pattern": "",
+            "description": "",
+            "routePartitionName": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_directory_numbers, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listLine", "line", {"pattern": "%"}, tagfilter, page_size
+        )
+
     def get_directory_number(self, **args):
         """
         Get directory number details
@@ -1808,19 +2672,32 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_cti_route_points(self, tagfilter={"name": "", "description": ""}):
+    def get_cti_route_points(
+        self, tagfilter={"name": "", "description": ""}, page_size=None
+    ):
         """
         Get CTI route points
         :param mini: return a list of tuples of CTI route point details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listCtiRoutePoint({"name": "%"}, returnedTags=tagfilter)[
-                "return"
-            ]["ctiRoutePoint"]
+            return list(self.iter_cti_route_points(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_cti_route_points(
+        self, tagfilter={"name": "", "description": ""}, page_size=None
+    ):
+        """
+        Iterate over the same records as get_cti_route_points, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listCtiRoutePoint", "ctiRoutePoint", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_cti_route_point(self, **args):
         """
         Get CTI route point details
@@ -1944,24 +2821,36 @@ class axl(object):
             "locationName": "",
             "callingSearchSpaceName": "",
         },
+        page_size=None,
     ):
-        skip = 0
-        a = []
-
-        def inner(skip):
-            while True:
-                res = self.client.listPhone(
-                    searchCriteria=query, returnedTags=tagfilter, first=1000, skip=skip
-                )["return"]
-                skip = skip + 1000
-                if res is not None and "phone" in res:
-                    yield res["phone"]
-                else:
-                    break
+        """
+        Get phones
+        :param query: searchCriteria, e.g. {"name": "SEP%"}
+        :param tagfilter: returnedTags
+        :param page_size: records requested per page, default is the object's page_size
+        :return: A list of dictionary's
+        """
+        return list(self.iter_phones(query, tagfilter, page_size))
 
-        for each in inner(skip):
-            a.extend(each)
-        return a
+    def iter_phones(
+        self,
+        query={"name": "%"},
+        tagfilter={
+            "name": "",
+            "product": "",
+            "description": "",
+            "protocol": "",
+            "locationName": "",
+            "callingSearchSpaceName": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_phones, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate("listPhone", "phone", query, tagfilter, page_size)
 
     def get_phone(self, **args):
         """
@@ -2159,20 +3048,38 @@ class axl(object):
             "protocol": "",
             "phoneTemplateName": "",
         },
+        page_size=None,
     ):
         """
         Get device profile details
         :param mini: return a list of tuples of device profile details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listDeviceProfile(
-                {"name": "%"},
-                returnedTags=tagfilter,
-            )["return"]["deviceProfile"]
+            return list(self.iter_device_profiles(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_device_profiles(
+        self,
+        tagfilter={
+            "name": "",
+            "product": "",
+            "protocol": "",
+            "phoneTemplateName": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_device_profiles, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listDeviceProfile", "deviceProfile", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_device_profile(self, **args):
         """
         Get device profile parameters
@@ -2285,7 +3192,9 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_users(self, tagfilter={"userid": "", "firstName": "", "lastName": ""}):
+    def get_users(
+        self, tagfilter={"userid": "", "firstName": "", "lastName": ""}, page_size=None
+    ):
         """
         Get users details
         Parameters
@@ -2294,29 +3203,27 @@ class axl(object):
             userid: None or uuid of user
             firstName: None or first name of user
             lastName: None or last name of user
-        
+        page_size : int, optional
+            records requested per page, default is the object's page_size
+
         Returns
         -------
         users
             A list of Users
         """
-        skip = 0
-        a = []
-
-        def inner(skip):
-            while True:
-                res = self.client.listUser(
-                    {"userid": "%"}, returnedTags=tagfilter, first=1000, skip=skip
-                )["return"]
-                skip = skip + 1000
-                if res is not None and "user" in res:
-                    yield res["user"]
-                else:
-                    break
+        return list(self.iter_users(tagfilter, page_size))
 
-        for each in inner(skip):
-            a.extend(each)
-        return a
+    def iter_users(
+        self, tagfilter={"userid": "", "firstName": "", "lastName": ""}, page_size=None
+    ):
+        """
+        Iterate over the same records as get_users, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listUser", "user", {"userid": "%"}, tagfilter, page_size
+        )
 
     def get_user(self, userid):
         """
@@ -2446,33 +3353,45 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_translations(self):
+    def get_translations(self, page_size=None):
         """
         Get translation patterns
         :param mini: return a list of tuples of route pattern details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listTransPattern(
-                {"pattern": "%"},
-                returnedTags={
-                    "pattern": "",
-                    "description": "",
-                    "uuid": "",
-                    "routePartitionName": "",
-                    "callingSearchSpaceName": "",
-                    "useCallingPartyPhoneMask": "",
-                    "patternUrgency": "",
-                    "provideOutsideDialtone": "",
-                    "prefixDigitsOut": "",
-                    "calledPartyTransformationMask": "",
-                    "callingPartyTransformationMask": "",
-                    "digitDiscardInstructionName": "",
-                    "callingPartyPrefixDigits": "",
-                },
-            )["return"]["transPattern"]
-        except Fault as e:
-            return e
+            return list(self.iter_translations(page_size))
+        except Fault as e:
+            return e
+
+    def iter_translations(self, page_size=None):
+        """
+        Iterate over the same records as get_translations, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listTransPattern",
+            "transPattern",
+            {"pattern": "%"},
+            {
+                "pattern": "",
+                "description": "",
+                "uuid": "",
+                "routePartitionName": "",
+                "callingSearchSpaceName": "",
+                "useCallingPartyPhoneMask": "",
+                "patternUrgency": "",
+                "provideOutsideDialtone": "",
+                "prefixDigitsOut": "",
+                "calledPartyTransformationMask": "",
+                "callingPartyTransformationMask": "",
+                "digitDiscardInstructionName": "",
+                "callingPartyPrefixDigits": "",
+            },
+            page_size,
+        )
 
     def get_translation(self, pattern="", routePartitionName="", uuid=""):
         """
@@ -2685,25 +3604,37 @@ class axl(object):
         except Fault as e:
             return e
 
-    def list_route_plan(self, pattern=""):
+    def list_route_plan(self, pattern="", page_size=None):
         """
         List Route Plan
         :param pattern: Route Plan Contains Pattern
+        :param page_size: records requested per page, default is the object's page_size
         :return: results dictionary
         """
         try:
-            return self.client.listRoutePlan(
-                {"dnOrPattern": "%" + pattern + "%"},
-                returnedTags={
-                    "dnOrPattern": "",
-                    "partition": "",
-                    "type": "",
-                    "routeDetail": "",
-                },
-            )["return"]["routePlan"]
+            return list(self.iter_route_plan(pattern, page_size))
         except Fault as e:
             return e
 
+    def iter_route_plan(self, pattern="", page_size=None):
+        """
+        Iterate over the same records as list_route_plan, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listRoutePlan",
+            "routePlan",
+            {"dnOrPattern": "%" + pattern + "%"},
+            {
+                "dnOrPattern": "",
+                "partition": "",
+                "type": "",
+                "routeDetail": "",
+            },
+            page_size,
+        )
+
     def list_route_plan_specific(self, pattern=""):
         """
         List Route Plan
@@ -2723,20 +3654,32 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_called_party_xforms(self):
+    def get_called_party_xforms(self, page_size=None):
         """
         Get called party xforms
         :param mini: return a list of tuples of called party transformation pattern details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listCalledPartyTransformationPattern(
-                {"pattern": "%"},
-                returnedTags={"pattern": "", "description": "", "uuid": ""},
-            )["return"]["calledPartyTransformationPattern"]
+            return list(self.iter_called_party_xforms(page_size))
         except Fault as e:
             return e
 
+    def iter_called_party_xforms(self, page_size=None):
+        """
+        Iterate over the same records as get_called_party_xforms, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listCalledPartyTransformationPattern",
+            "calledPartyTransformationPattern",
+            {"pattern": "%"},
+            {"pattern": "", "description": "", "uuid": ""},
+            page_size,
+        )
+
     def get_called_party_xform(self, **args):
         """
         Get called party xform details
@@ -2826,20 +3769,32 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_calling_party_xforms(self):
+    def get_calling_party_xforms(self, page_size=None):
         """
         Get calling party xforms
         :param mini: return a list of tuples of calling party transformation pattern details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            return self.client.listCallingPartyTransformationPattern(
-                {"pattern": "%"},
-                returnedTags={"pattern": "", "description": "", "uuid": ""},
-            )["return"]["callingPartyTransformationPattern"]
+            return list(self.iter_calling_party_xforms(page_size))
         except Fault as e:
             return e
 
+    def iter_calling_party_xforms(self, page_size=None):
+        """
+        Iterate over the same records as get_calling_party_xforms, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listCallingPartyTransformationPattern",
+            "callingPartyTransformationPattern",
+            {"pattern": "%"},
+            {"pattern": "", "description": "", "uuid": ""},
+            page_size,
+        )
+
     def get_calling_party_xform(self, **args):
         """
         Get calling party xform details
@@ -2930,15 +3885,29 @@ class axl(object):
             return e
 
     def get_sip_trunks(
-        self, tagfilter={"name": "", "sipProfileName": "", "callingSearchSpaceName": ""}
+        self,
+        tagfilter={"name": "", "sipProfileName": "", "callingSearchSpaceName": ""},
+        page_size=None,
     ):
         try:
-            return self.client.listSipTrunk({"name": "%"}, returnedTags=tagfilter)[
-                "return"
-            ]["sipTrunk"]
+            return list(self.iter_sip_trunks(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_sip_trunks(
+        self,
+        tagfilter={"name": "", "sipProfileName": "", "callingSearchSpaceName": ""},
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_sip_trunks, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listSipTrunk", "sipTrunk", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_sip_trunk(self, **args):
         """
         Get sip trunk
@@ -3011,15 +3980,26 @@ class axl(object):
         except Fault as e:
             return e
 
-    def list_process_nodes(self):
+    def list_process_nodes(self, page_size=None):
         try:
-            return self.client.listProcessNode(
-                {"name": "%", "processNodeRole": "CUCM Voice/Video"},
-                returnedTags={"name": ""},
-            )["return"]["processNode"]
+            return list(self.iter_process_nodes(page_size))
         except Fault as e:
             return e
 
+    def iter_process_nodes(self, page_size=None):
+        """
+        Iterate over the same records as list_process_nodes, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listProcessNode",
+            "processNode",
+            {"name": "%", "processNodeRole": "CUCM Voice/Video"},
+            {"name": ""},
+            page_size,
+        )
+
     def add_call_manager_group(self, name, members):
         """
         Add call manager group
@@ -3044,19 +4024,32 @@ class axl(object):
         except Fault as e:
             return e
 
-    def get_call_manager_groups(self):
+    def get_call_manager_groups(self, page_size=None):
         """
         Get call manager groups
         :param name: name of cmg
+        :param page_size: records requested per page, default is the object's page_size
         :return: result dictionary
         """
         try:
-            return self.client.listCallManagerGroup(
-                {"name": "%"}, returnedTags={"name": ""}
-            )["return"]["callManagerGroup"]
+            return list(self.iter_call_manager_groups(page_size))
         except Fault as e:
             return e
 
+    def iter_call_manager_groups(self, page_size=None):
+        """
+        Iterate over the same records as get_call_manager_groups, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listCallManagerGroup",
+            "callManagerGroup",
+            {"name": "%"},
+            {"name": ""},
+            page_size,
+        )
+
     def update_call_manager_group(self, **args):
         """
         Update call manager group
@@ -3087,24 +4080,37 @@ class axl(object):
             "description": "",
             "routePartitionName": "",
         },
+        page_size=None,
     ):
         """
         Get hunt pilots
         :param mini: return a list of tuples of hunt pilot details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            response = self.client.listHuntPilot(
-                {"pattern": "%"},
-                returnedTags=tagfilter,
-            )["return"]
-            if response:
-                return response["huntPilot"]
-            else:
-                return response
+            return list(self.iter_hunt_pilots(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_hunt_pilots(
+        self,
+        tagfilter={
+            "pattern": "",
+            "description": "",
+            "routePartitionName": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_hunt_pilots, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listHuntPilot", "huntPilot", {"pattern": "%"}, tagfilter, page_size
+        )
+
     def get_hunt_pilot(self, **args):
         """
         Get hunt pilot details
@@ -3172,24 +4178,39 @@ class axl(object):
             "voiceMailUsage": "",
             "description": "",
         },
+        page_size=None,
     ):
         """
         Get hunt lists
         :param mini: return a list of tuples of hunt pilot details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            response = self.client.listHuntList(
-                {"name": "%"},
-                returnedTags=tagfilter,
-            )["return"]
-            if response:
-                return response["huntList"]
-            else:
-                return response
+            return list(self.iter_hunt_lists(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_hunt_lists(
+        self,
+        tagfilter={
+            "name": "",
+            "callManagerGroupName": "",
+            "routeListEnabled": "",
+            "voiceMailUsage": "",
+            "description": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_hunt_lists, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listHuntList", "huntList", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_hunt_list(self, **args):
         """
         Get hunt list details
@@ -3255,24 +4276,41 @@ class axl(object):
             "huntAlgorithmNotAvailable": "",
             "autoLogOffHunt": "",
         },
+        page_size=None,
     ):
         """
         Get Line Groups
         :param mini: return a list of tuples of hunt pilot details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            response = self.client.listLineGroup(
-                {"name": "%"},
-                returnedTags=tagfilter,
-            )["return"]
-            if response:
-                return response["lineGroup"]
-            else:
-                return response
+            return list(self.iter_line_groups(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_line_groups(
+        self,
+        tagfilter={
+            "name": "",
+            "distributionAlgorithm": "",
+            "rnaReversionTimeOut": "",
+            "huntAlgorithmNoAnswer": "",
+            "huntAlgorithmBusy": "",
+            "huntAlgorithmNotAvailable": "",
+            "autoLogOffHunt": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_line_groups, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listLineGroup", "lineGroup", {"name": "%"}, tagfilter, page_size
+        )
+
     def get_line_group(self, **args):
         """
         Get line group details
@@ -3343,24 +4381,46 @@ class axl(object):
             "pickupNotificationTimer": "",
             "callInfoForPickupNotification": "",
         },
+        page_size=None,
     ):
         """
         Get Call Pickup Groups
         :param pattern: return a list of tuples of hunt pilot details
+        :param page_size: records requested per page, default is the object's page_size
         :return: A list of dictionary's
         """
         try:
-            response = self.client.listCallPickupGroup(
-                {"pattern": "%"},
-                returnedTags=tagfilter,
-            )["return"]
-            if response:
-                return response["callPickupGroup"]
-            else:
-                return response
+            return list(self.iter_call_pickup_groups(tagfilter, page_size))
         except Fault as e:
             return e
 
+    def iter_call_pickup_groups(
+        self,
+        tagfilter={
+            "name": "",
+            "pattern": "",
+            "description": "",
+            "usage": "",
+            "routePartitionName": "",
+            "pickupNotification": "",
+            "pickupNotificationTimer": "",
+            "callInfoForPickupNotification": "",
+        },
+        page_size=None,
+    ):
+        """
+        Iterate over the same records as get_call_pickup_groups, fetched a page at a time
+        :param page_size: records requested per page, default is the object's page_size
+        :return: generator of result dictionaries, Faults are raised
+        """
+        yield from self._paginate(
+            "listCallPickupGroup",
+            "callPickupGroup",
+            {"pattern": "%"},
+            tagfilter,
+            page_size,
+        )
+
     def get_call_pickup_group(self, **args):
         """
         Get call pickup group details
@@ -0,0 +1,85 @@
+"""Running one AXL call for each of many items on a thread pool.
+
+``run_bulk`` calls a function once per set of keyword arguments with ``workers`` calls in
+flight. Results come back in input order, or as the calls complete. Items are read from
+the input lazily and only a window of ``workers`` times ``window`` calls is kept in flight,
+so a generator of a million items is fine. An exception raised by one call is returned as
+that item's result rather than stopping the rest.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+# called with (items done, items in total or None if unknown, index, result)
+Progress = Callable[[int, Optional[int], int, Any], None]
+
+
+def _call(func: Callable, kwargs: Dict[str, Any]) -> Any:
+    try:
+        return func(**kwargs)
+    except Exception as error:
+        return error
+
+
+def run_bulk(
+    func: Callable,
+    items: Iterable[Dict[str, Any]],
+    workers: int = 10,
+    ordered: bool = True,
+    progress: Optional[Progress] = None,
+    window: int = 2,
+) -> Iterator[Tuple[int, Any]]:
+    """Calls func(**kwargs) for every kwargs in items on a thread pool
+
+    :param func: Function to call, e.g. axl.add_phone
+    :param items: Keyword arguments for each call
+    :param workers: Calls in flight at once, defaults to 10
+    :param ordered: Yield results in input order, rather than as they complete, defaults to True
+    :param progress: Called with (done, total, index, result) as each result is yielded.
+        total is None when items has no len()
+    :param window: Calls queued per worker ahead of the results yielded, defaults to 2
+    :return: (index, result) tuples, where result is what the call returned or the
+        exception it raised
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    total = len(items) if hasattr(items, "__len__") else None
+    source = enumerate(items)
+    limit = workers * window
+    done = 0
+    pool = ThreadPoolExecutor(workers, thread_name_prefix="ciscoaxl-bulk")
+    pending: Deque[Tuple[int, Future]] = deque()
+    running: Dict[Future, int] = {}
+
+    def submit(count: int) -> None:
+        for index, kwargs in islice(source, count):
+            future = pool.submit(_call, func, kwargs)
+            running[future] = index
+            if ordered:
+                pending.append((index, future))
+
+    def finished() -> Iterator[Tuple[int, Any]]:
+        if ordered:
+            index, future = pending.popleft()
+            del running[future]
+            yield index, future.result()
+            return
+        completed: Set[Future] = wait(running, return_when=FIRST_COMPLETED).done
+        for future in completed:
+            yield running.pop(future), future.result()
+
+    try:
+        submit(limit)
+        while running:
+            for index, result in finished():
+                done += 1
+                if progress is not None:
+                    progress(done, total, index, result)
+                yield index, result
+            submit(limit - len(running))
+    finally:
+        for future in running:
+            future.cancel()
+        pool.shutdown(wait=False)
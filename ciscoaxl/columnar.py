@@ -0,0 +1,251 @@
+"""Column-oriented result sets for SQL and list* results.
+
+``ColumnarResult`` keeps one array per column instead of one dict per row. Integer, float and
+bool columns go into Python ``array`` buffers. String columns are dictionary-encoded: the
+distinct values are stored once, and each row holds only an int32 code. That suits low
+cardinality fields like ``devicePoolName`` or ``tkmodel``. A string column with too many
+distinct values to be worth encoding falls back to a plain list.
+
+The columns can be handed to NumPy, pyarrow or pandas without building rows first:
+``to_numpy()``, ``to_arrow()`` and ``to_pandas()`` import those packages only when called
+(``pip install ciscoaxl[columnar]``).
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+# AXL SQL types (see ciscoaxl.sql.COLUMN_TYPES) stored in a typed array, by array typecode
+ARRAY_TYPECODES = {"int": "q", "float": "d", "bool": "B"}
+_NUMPY_DTYPES = {"q": "int64", "d": "float64", "B": "bool"}
+# below this many distinct values a column always stays dictionary-encoded
+MIN_DICTIONARY_VALUES = 1024
+
+Column = Union[array, "DictionaryColumn", List[Any]]
+
+
+class DictionaryColumn(object):
+    """A string column stored as int32 codes into its distinct values. None is code -1"""
+
+    __slots__ = ("codes", "values", "_index")
+
+    def __init__(self) -> None:
+        self.codes = array("i")
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def append(self, value: Optional[str]) -> None:
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self._index.get(value)
+        if code is None:
+            if value.__class__ is not str:
+                raise TypeError(f"a DictionaryColumn holds strings, not {type(value).__name__}")
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, position: int) -> Optional[str]:
+        code = self.codes[position]
+        return None if code < 0 else self.values[code]
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        values = self.values
+        return (None if code < 0 else values[code] for code in self.codes)
+
+    def __repr__(self) -> str:
+        return f"DictionaryColumn(rows={len(self.codes)}, values={len(self.values)})"
+
+
+class ColumnarResult(Mapping):
+    """Rows collected column by column; a mapping of column name to column.
+
+    A column is an ``array`` for 'int', 'float' and 'bool' columns, a ``DictionaryColumn``
+    for strings, or a list for anything else. A typed column that receives a None, or a
+    string column that receives something other than a string, becomes a list.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        types: Optional[Dict[str, str]] = None,
+        dictionary: Union[bool, Iterable[str]] = True,
+    ) -> None:
+        """
+        :param names: Column names, in row order
+        :param types: AXL SQL type of the columns the rows have already been converted to,
+            e.g. {"tkmodel": "int", "isactive": "bool"}, so they can be stored in arrays.
+            Other columns are taken to be strings
+        :param dictionary: Dictionary-encode string columns, defaults to True: every string
+            column is encoded until it holds more than MIN_DICTIONARY_VALUES distinct
+            values, over half its rows. False stores strings in lists, and a list of names
+            encodes just those columns, however many distinct values they have
+        """
+        types = types or {}
+        if dictionary is True or dictionary is False:
+            encoded = set(names) if dictionary else set()
+            fixed = set()
+        else:
+            encoded = fixed = set(dictionary)
+        self.num_rows = 0
+        self.columns: Dict[str, Column] = {}
+        for name in names:
+            kind = types.get(name, "str")
+            if kind in ARRAY_TYPECODES:
+                self.columns[name] = array(ARRAY_TYPECODES[kind])
+            elif kind == "str" and name in encoded:
+                self.columns[name] = DictionaryColumn()
+            else:
+                self.columns[name] = []
+        self._names = list(self.columns)
+        self._appends = [column.append for column in self.columns.values()]
+        # dictionary columns that give up their encoding when it stops paying off
+        self._adaptive = [
+            name
+            for name, column in self.columns.items()
+            if isinstance(column, DictionaryColumn) and name not in fixed
+        ]
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Sequence[Any]],
+        names: Optional[Sequence[str]] = None,
+        types: Optional[Dict[str, str]] = None,
+        dictionary: Union[bool, Iterable[str]] = True,
+    ) -> "ColumnarResult":
+        """Collects rows, e.g. from axl.iter_sql_query(), without keeping them
+
+        :param rows: Tuples of values in column order, or dicts keyed by column name
+        :param names: Column names, defaults to the first row's _fields or keys
+        :param types: See ColumnarResult
+        :param dictionary: See ColumnarResult
+        :return: The columns
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if names is None:
+            if first is None:
+                names = []
+            elif isinstance(first, dict):
+                names = list(first)
+            else:
+                names = first._fields
+        result = cls(names, types, dictionary)
+        if first is not None:
+            result.append(first)
+            for row in rows:
+                result.append(row)
+        return result
+
+    def append(self, row: Union[Sequence[Any], Dict[str, Any]]) -> None:
+        """Adds one row: a tuple in column order, or a dict keyed by column name"""
+        if isinstance(row, dict):
+            row = [row.get(name) for name in self._names]
+        for position, value in enumerate(row):
+            try:
+                self._appends[position](value)
+            except TypeError:
+                # None in a typed array, or a non-string in a dictionary column
+                self._to_list(self._names[position]).append(value)
+        self.num_rows += 1
+        if self._adaptive and self.num_rows % MIN_DICTIONARY_VALUES == 0:
+            for name in list(self._adaptive):
+                column = self.columns[name]
+                if len(column.values) > MIN_DICTIONARY_VALUES and len(column.values) * 2 > len(column):
+                    self._to_list(name)
+
+    def _to_list(self, name: str) -> List[Any]:
+        """Replaces a column with a list of its values"""
+        column = self.columns[name] = list(self.columns[name])
+        self._appends[self._names.index(name)] = column.append
+        if name in self._adaptive:
+            self._adaptive.remove(name)
+        return column
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def rows(self) -> Iterator[tuple]:
+        """Yields the rows back as tuples in column order (bool columns as 0 and 1)"""
+        return zip(*self.columns.values())
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Columns as NumPy arrays. Typed arrays are shared, not copied; string and other
+        columns become object arrays (which share the strings)
+
+        :return: {column name: numpy.ndarray}
+        """
+        import numpy
+
+        arrays = {}
+        for name, column in self.columns.items():
+            if isinstance(column, array):
+                arrays[name] = numpy.frombuffer(column, dtype=_NUMPY_DTYPES[column.typecode])
+            elif isinstance(column, DictionaryColumn):
+                # code -1 picks the None appended at the end
+                values = numpy.array(column.values + [None], dtype=object)
+                arrays[name] = values[numpy.frombuffer(column.codes, dtype=numpy.int32)]
+            else:
+                arrays[name] = numpy.array(column, dtype=object)
+        return arrays
+
+    def to_arrow(self):
+        """Columns as a pyarrow Table; string columns that are dictionary-encoded here stay
+        dictionary-encoded
+
+        :return: pyarrow.Table
+        """
+        import numpy
+        import pyarrow
+
+        arrays = {}
+        for name, column in self.columns.items():
+            if isinstance(column, array):
+                arrays[name] = pyarrow.array(
+                    numpy.frombuffer(column, dtype=_NUMPY_DTYPES[column.typecode])
+                )
+            elif isinstance(column, DictionaryColumn):
+                codes = numpy.frombuffer(column.codes, dtype=numpy.int32)
+                arrays[name] = pyarrow.DictionaryArray.from_arrays(
+                    pyarrow.array(codes, mask=codes < 0),
+                    pyarrow.array(column.values, type=pyarrow.string()),
+                )
+            else:
+                arrays[name] = pyarrow.array(column)
+        return pyarrow.table(arrays)
+
+    def to_pandas(self):
+        """Columns as a pandas DataFrame; dictionary-encoded columns become Categoricals
+
+        :return: pandas.DataFrame
+        """
+        import numpy
+        import pandas
+
+        data = {}
+        for name, column in self.columns.items():
+            if isinstance(column, DictionaryColumn):
+                # pandas also uses -1 for a missing value
+                data[name] = pandas.Categorical.from_codes(
+                    numpy.frombuffer(column.codes, dtype=numpy.int32),
+                    categories=column.values,
+                )
+            elif isinstance(column, array):
+                data[name] = numpy.frombuffer(column, dtype=_NUMPY_DTYPES[column.typecode])
+            else:
+                data[name] = column
+        return pandas.DataFrame(data, columns=list(self.columns))
+
+    def __repr__(self) -> str:
+        return f"ColumnarResult(rows={self.num_rows}, columns={self._names})"
@@ -1,11 +1,12 @@
 from functools import wraps, partial
-from typing import Callable, OrderedDict, TypeVar, Union, Sequence
+from typing import TYPE_CHECKING, Callable, OrderedDict, TypeVar, Union, Sequence
 import inspect
-from zeep.xsd.valueobjects import CompoundValue
 from copy import deepcopy
-from ciscoaxl.wsdl import fix_return_tags
 import ciscoaxl.config as cfg
 
+if TYPE_CHECKING:
+    from zeep.xsd.valueobjects import CompoundValue
+
 
 class _StaticIdentity:
     def __init__(self, value: str) -> None:
@@ -96,7 +97,7 @@ def _tag_serialize_filter(tags: Union[list, dict], data: dict) -> dict:
     return working_data
 
 
-def _tag_zeep_filter(tags: Union[list, dict], data: CompoundValue) -> CompoundValue:
+def _tag_zeep_filter(tags: Union[list, dict], data: "CompoundValue") -> "CompoundValue":
     data_odict: OrderedDict = data.__values__
 
     """Since we are supporting >3.6, we can go back and forth
@@ -131,6 +132,10 @@ The `element_name` should be the name of the XSD element being called by the fun
 def check_tagfilter(element_name: str, children: Union[Sequence, None] = None):
     def check_tagfilter_decorator(func: TCallable) -> TCallable:
         def processing(func, args, kwargs, children) -> Union[tuple, None]:
+            # zeep is only needed once a decorated method is called
+            from zeep.xsd.valueobjects import CompoundValue
+            from ciscoaxl.wsdl import fix_return_tags
+
             parameters = inspect.signature(func).parameters
             tag_param = parameters.get("tagfilter", Missing)
 
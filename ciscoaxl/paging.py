@@ -0,0 +1,614 @@
+"""Pagination of AXL list* operations.
+
+Every list* request takes ``first`` (page size) and ``skip`` (offset). Asking for everything
+in one request can exceed the response size UCM is willing to return on a large cluster, so
+the list wrappers on ``axl`` fetch results a page at a time through ``Paginator``.
+
+With ``workers`` above 1, several pages are requested at once: a window of consecutive
+``skip`` offsets is kept in flight and pages are yielded in their original order as the
+window slides forward. When the number of records isn't known up front, the first short
+page marks the end and the requests beyond it are dropped.
+
+With ``prefetch`` set, a background thread fetches pages ahead of the caller into a queue of
+that many pages, so the next request is already under way while the current page is being
+processed. When the queue is full the thread waits for the caller to catch up.
+
+With an ``AdaptivePageSize`` policy, the page size follows what the responses look like:
+it grows while pages come back small and quick, shrinks when they get big or slow, and
+drops right away (re-requesting the same records in smaller pieces) when UCM refuses a
+request as too large or throttles it. The refused size then becomes a ceiling for the rest
+of the listing. ``PagingStats`` records what was decided and why.
+
+``PrefixPartitioner`` avoids deep ``skip`` offsets altogether. It splits a prefix search
+(``SEP%``) into one partition per next character (``SEP0%`` ... ``SEPF%``) until each holds
+at most ``partition_size`` records, then pages through each partition on its own. After a
+split it checks that the partitions added up to the whole, so records whose key continues
+with a character outside the alphabet raise an error instead of going missing.
+"""
+
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from zeep.exceptions import Fault
+
+from ciscoaxl.transport import THROTTLE_MESSAGES
+
+DEFAULT_PAGE_SIZE = 1000
+# MAC addresses in device names, and the digits of directory numbers
+HEX_ALPHABET = "0123456789ABCDEF"
+
+# e.g. "Query request too large. Total rows matched: 52110 rows.
+# Suggestive Row Fetch: less than 3841 rows"
+_TOO_LARGE = re.compile(
+    r"request too large.*?less than (\d+) rows", re.IGNORECASE | re.DOTALL
+)
+
+
+def suggested_rows(fault: Fault) -> Optional[int]:
+    """Rows UCM says it would have returned, from a "Query request too large" fault
+
+    :param fault: The Fault UCM answered with
+    :return: The largest row count UCM accepts, or None for any other fault
+    """
+    message = str(getattr(fault, "message", fault) or "")
+    suggested = _TOO_LARGE.search(message)
+    # "less than 3841 rows"
+    return int(suggested.group(1)) - 1 if suggested else None
+
+
+class PagingStats(object):
+    """What a Paginator requested, received and decided. Safe to read while a listing runs."""
+
+    def __init__(self, history: int = 100) -> None:
+        """
+        :param history: Number of recent page size decisions to keep, defaults to 100
+        """
+        self.requests = 0
+        self.records = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.faults = 0
+        self.page_size: Optional[int] = None
+        self.smallest_page_size: Optional[int] = None
+        self.largest_page_size: Optional[int] = None
+        # (skip, requested, received, bytes, seconds, next page size, reason)
+        self.decisions: Deque[Tuple] = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        skip: int,
+        requested: int,
+        received: int,
+        size: Optional[int],
+        seconds: float,
+        page_size: int,
+        reason: str,
+    ) -> None:
+        """Adds one request and the page size chosen after it"""
+        with self._lock:
+            if reason.startswith("fault"):
+                self.faults += 1
+            elif reason == "probe":
+                # a PrefixPartitioner checking a partition's size, not a page of the listing
+                self.requests += 1
+                self.bytes += size or 0
+                self.seconds += seconds
+            else:
+                self.requests += 1
+                self.records += received
+                self.bytes += size or 0
+                self.seconds += seconds
+                self.smallest_page_size = min(
+                    self.smallest_page_size or requested, requested
+                )
+                self.largest_page_size = max(
+                    self.largest_page_size or requested, requested
+                )
+            self.page_size = page_size
+            self.decisions.append((skip, requested, received, size, seconds, page_size, reason))
+
+    def __repr__(self) -> str:
+        return (
+            f"PagingStats(requests={self.requests}, records={self.records}, "
+            f"bytes={self.bytes}, seconds={self.seconds:.2f}, faults={self.faults}, "
+            f"page_size={self.page_size}, smallest_page_size={self.smallest_page_size}, "
+            f"largest_page_size={self.largest_page_size})"
+        )
+
+
+class AdaptivePageSize(object):
+    """Page size policy that aims for responses of about `target_bytes` that take at most
+    `target_seconds`, within [min_page_size, max_page_size].
+    """
+
+    def __init__(
+        self,
+        min_page_size: int = 50,
+        max_page_size: int = 5000,
+        target_bytes: int = 2 * 1024 * 1024,
+        target_seconds: float = 5.0,
+    ) -> None:
+        """
+        :param min_page_size: Smallest page ever requested, defaults to 50
+        :param max_page_size: Largest page ever requested, defaults to 5000
+        :param target_bytes: Response size to aim for, defaults to 2 MB
+        :param target_seconds: Longest a page should take, defaults to 5 seconds
+        """
+        if not 1 <= min_page_size <= max_page_size:
+            raise ValueError("need 1 <= min_page_size <= max_page_size")
+        self.min_page_size = min_page_size
+        self.max_page_size = max_page_size
+        self.target_bytes = target_bytes
+        self.target_seconds = target_seconds
+
+    def clamp(self, page_size: int, ceiling: Optional[int] = None) -> int:
+        largest = self.max_page_size if ceiling is None else min(ceiling, self.max_page_size)
+        return max(self.min_page_size, min(largest, page_size))
+
+    def after_page(
+        self,
+        requested: int,
+        received: int,
+        size: Optional[int],
+        seconds: float,
+        ceiling: Optional[int] = None,
+    ) -> Tuple[int, str]:
+        """Picks the next page size from how the last page turned out
+
+        :param requested: Records asked for
+        :param received: Records that came back
+        :param size: Response size in bytes, if known
+        :param seconds: How long the request took
+        :param ceiling: Largest size UCM has accepted in this listing, if it refused a bigger one
+        :return: The next page size, and why
+        """
+        if not received:
+            return self.clamp(requested, ceiling), "empty"
+        limits = []
+        if size:
+            limits.append((self.target_bytes * received / size, "bytes"))
+        if seconds > 0:
+            limits.append((self.target_seconds * received / seconds, "latency"))
+        if not limits:
+            return self.clamp(requested, ceiling), "no data"
+        ideal, reason = min(limits)
+        if received < requested:
+            # a short page says nothing about how a bigger one would do
+            ideal = min(ideal, requested)
+        # at most double or halve per page, so one odd response doesn't swing it
+        page_size = max(requested // 2, min(requested * 2, int(ideal)))
+        return self.clamp(page_size, ceiling), reason
+
+    def after_fault(self, requested: int, fault: Fault) -> Optional[Tuple[int, str]]:
+        """Picks a smaller page size after UCM refused a request
+
+        :param requested: Records asked for
+        :param fault: The Fault UCM answered with
+        :return: The page size to retry with and why, or None if the fault isn't about size
+            or load, or the page is already as small as allowed
+        """
+        message = str(getattr(fault, "message", fault) or "")
+        suggested = suggested_rows(fault)
+        if suggested is not None:
+            # UCM says how many rows it would have accepted
+            smaller = min(requested - 1, suggested)
+            reason = "fault: too large"
+        elif any(text in message.lower() for text in THROTTLE_MESSAGES):
+            smaller = requested // 2
+            reason = "fault: throttled"
+        else:
+            return None
+        smaller = self.clamp(smaller)
+        if smaller >= requested:
+            return None
+        return smaller, reason
+
+
+class Paginator(object):
+    """Iterates over the results of a list* operation, fetching them one page at a time"""
+
+    def __init__(
+        self,
+        operation: Callable,
+        item_name: str,
+        search_criteria: Dict[str, Any],
+        returned_tags: Dict[str, Any],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        workers: int = 1,
+        total: Optional[int] = None,
+        prefetch: int = 0,
+        adaptive: Optional[AdaptivePageSize] = None,
+        response_size: Optional[Callable[[], Optional[int]]] = None,
+        stats: Optional[PagingStats] = None,
+    ) -> None:
+        """
+        :param operation: Zeep operation to call, e.g. axl.client.listPhone
+        :param item_name: Name of the records in the response, e.g. 'phone'
+        :param search_criteria: searchCriteria of the request, e.g. {'name': '%'}
+        :param returned_tags: returnedTags of the request
+        :param page_size: Records requested per page (the first page, when adaptive), defaults to 1000
+        :param workers: Pages requested at the same time, defaults to 1
+        :param total: Number of matching records if known, so no request goes past the end
+        :param prefetch: Pages to fetch ahead of the caller on a background thread, defaults to 0
+        :param adaptive: Policy that adjusts the page size as the listing goes, defaults to None
+        :param response_size: Returns the size of the calling thread's last response in bytes,
+            e.g. AXLTransport.last_response_size, defaults to None
+        :param stats: Where to record requests and page size decisions, defaults to a new PagingStats
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if prefetch < 0:
+            raise ValueError("prefetch can't be negative")
+        self.operation = operation
+        self.item_name = item_name
+        self.search_criteria = search_criteria
+        self.returned_tags = returned_tags
+        self.page_size = adaptive.clamp(page_size) if adaptive else page_size
+        self.workers = workers
+        self.total = total
+        self.prefetch = prefetch
+        self.adaptive = adaptive
+        self.response_size = response_size
+        self.stats = PagingStats() if stats is None else stats
+        self._ceiling: Optional[int] = None
+
+    def fetch(self, skip: int, first: int) -> List[Any]:
+        """Requests one page
+
+        :param skip: Number of records to skip
+        :param first: Number of records to return
+        :return: The records, an empty list past the end
+        """
+        result = self.operation(
+            searchCriteria=self.search_criteria,
+            returnedTags=self.returned_tags,
+            skip=skip,
+            first=first,
+        )["return"]
+        if result is None or self.item_name not in result:
+            return []
+        return result[self.item_name] or []
+
+    def _fetch_window(self, skip: int, first: int) -> List[Any]:
+        """Requests the records [skip, skip + first), recording stats. When adaptive, the
+        window is re-requested in smaller pieces if UCM refuses it as too large.
+        """
+        records: List[Any] = []
+        requested = first
+        while len(records) < first:
+            start = time.perf_counter()
+            offset = skip + len(records)
+            try:
+                page = self.fetch(offset, requested)
+            except Fault as fault:
+                retry = self.adaptive.after_fault(requested, fault) if self.adaptive else None
+                if retry is None:
+                    raise
+                self.page_size, reason = retry
+                self._ceiling = min(self._ceiling or self.page_size, self.page_size)
+                self.stats.record(offset, requested, 0, None, 0.0, self.page_size, reason)
+                requested = min(self.page_size, first - len(records))
+                continue
+            seconds = time.perf_counter() - start
+            size = self.response_size() if self.response_size else None
+            received = len(page)
+            reason = "fixed"
+            if self.adaptive:
+                self.page_size, reason = self.adaptive.after_page(
+                    requested, received, size, seconds, self._ceiling
+                )
+            self.stats.record(offset, requested, received, size, seconds, self.page_size, reason)
+            if not records:
+                records = page
+            else:
+                records.extend(page)
+            del page
+            if received < requested:
+                break
+            requested = min(requested, first - len(records))
+        return records
+
+    def pages(self) -> Iterator[List[Any]]:
+        """Yields the results page by page. Only the page being consumed is held on to;
+        the previous one is dropped before the next is requested.
+
+        :return: Lists of records
+        """
+        if self.prefetch:
+            yield from self._prefetched_pages()
+        elif self.workers > 1:
+            yield from self._concurrent_pages()
+        else:
+            yield from self._sequential_pages()
+
+    def _sequential_pages(self) -> Iterator[List[Any]]:
+        skip = 0
+        while True:
+            first = self.page_size
+            page = self._fetch_window(skip, first)
+            size = len(page)
+            if not size:
+                return
+            yield page
+            del page
+            if size < first:
+                # a short page is the last one, no need to ask for an empty one
+                return
+            skip += first
+
+    def _concurrent_pages(self) -> Iterator[List[Any]]:
+        pool = ThreadPoolExecutor(self.workers, thread_name_prefix="ciscoaxl-page")
+        window: Deque = deque()
+        next_skip = 0
+
+        def fill() -> None:
+            nonlocal next_skip
+            while len(window) < self.workers and (
+                self.total is None or next_skip < self.total
+            ):
+                first = self.page_size
+                window.append((pool.submit(self._fetch_window, next_skip, first), first))
+                next_skip += first
+
+        try:
+            fill()
+            while window:
+                future, first = window.popleft()
+                page = future.result()
+                size = len(page)
+                if size < first:
+                    # the end, anything still in the window is past it
+                    if size:
+                        yield page
+                    return
+                fill()
+                yield page
+                del page
+        finally:
+            for future, _ in window:
+                future.cancel()
+            # requests already on the wire finish in the background
+            pool.shutdown(wait=False)
+
+    def _prefetched_pages(self) -> Iterator[List[Any]]:
+        source = self._concurrent_pages() if self.workers > 1 else self._sequential_pages()
+        buffer: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            # give up waiting for room once the caller has gone away
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce() -> None:
+            try:
+                for page in source:
+                    if not put(page):
+                        return
+                    del page
+                put(done)
+            except BaseException as e:
+                put(e)
+            finally:
+                source.close()
+
+        thread = threading.Thread(target=produce, name="ciscoaxl-prefetch", daemon=True)
+        thread.start()
+        try:
+            while True:
+                page = buffer.get()
+                if page is done:
+                    return
+                elif isinstance(page, BaseException):
+                    raise page
+                yield page
+                del page
+        finally:
+            stop.set()
+
+    def __iter__(self) -> Iterator[Any]:
+        for page in self.pages():
+            # hand records over one by one, so each can be freed as soon as the caller is done
+            page.reverse()
+            while page:
+                yield page.pop()
+
+
+class PrefixPartitioner(object):
+    """Lists a prefix search one partition at a time, so no request skips more than
+    `partition_size` records.
+
+    A partition holding more than `partition_size` records is replaced by the exact prefix
+    and one partition per character of `alphabet` appended to it, recursively. Partitions are
+    listed in order, up to `workers` at a time, and their records yielded in that order.
+    If anything was split, the listing is checked for records the partitions left out, whose
+    key continues with a character outside `alphabet`; they raise ValueError rather than being
+    silently skipped. With `count`, each split prefix is checked against its count once its
+    partitions have been listed. Without, one request at the end skips everything listed, the
+    only request deeper than `partition_size`.
+    """
+
+    def __init__(
+        self,
+        operation: Callable,
+        item_name: str,
+        search_criteria: Dict[str, Any],
+        returned_tags: Dict[str, Any],
+        key: Optional[str] = None,
+        alphabet: str = HEX_ALPHABET,
+        partition_size: int = 10000,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        workers: int = 1,
+        stats: Optional[PagingStats] = None,
+        count: Optional[Callable[[str], int]] = None,
+        response_size: Optional[Callable[[], Optional[int]]] = None,
+    ) -> None:
+        """
+        :param operation: Zeep operation to call, e.g. axl.client.listPhone
+        :param item_name: Name of the records in the response, e.g. 'phone'
+        :param search_criteria: searchCriteria of the request, e.g. {'name': 'SEP%'}
+        :param returned_tags: returnedTags of the request
+        :param key: searchCriteria field holding the prefix, defaults to the first one
+        :param alphabet: Characters that can follow the prefix, defaults to hex digits
+        :param partition_size: Most records a partition may hold before it is split,
+            i.e. the deepest skip ever requested, defaults to 10000
+        :param page_size: Records requested per page within a partition, defaults to 1000
+        :param workers: Partitions listed at the same time, defaults to 1
+        :param stats: Where to record requests, defaults to a new PagingStats
+        :param count: Returns how many records start with a prefix, e.g. from a SQL count(*),
+            to check split prefixes without a deep skip, defaults to None
+        :param response_size: Returns the size in bytes of the last response, for the stats
+        """
+        key = key or next(iter(search_criteria))
+        pattern = search_criteria[key]
+        if not pattern.endswith("%") or "%" in pattern[:-1] or "_" in pattern:
+            raise ValueError(f"{key} must be a prefix search like 'SEP%', got {pattern!r}")
+        if partition_size < 1 or workers < 1:
+            raise ValueError("partition_size and workers must be at least 1")
+        self.operation = operation
+        self.item_name = item_name
+        self.search_criteria = search_criteria
+        self.returned_tags = returned_tags
+        self.key = key
+        self.prefix = pattern[:-1]
+        self.alphabet = alphabet
+        self.partition_size = partition_size
+        self.page_size = page_size
+        self.workers = workers
+        self.stats = PagingStats() if stats is None else stats
+        self.count = count
+        self.response_size = response_size
+        self.partitions = 0
+        self.splits = 0
+
+    def _paginator(self, pattern: str, page_size: int) -> Paginator:
+        return Paginator(
+            self.operation,
+            self.item_name,
+            {**self.search_criteria, self.key: pattern},
+            self.returned_tags,
+            page_size,
+            stats=self.stats,
+            response_size=self.response_size,
+        )
+
+    def _probe(self, prefix: str, skip: int) -> List[Any]:
+        """Requests the single record of a prefix search after `skip` of them"""
+        start = time.perf_counter()
+        beyond = self._paginator(prefix + "%", 1).fetch(skip, 1)
+        size = self.response_size() if self.response_size else None
+        self.stats.record(
+            skip, 1, len(beyond), size, time.perf_counter() - start, self.page_size, "probe"
+        )
+        return beyond
+
+    def _list(self, pattern: str) -> List[Any]:
+        records: List[Any] = []
+        for page in self._paginator(pattern, self.page_size).pages():
+            records.extend(page)
+        return records
+
+    def _partition(self, prefix: str) -> Optional[List[Any]]:
+        """Lists a partition, or returns None when it is too big and has to be split"""
+        # one record past the limit tells whether there is more than the limit
+        if self._probe(prefix, self.partition_size):
+            return None
+        return self._list(prefix + "%")
+
+    def _check_complete(self, prefix: str, listed: int) -> None:
+        """Raises ValueError if the prefix search holds more than the `listed` records its
+        partitions returned
+        """
+        example = ""
+        if self.count is not None:
+            missing = self.count(prefix) > listed
+        else:
+            beyond = self._probe(prefix, listed)
+            missing = bool(beyond)
+            try:
+                example = f", e.g. {beyond[0][self.key]!r}"
+            except (KeyError, IndexError, TypeError, AttributeError):
+                pass
+        if missing:
+            raise ValueError(
+                f"{prefix + '%'!r} has records the partitions left out, whose {self.key} "
+                f"continues with a character outside alphabet {self.alphabet!r}{example}"
+            )
+
+    def pages(self) -> Iterator[List[Any]]:
+        """Yields the records of each partition, in partition order
+
+        :return: Lists of records
+        """
+        pool = ThreadPoolExecutor(self.workers, thread_name_prefix="ciscoaxl-partition")
+        # [kind, prefix, future or records listed before the split], in listing order. Only
+        # the first `workers` listings are submitted, so at most that many partitions are
+        # held ahead of the caller.
+        todo: Deque[List[Any]] = deque([["partition", self.prefix, None]])
+        listed = 0
+
+        def fill() -> None:
+            in_flight = sum(1 for kind, _, future in todo if kind != "check" and future)
+            for position, entry in enumerate(todo):
+                # the next partition to yield is always submitted
+                if in_flight >= self.workers and position:
+                    return
+                kind, prefix, future = entry
+                if kind != "check" and future is None:
+                    task = self._partition if kind == "partition" else self._list
+                    entry[2] = pool.submit(task, prefix)
+                    in_flight += 1
+
+        try:
+            while todo:
+                fill()
+                kind, prefix, value = todo.popleft()
+                if kind == "check":
+                    # every partition under the prefix has been listed since its split
+                    self._check_complete(prefix, listed - value)
+                    continue
+                records = value.result()
+                if records is None:
+                    self.splits += 1
+                    children = [["partition", prefix + c, None] for c in self.alphabet]
+                    if prefix:
+                        # the prefix itself, e.g. a line 1000 next to 1000%
+                        children.insert(0, ["exact", prefix, None])
+                    if self.count is not None:
+                        children.append(["check", prefix, listed])
+                    todo.extendleft(reversed(children))
+                    continue
+                self.partitions += 1
+                listed += len(records)
+                fill()
+                if records:
+                    yield records
+                del records
+            if self.splits and self.count is None:
+                # a record left out anywhere below the prefix is one more than was listed
+                self._check_complete(self.prefix, listed)
+        finally:
+            for kind, _, future in todo:
+                if kind != "check" and future:
+                    future.cancel()
+            pool.shutdown(wait=False)
+
+    def __iter__(self) -> Iterator[Any]:
+        for page in self.pages():
+            page.reverse()
+            while page:
+                yield page.pop()
@@ -0,0 +1,172 @@
+"""Fast path for list* responses that skips zeep's object construction.
+
+zeep turns every record of a list* response into nested ``CompoundValue`` objects, which is
+most of the CPU time of a large listing. ``RawListOperation`` asks zeep for the raw response
+instead and pulls the records out with a single lxml ``iterparse`` pass, clearing each one once
+it has been read. It can stand in for the zeep operation anywhere a ``Paginator`` takes one.
+
+With an ``AXLTransport``, the response isn't even read into memory first: it is parsed as it
+comes off the socket, and ``RawListOperation.records()`` yields each record as soon as its
+closing tag arrives. Memory then stays flat however large the response is.
+
+Records come back as plain dicts, or as tuples in ``returnedTags`` order:
+
+- an element with text becomes its text, an empty one None
+- references such as ``<locationName uuid="...">Hub_None</locationName>`` become their text,
+  where zeep gives ``{'_value_1': 'Hub_None', 'uuid': '...'}``
+- the record's own ``uuid`` attribute is kept under 'uuid'
+- an element with children becomes a dict, and repeated children a list
+"""
+
+import contextlib
+import io
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from lxml import etree
+
+from ciscoaxl.transport import AXLTransport
+
+Record = Union[Dict[str, Any], Tuple[Any, ...]]
+
+
+def _value(element: etree._Element) -> Any:
+    if len(element) == 0:
+        return element.text or None
+    value: Dict[str, Any] = {}
+    for child in element:
+        item = _value(child)
+        if child.tag in value:
+            if not isinstance(value[child.tag], list):
+                value[child.tag] = [value[child.tag]]
+            value[child.tag].append(item)
+        else:
+            value[child.tag] = item
+    return value
+
+
+def iter_records(
+    source: BinaryIO, item_name: str, fields: Optional[Sequence[str]] = None
+) -> Iterator[Record]:
+    """Yields the records of a response as they are parsed, freeing each one once yielded
+
+    :param source: File-like object the SOAP response is read from, e.g. a socket stream
+    :param item_name: Name of the records, e.g. 'phone', or 'row' for executeSQLQuery
+    :param fields: Yield tuples of these fields, in this order, instead of dicts.
+        A field a record doesn't have is None
+    :return: The records, in document order
+    """
+    index = {name: i for i, name in enumerate(fields)} if fields is not None else None
+    # records are unqualified, so the bare tag name matches them
+    for _, element in etree.iterparse(
+        source, events=("end",), tag=item_name, remove_blank_text=True
+    ):
+        if index is None:
+            record = _value(element) if len(element) else {}
+            uuid = element.get("uuid")
+            if uuid is not None:
+                record["uuid"] = uuid
+        else:
+            values: List[Any] = [None] * len(index)
+            for child in element:
+                position = index.get(child.tag)
+                if position is not None:
+                    values[position] = _value(child)
+            if "uuid" in index:
+                values[index["uuid"]] = element.get("uuid")
+            record = tuple(values)
+        # drop what has been read, so the tree never holds more than one record
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+        yield record
+
+
+def parse_records(
+    content: bytes, item_name: str, fields: Optional[Sequence[str]] = None
+) -> List[Record]:
+    """Pulls the records out of a list* response body
+
+    :param content: The SOAP response, e.g. b'<soapenv:Envelope>...<return><phone>...'
+    :param item_name: Name of the records, e.g. 'phone'
+    :param fields: Return tuples of these fields, in this order, instead of dicts
+    :return: The records, in document order
+    """
+    return list(iter_records(io.BytesIO(content), item_name, fields))
+
+
+class _CountingReader(object):
+    """File-like view of a streamed response body that counts the bytes read"""
+
+    def __init__(self, raw) -> None:
+        self.raw = raw
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(None if size < 0 else size, decode_content=True)
+        self.size += len(data)
+        return data
+
+
+class RawListOperation(object):
+    """Calls a list* operation and parses the records from the raw response.
+
+    Called with the same arguments as the zeep operation, it returns the same shape,
+    ``{'return': {item_name: [records]}}``, with plain records. ``records()`` yields them
+    one by one instead. Faults and HTTP errors are raised by zeep as usual.
+    """
+
+    def __init__(self, client, service, operation: str, item_name: str, tuples: bool = False) -> None:
+        """
+        :param client: The zeep Client
+        :param service: The zeep service proxy bound to the AXL endpoint
+        :param operation: AXL operation name, e.g. 'listPhone'
+        :param item_name: Name of the records in the response, e.g. 'phone'
+        :param tuples: Return records as tuples in returnedTags order, defaults to dicts
+        """
+        self.client = client
+        self.service = service
+        self.operation = operation
+        self.item_name = item_name
+        self.tuples = tuples
+
+    @contextlib.contextmanager
+    def response_body(self, **kwargs) -> Iterator[BinaryIO]:
+        """Calls the operation and hands over its response body to read, straight off the
+        socket with an AXLTransport
+
+        :param kwargs: Arguments of the operation, e.g. searchCriteria and returnedTags
+        :return: A file-like object holding the SOAP response
+        """
+        transport = self.client.transport
+        streaming = isinstance(transport, AXLTransport)
+        with self.client.settings(raw_response=True):
+            if streaming:
+                with transport.streaming():
+                    response = getattr(self.service, self.operation)(**kwargs)
+            else:
+                response = getattr(self.service, self.operation)(**kwargs)
+        with response:
+            if response.status_code != 200:
+                binding = self.service._binding
+                # raises the Fault or TransportError zeep would have
+                binding.process_reply(self.client, binding.get(self.operation), response)
+            if not streaming:
+                yield io.BytesIO(response.content)
+                return
+            reader = _CountingReader(response.raw)
+            yield reader
+            transport.record_response_size(reader.size)
+
+    def records(self, **kwargs) -> Iterator[Record]:
+        """Calls the operation and yields the records as they arrive
+
+        :param kwargs: Arguments of the operation, e.g. searchCriteria and returnedTags
+        :return: The records
+        """
+        fields = list(kwargs.get("returnedTags") or ()) if self.tuples else None
+        with self.response_body(**kwargs) as body:
+            yield from iter_records(body, self.item_name, fields)
+
+    def __call__(self, **kwargs) -> Dict[str, Any]:
+        records = list(self.records(**kwargs))
+        return {"return": {self.item_name: records} if records else None}
@@ -0,0 +1,380 @@
+"""Loading of the bundled AXL WSDL/XSD schemas, with an on-disk cache of the parsed documents.
+
+Parsing ``AXLAPI.wsdl`` and ``AXLSoap.xsd`` is by far the most expensive part of creating
+an ``axl`` object. The first time a schema version is loaded, the resolved Zeep document is
+pickled into the user's cache directory (``$XDG_CACHE_HOME/ciscoaxl`` on Linux); later loads
+read that artifact back instead of parsing the XML. ``build_cache`` writes an artifact next to
+the schema files instead, e.g. while building an image, which every user then reads. Artifacts
+are keyed by a hash of the schema files, the Zeep version and the Python version, and anything
+that does not match is ignored and rebuilt.
+
+Unpickling runs whatever code the artifact asks for, so an artifact is only read when it is
+owned by the current user or root and nobody else can write to it. Directories created for
+artifacts are private to the current user. On Windows, where there is no owner to check, the
+cache directory must not be writable by anyone who shouldn't run code in the process.
+"""
+
+import gc
+import hashlib
+import io
+import os
+# only artifacts passing _trusted() are unpickled
+import pickle  # nosec B403
+import stat
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+import zeep
+from lxml import etree
+from zeep import Settings
+from zeep.cache import Base
+from zeep.transports import Transport
+from zeep.wsdl import Document
+
+SCHEMA_ROOT = Path(__file__).resolve().parent / "schema"
+CACHE_FILE_NAME = "AXLAPI.zeep.cache"
+_MAGIC = b"ciscoaxl-schema-cache\n"
+_DYNAMIC_MODULES = ("zeep.xsd.dynamic_types", "zeep.objects")
+_VIEW_TYPES = (type({}.values()), type(OrderedDict().values()))
+
+# process-wide registry of parsed documents shared between axl instances
+_shared_documents: Dict[tuple, Document] = {}
+_shared_locks: Dict[tuple, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def default_settings() -> Settings:
+    """Returns the Zeep settings used for every AXL client
+
+    :return: A new Zeep Settings object
+    """
+    return Settings(strict=False, xml_huge_tree=True, xsd_ignore_sequence_order=True)
+
+
+def schema_dir(cucm_version: str) -> Path:
+    """Returns the directory holding the bundled schema files for a CUCM version
+
+    :param cucm_version: UCM version, e.g. '12.5'
+    :return: Path to the schema directory
+    """
+    return SCHEMA_ROOT / str(cucm_version)
+
+
+def wsdl_location(cucm_version: str) -> str:
+    """Returns the location of AXLAPI.wsdl in the form Zeep expects for this OS
+
+    :param cucm_version: UCM version, e.g. '12.5'
+    :return: A file URI (posix) or absolute path (Windows) to the WSDL
+    """
+    return _wsdl_uri(schema_dir(cucm_version) / "AXLAPI.wsdl")
+
+
+def _wsdl_uri(wsdl: Path) -> str:
+    if os.name == "posix":
+        return wsdl.as_uri()
+    else:
+        return str(wsdl.absolute())
+
+
+def fingerprint(directory: Union[str, Path]) -> str:
+    """Hashes every WSDL/XSD file in a schema directory along with the Zeep and Python versions.
+    Any change to one of these invalidates a cached document.
+
+    :param directory: Schema directory to fingerprint
+    :return: A hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(f"zeep={zeep.__version__};python={sys.version_info[:2]}".encode())
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix in (".wsdl", ".xsd"):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _rebuild_class(name: str, bases: tuple, attributes: dict) -> type:
+    return type(name, bases, attributes)
+
+
+class _DocumentPickler(pickle.Pickler):
+    """Pickler that can handle the classes Zeep generates on the fly while parsing a schema.
+    The settings and transport a document was built with are not stored; whichever ones are
+    in use when the artifact is loaded get swapped in instead.
+    """
+
+    def __init__(self, file, settings: Settings, transport: Transport) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._settings = settings
+        self._transport = transport
+
+    def persistent_id(self, obj):
+        if obj is self._settings:
+            return "settings"
+        elif obj is self._transport:
+            return "transport"
+        return None
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type) and obj.__module__ in _DYNAMIC_MODULES:
+            attributes = {
+                k: v
+                for k, v in vars(obj).items()
+                if k not in ("__dict__", "__weakref__", "__doc__")
+            }
+            return _rebuild_class, (obj.__name__, obj.__bases__, attributes)
+        elif isinstance(obj, etree.QName):
+            return etree.QName, (obj.text,)
+        elif isinstance(obj, _VIEW_TYPES):
+            return list, (list(obj),)
+        return NotImplemented
+
+
+# fed only artifacts passing _trusted()
+class _DocumentUnpickler(pickle.Unpickler):  # nosec B301
+    def __init__(self, file, settings: Settings, transport: Transport) -> None:
+        super().__init__(file)
+        self._persistent = {"settings": settings, "transport": transport}
+
+    def persistent_load(self, pid):
+        return self._persistent[pid]
+
+
+def user_cache_dir() -> Path:
+    """Returns the current user's cache directory for ciscoaxl: $XDG_CACHE_HOME/ciscoaxl
+    (~/.cache/ciscoaxl) on Linux, ~/Library/Caches/ciscoaxl on macOS and
+    %LOCALAPPDATA%\\ciscoaxl\\Cache on Windows
+
+    :return: Path to the directory, which may not exist yet
+    """
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(base) / "ciscoaxl" / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "ciscoaxl"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ciscoaxl"
+
+
+def cache_path(cucm_version: str, cache_dir: Union[str, Path, None] = None) -> Path:
+    """Returns where the cached document for a CUCM version is written
+
+    :param cucm_version: UCM version, e.g. '12.5'
+    :param cache_dir: Directory to keep artifacts in, defaults to user_cache_dir()
+    :return: Path to the artifact
+    """
+    base = user_cache_dir() if cache_dir is None else Path(cache_dir)
+    return base / str(cucm_version) / CACHE_FILE_NAME
+
+
+def bundled_cache_path(cucm_version: str) -> Path:
+    """Returns where build_cache() puts the cached document by default, next to the schema
+
+    :param cucm_version: UCM version, e.g. '12.5'
+    :return: Path to the artifact
+    """
+    return schema_dir(cucm_version) / CACHE_FILE_NAME
+
+
+def make_private_dirs(directory: Path) -> None:
+    """Creates a directory, and any missing parents, accessible to the current user only
+
+    :param directory: Directory to create
+    """
+    missing = []
+    while not directory.exists():
+        missing.append(directory)
+        directory = directory.parent
+    for parent in reversed(missing):
+        parent.mkdir(mode=0o700, exist_ok=True)
+
+
+def _trusted(f) -> bool:
+    """Whether an open artifact can be unpickled: owned by the current user or root, and not
+    writable by group or others, so nobody else could have put code in it
+    """
+    if not hasattr(os, "geteuid"):
+        # Windows, the directory's ACLs have to keep others out
+        return True
+    status = os.fstat(f.fileno())
+    return status.st_uid in (os.geteuid(), 0) and not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _read_cache(
+    path: Path, key: str, settings: Settings, transport: Transport
+) -> Union[Document, None]:
+    try:
+        with open(path, "rb") as f:
+            if not _trusted(f):
+                return None
+            if f.readline() != _MAGIC or f.readline().strip() != key.encode():
+                return None
+            gc_enabled = gc.isenabled()
+            # the document is one huge graph of small objects, tracing it
+            # while it is being built costs more than the unpickling itself
+            gc.disable()
+            try:
+                # _trusted() was checked above
+                return _DocumentUnpickler(f, settings, transport).load()  # nosec B301
+            finally:
+                if gc_enabled:
+                    gc.enable()
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # unreadable or corrupt artifact, treat it as stale
+        return None
+
+
+def _write_cache(
+    path: Path, key: str, document: Document, settings: Settings, transport: Transport
+) -> None:
+    buffer = io.BytesIO()
+    try:
+        _DocumentPickler(buffer, settings, transport).dump(document)
+    except Exception:
+        # pickling relies on Pickler.reducer_override (Python 3.8+), and a
+        # future Zeep may grow objects we can't handle; just skip the cache
+        return
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        make_private_dirs(path.parent)
+        # never group or world writable, whatever the umask, or _trusted() would refuse it
+        descriptor = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(_MAGIC)
+            f.write(key.encode() + b"\n")
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+    except OSError:
+        # read-only install, cache just isn't available
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_document(
+    cucm_version: str,
+    settings: Settings,
+    transport: Transport,
+    cache: bool = True,
+    cache_dir: Union[str, Path, None] = None,
+    operations: Union[Iterable[str], None] = None,
+) -> Document:
+    """Loads the parsed WSDL document for a CUCM version, using the on-disk cache when it is fresh.
+
+    :param cucm_version: UCM version, e.g. '12.5'
+    :param settings: Zeep settings the document should use
+    :param transport: Zeep transport the document should use
+    :param cache: Read and write the on-disk cache, defaults to True
+    :param cache_dir: Directory to keep artifacts in, defaults to user_cache_dir(). Without
+        one, an artifact written next to the schema by build_cache() is read too
+    :param operations: Only load these AXL operations (see ciscoaxl.subset), defaults to all of them
+    :return: A Zeep WSDL document, ready to be handed to ``zeep.Client``
+    """
+    prebuilt = None
+    if operations:
+        from ciscoaxl.subset import build_subset
+
+        directory = build_subset(cucm_version, operations, cache_dir)
+        path = directory / CACHE_FILE_NAME
+    else:
+        directory = schema_dir(cucm_version)
+        path = cache_path(cucm_version, cache_dir)
+        if cache_dir is None:
+            prebuilt = bundled_cache_path(cucm_version)
+
+    wsdl = _wsdl_uri(directory / "AXLAPI.wsdl")
+    if not cache:
+        return Document(wsdl, transport, settings=settings)
+
+    key = fingerprint(directory)
+    document = _read_cache(path, key, settings, transport)
+    if document is None and prebuilt is not None:
+        document = _read_cache(prebuilt, key, settings, transport)
+    if document is None:
+        document = Document(wsdl, transport, settings=settings)
+        _write_cache(path, key, document, settings, transport)
+    return document
+
+
+def get_shared_document(
+    cucm_version: str,
+    cache: bool = True,
+    cache_dir: Union[str, Path, None] = None,
+    operations: Union[Iterable[str], None] = None,
+    transport_cache: Union[Base, None] = None,
+) -> Document:
+    """Returns the process-wide parsed document for a CUCM version, loading it on first use.
+
+    A document only holds the schema types and the WSDL bindings, which Zeep never modifies
+    after parsing, so one copy can back any number of clients. Each client still brings its
+    own transport and endpoint through ``zeep.Client(document, transport=...)``.
+
+    :param cucm_version: UCM version, e.g. '12.5'
+    :param cache: Read and write the on-disk cache, defaults to True
+    :param cache_dir: Directory to keep artifacts in, defaults to user_cache_dir()
+    :param operations: Only load these AXL operations (see ciscoaxl.subset), defaults to all of them
+    :param transport_cache: Zeep cache used while loading the schema files, defaults to None
+    :return: A Zeep WSDL document shared by every caller
+    """
+    key = (str(cucm_version), tuple(sorted(set(operations))) if operations else None)
+    document = _shared_documents.get(key)
+    if document is not None:
+        return document
+
+    with _registry_lock:
+        lock = _shared_locks.setdefault(key, threading.Lock())
+    # one lock per schema, so two schemas can still be parsed side by side
+    with lock:
+        document = _shared_documents.get(key)
+        if document is None:
+            document = load_document(
+                cucm_version,
+                default_settings(),
+                Transport(cache=transport_cache),
+                cache=cache,
+                cache_dir=cache_dir,
+                operations=operations,
+            )
+            _shared_documents[key] = document
+    return document
+
+
+def clear_shared_documents() -> None:
+    """Drops every document held by the process-wide registry.
+    Clients that already exist keep working with the document they were given.
+    """
+    with _registry_lock:
+        _shared_documents.clear()
+        _shared_locks.clear()
+
+
+def build_cache(
+    cucm_version: str, cache_dir: Union[str, Path, None] = None
+) -> Path:
+    """Parses a schema version and (re)writes its cached document, e.g. as part of an image build
+
+    :param cucm_version: UCM version, e.g. '12.5'
+    :param cache_dir: Directory to keep artifacts in, defaults to the schema directory itself,
+        where every user of the installation reads it
+    :return: Path to the written artifact
+    """
+    settings = default_settings()
+    transport = Transport()
+    if cache_dir is None:
+        path = bundled_cache_path(cucm_version)
+    else:
+        path = cache_path(cucm_version, cache_dir)
+    key = fingerprint(schema_dir(cucm_version))
+    document = Document(wsdl_location(cucm_version), transport, settings=settings)
+    _write_cache(path, key, document, settings, transport)
+    return path
+
+
+if __name__ == "__main__":
+    for version in sys.argv[1:] or [p.name for p in sorted(SCHEMA_ROOT.iterdir())]:
+        print(build_cache(version))
@@ -0,0 +1,174 @@
+"""Streaming, typed and chunked results for executeSQLQuery.
+
+``iter_sql_rows`` reads the rows of an executeSQLQuery response as they are parsed and yields
+each one as a named tuple. The tuple class is built once per set of columns, so every row
+shares one header (``row._fields``) instead of carrying its own dict keys. Columns can be
+converted as they are read, e.g. ``{"tkmodel": "int", "pkid": "uuid"}``.
+
+UCM refuses results above its size limit. ``SQLChunks`` gets around that by rewriting a
+SELECT with Informix's ``SKIP n FIRST m`` so a ``Paginator`` can run it a chunk at a time,
+with the same workers, read-ahead and adaptive sizing as the list* operations.
+"""
+
+import functools
+import re
+import uuid
+from collections import namedtuple
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from lxml import etree
+
+ColumnType = Union[str, Callable[[str], Any]]
+
+_TRUE = frozenset(("t", "true", "1", "y", "yes"))
+
+
+def to_bool(text: str) -> bool:
+    """Informix booleans come back as 't' and 'f'"""
+    return text.lower() in _TRUE
+
+
+def to_uuid(text: str) -> uuid.UUID:
+    """pkid columns come back as bare UUIDs, references elsewhere in braces"""
+    return uuid.UUID(text.strip("{}"))
+
+
+COLUMN_TYPES: Dict[str, Callable[[str], Any]] = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": to_bool,
+    "uuid": to_uuid,
+}
+
+
+def converters(
+    columns: Tuple[str, ...], types: Optional[Dict[str, ColumnType]]
+) -> List[Tuple[int, Callable[[str], Any]]]:
+    """Resolves column types into (column position, conversion function) pairs
+
+    :param columns: Column names, in result order
+    :param types: Type of each column to convert: 'str', 'int', 'float', 'bool', 'uuid' or
+        any function taking the column text
+    :return: Conversions for the columns that have one
+    """
+    if not types:
+        return []
+    unknown = set(types) - set(columns)
+    if unknown:
+        raise ValueError(f"types given for columns not in the result: {sorted(unknown)}")
+    result = []
+    for position, column in enumerate(columns):
+        if column in types:
+            kind = types[column]
+            result.append((position, COLUMN_TYPES[kind] if isinstance(kind, str) else kind))
+    return result
+
+
+@functools.lru_cache(maxsize=64)
+def row_class(columns: Tuple[str, ...]) -> type:
+    """Named tuple class for rows with these columns, shared by every query returning them"""
+    # column names are usually identifiers, rename=True covers those that aren't
+    return namedtuple("Row", columns, rename=True)
+
+
+def iter_sql_rows(
+    source: BinaryIO, types: Optional[Dict[str, ColumnType]] = None
+) -> Iterator[Tuple[Any, ...]]:
+    """Yields the rows of an executeSQLQuery response as named tuples, as they are parsed
+
+    :param source: File-like object the SOAP response is read from
+    :param types: Type of each column to convert, see converters(). Empty columns are None
+    :return: One named tuple per row, all of the same class
+    """
+    row_type = None
+    header: List[str] = []
+    index: Dict[str, int] = {}
+    conversions: List[Tuple[int, Callable[[str], Any]]] = []
+    for _, row in etree.iterparse(source, events=("end",), tag="row"):
+        if row_type is None:
+            header = [column.tag for column in row]
+            index = {tag: position for position, tag in enumerate(header)}
+            row_type = row_class(tuple(header))
+            conversions = converters(tuple(header), types)
+        values = [column.text for column in row]
+        if len(values) != len(header):
+            # every row has the same columns, empty ones included, but don't count on it
+            values = [None] * len(header)
+            for column in row:
+                position = index.get(column.tag)
+                if position is not None:
+                    values[position] = column.text
+        for position, convert in conversions:
+            if values[position] is not None:
+                values[position] = convert(values[position])
+        # the row is complete, drop it so the tree stays empty
+        row.getparent().remove(row)
+        yield tuple.__new__(row_type, values)
+
+
+_SELECT = re.compile(r"^\s*select\b", re.IGNORECASE)
+_ALREADY_LIMITED = re.compile(r"^\s*select\s+(skip|first|limit)\b", re.IGNORECASE)
+_UNION = re.compile(r"\bunion\b", re.IGNORECASE)
+_ORDER_BY = re.compile(r"\border\s+by\b", re.IGNORECASE)
+# string literals and parenthesised subqueries, innermost first
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+_PARENTHESES = re.compile(r"\([^()]*\)")
+
+
+def has_order_by(query: str) -> bool:
+    """Whether a query has an ORDER BY of its own, not just one inside a subquery
+
+    :param query: SQL query, e.g. 'select name from device order by pkid'
+    :return: True if the outermost SELECT is ordered
+    """
+    query = _LITERAL.sub("''", query)
+    nested = None
+    while nested != query:
+        nested, query = query, _PARENTHESES.sub(" ", query)
+    return bool(_ORDER_BY.search(query))
+
+
+def chunk_query(query: str, skip: int, first: int) -> str:
+    """Rewrites a SELECT to return `first` rows after the first `skip`. The query has to
+    have an ORDER BY, on something unique such as pkid, or Informix may return the rows in a
+    different order from one chunk to the next, and the chunks would skip or repeat rows.
+
+    :param query: A SELECT, e.g. 'select name from device order by name'
+    :param skip: Rows to skip
+    :param first: Rows to return
+    :return: e.g. 'select skip 1000 first 500 name from device order by name'
+    """
+    if not _SELECT.match(query):
+        raise ValueError("only a SELECT can be run in chunks")
+    if _ALREADY_LIMITED.match(query):
+        raise ValueError("the query already has SKIP, FIRST or LIMIT")
+    if _UNION.search(query):
+        # SKIP/FIRST would only apply to the first SELECT of the union
+        raise ValueError("a UNION can't be run in chunks")
+    if not has_order_by(query):
+        raise ValueError("a query needs an ORDER BY, e.g. 'order by pkid', to be run in chunks")
+    return _SELECT.sub(f"select skip {skip} first {first}", query, count=1)
+
+
+class SQLChunks(object):
+    """A SELECT run a chunk at a time, callable like a list* operation so a Paginator can
+    page through it: ``{'return': {'row': [rows]}}`` for the given skip and first.
+
+    For the chunks to add up to the full result, the query needs an ORDER BY on something
+    unique, e.g. 'order by pkid'; otherwise Informix may return rows in a different order
+    from one chunk to the next. A query without an ORDER BY is refused with a ValueError.
+    """
+
+    def __init__(self, execute: Callable[[str], Iterable[Tuple[Any, ...]]], query: str) -> None:
+        """
+        :param execute: Runs a query and returns its rows, e.g. axl.iter_sql_query
+        :param query: The SELECT to run
+        """
+        chunk_query(query, 0, 1)
+        self.execute = execute
+        self.query = query
+
+    def __call__(self, skip: int, first: int, **kwargs) -> Dict[str, Any]:
+        rows = list(self.execute(chunk_query(self.query, skip, first)))
+        return {"return": {"row": rows} if rows else None}
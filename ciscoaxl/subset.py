@@ -0,0 +1,234 @@
+"""Builds pruned copies of the AXL WSDL/XSD that only describe a chosen set of operations.
+
+A client that only calls a handful of operations doesn't need Zeep to load all ~2,000 of them.
+``build_subset`` keeps the requested operations in the WSDL and, in the XSD, only the elements
+and types those operations reach (directly or through other types). The result is written to
+the user's cache directory once per schema version and operation set and reused afterwards.
+
+    python -m ciscoaxl.subset 12.5 listPhone getPhone updatePhone
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from lxml import etree
+
+from ciscoaxl.exceptions import WSDLException
+from ciscoaxl.schema import fingerprint, make_private_dirs, schema_dir, user_cache_dir
+
+WSDL_NS = "http://schemas.xmlsoap.org/wsdl/"
+XSD_NS = "http://www.w3.org/2001/XMLSchema"
+SUBSET_DIR_NAME = "subsets"
+
+# attributes holding QNames of other schema components, and which symbol space they point into
+_TYPE_ATTRIBUTES = ("type", "base", "itemType")
+_ELEMENT_ATTRIBUTES = ("ref", "substitutionGroup")
+
+
+def _wsdl(tag: str) -> str:
+    return f"{{{WSDL_NS}}}{tag}"
+
+
+def _xsd(tag: str) -> str:
+    return f"{{{XSD_NS}}}{tag}"
+
+
+def _resolve(node: etree._Element, qname: str) -> Tuple[Union[str, None], str]:
+    prefix, _, local = qname.rpartition(":")
+    return node.nsmap.get(prefix or None), local
+
+
+def subset_key(source_dir: Union[str, Path], operations: Iterable[str]) -> str:
+    """Identifies a subset by the source schema it was cut from and its operations
+
+    :param source_dir: Directory holding the full AXLAPI.wsdl and AXLSoap.xsd
+    :param operations: Operation names kept in the subset
+    :return: A hex digest
+    """
+    digest = hashlib.sha256(fingerprint(source_dir).encode())
+    digest.update(",".join(sorted(set(operations))).encode())
+    return digest.hexdigest()
+
+
+def _referenced(
+    node: etree._Element, target_ns: str
+) -> Tuple[Set[str], Set[str]]:
+    """Collects the names of every global type and element referenced anywhere below a node"""
+    types: Set[str] = set()
+    elements: Set[str] = set()
+    for child in node.iter(etree.Element):
+        for attribute in _TYPE_ATTRIBUTES + _ELEMENT_ATTRIBUTES:
+            value = child.get(attribute)
+            if value is None:
+                continue
+            ns, local = _resolve(child, value)
+            if ns == target_ns:
+                (types if attribute in _TYPE_ATTRIBUTES else elements).add(local)
+        member_types = child.get("memberTypes")
+        if member_types:
+            for value in member_types.split():
+                ns, local = _resolve(child, value)
+                if ns == target_ns:
+                    types.add(local)
+    return types, elements
+
+
+def prune_xsd(xsd_root: etree._Element, element_names: Iterable[str]) -> Dict[str, int]:
+    """Removes every global component of a schema that isn't reachable from the given elements.
+    The tree is modified in place.
+
+    :param xsd_root: Root <xsd:schema> node
+    :param element_names: Names of the global elements to keep, e.g. the operation messages
+    :return: Number of kept and removed global components
+    """
+    target_ns = xsd_root.get("targetNamespace")
+    global_types: Dict[str, etree._Element] = {}
+    global_elements: Dict[str, etree._Element] = {}
+    for child in xsd_root:
+        if child.tag == _xsd("element"):
+            global_elements[child.get("name")] = child
+        elif child.tag in (_xsd("complexType"), _xsd("simpleType")):
+            global_types[child.get("name")] = child
+
+    keep: Set[int] = set()
+    pending_elements = [n for n in element_names if n in global_elements]
+    pending_types: List[str] = []
+    seen_elements: Set[str] = set()
+    seen_types: Set[str] = set()
+    while pending_elements or pending_types:
+        if pending_elements:
+            name = pending_elements.pop()
+            if name in seen_elements or name not in global_elements:
+                continue
+            seen_elements.add(name)
+            node = global_elements[name]
+        else:
+            name = pending_types.pop()
+            if name in seen_types or name not in global_types:
+                continue
+            seen_types.add(name)
+            node = global_types[name]
+        keep.add(id(node))
+        types, elements = _referenced(node, target_ns)
+        pending_types.extend(types - seen_types)
+        pending_elements.extend(elements - seen_elements)
+
+    removed = 0
+    for child in list(xsd_root):
+        if child.tag == _xsd("annotation") or (
+            child.tag in (_xsd("element"), _xsd("complexType"), _xsd("simpleType"))
+            and id(child) not in keep
+        ):
+            xsd_root.remove(child)
+            removed += 1
+    return {"kept": len(keep), "removed": removed}
+
+
+def prune_wsdl(wsdl_root: etree._Element, operations: Iterable[str]) -> List[str]:
+    """Removes every operation (and its messages) not in `operations` from a WSDL tree, in place.
+
+    :param wsdl_root: Root <definitions> node
+    :param operations: Names of the operations to keep
+    :return: Names of the XSD elements used by the kept messages
+    """
+    wanted = set(operations)
+    port_type = wsdl_root.find(_wsdl("portType"))
+    available = {op.get("name") for op in port_type.findall(_wsdl("operation"))}
+    missing = sorted(wanted - available)
+    if missing:
+        raise WSDLException(f"Unknown AXL operation(s): {', '.join(missing)}")
+
+    kept_messages = set()
+    for op in port_type.findall(_wsdl("operation")):
+        if op.get("name") not in wanted:
+            port_type.remove(op)
+            continue
+        for io in op:
+            message = io.get("message")
+            if message is not None:
+                kept_messages.add(_resolve(io, message)[1])
+
+    for binding in wsdl_root.findall(_wsdl("binding")):
+        for op in binding.findall(_wsdl("operation")):
+            if op.get("name") not in wanted:
+                binding.remove(op)
+
+    xsd_elements = []
+    for message in wsdl_root.findall(_wsdl("message")):
+        if message.get("name") not in kept_messages:
+            wsdl_root.remove(message)
+            continue
+        for part in message.findall(_wsdl("part")):
+            element = part.get("element")
+            if element is not None:
+                xsd_elements.append(_resolve(part, element)[1])
+    return xsd_elements
+
+
+def subset_dir(
+    cucm_version: str, operations: Iterable[str], cache_dir: Union[str, Path, None] = None
+) -> Path:
+    """Returns where the subset for a version and operation set is (or will be) written
+
+    :param cucm_version: UCM version, e.g. '12.5'
+    :param operations: Operation names kept in the subset
+    :param cache_dir: Directory to keep subsets in, defaults to ciscoaxl.schema.user_cache_dir()
+    :return: Path to the subset directory
+    """
+    base = (user_cache_dir() if cache_dir is None else Path(cache_dir)) / str(cucm_version)
+    key = subset_key(schema_dir(cucm_version), operations)
+    return base / SUBSET_DIR_NAME / key[:16]
+
+
+def build_subset(
+    cucm_version: str,
+    operations: Iterable[str],
+    cache_dir: Union[str, Path, None] = None,
+) -> Path:
+    """Writes a pruned AXLAPI.wsdl/AXLSoap.xsd pair holding only `operations`, unless it already exists
+
+    :param cucm_version: UCM version, e.g. '12.5'
+    :param operations: Operation names to keep, e.g. ['listPhone', 'getPhone']
+    :param cache_dir: Directory to keep subsets in, defaults to ciscoaxl.schema.user_cache_dir()
+    :return: Directory holding the pruned pair
+    """
+    operations = sorted(set(operations))
+    target = subset_dir(cucm_version, operations, cache_dir)
+    if (target / "AXLAPI.wsdl").exists():
+        return target
+
+    source = schema_dir(cucm_version)
+    parser = etree.XMLParser(huge_tree=True, remove_blank_text=True)
+    wsdl_tree = etree.parse(str(source / "AXLAPI.wsdl"), parser)  # nosec
+    xsd_tree = etree.parse(str(source / "AXLSoap.xsd"), parser)  # nosec
+    prune_xsd(xsd_tree.getroot(), prune_wsdl(wsdl_tree.getroot(), operations))
+
+    try:
+        make_private_dirs(target.parent)
+        staging = Path(tempfile.mkdtemp(dir=target.parent))
+    except OSError:
+        # unwritable cache directory, build a throwaway copy instead
+        staging = target = Path(tempfile.mkdtemp(prefix="ciscoaxl-subset-"))
+    wsdl_tree.write(str(staging / "AXLAPI.wsdl"), xml_declaration=True, encoding="UTF-8")
+    xsd_tree.write(str(staging / "AXLSoap.xsd"), xml_declaration=True, encoding="UTF-8")
+    if staging != target:
+        try:
+            os.replace(staging, target)
+        except OSError:
+            # another process finished the same subset first
+            shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cucm_version")
+    parser.add_argument("operations", nargs="+")
+    parser.add_argument("--cache-dir", default=None)
+    args = parser.parse_args()
+    print(build_subset(args.cucm_version, args.operations, args.cache_dir))
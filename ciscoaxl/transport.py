@@ -0,0 +1,812 @@
+"""HTTP plumbing used by the axl client: sessions, connection pooling, transports and caching."""
+
+import contextlib
+import itertools
+import random
+import socket
+import ssl
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import requests.certs
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase, _basic_auth_str
+from requests.cookies import extract_cookies_to_jar
+from requests.utils import rewind_body
+from urllib3.connection import HTTPConnection
+from zeep.cache import Base, InMemoryCache, SqliteCache
+from zeep.transports import Transport
+
+
+# lowercase fragments of the faults UCM answers with when it throttles AXL
+THROTTLE_MESSAGES = ("maximum axl memory allocation consumed", "throttl", "too busy")
+THROTTLE_STATUS_CODES = (429, 503)
+# operation classes RateLimiter budgets by default, by operation name prefix
+OPERATION_CLASSES = (
+    ("executeSQL", "sql"),
+    ("get", "read"),
+    ("list", "read"),
+)
+# answers meaning a node can't serve AXL right now, rather than a fault or throttling
+NODE_DOWN_STATUS_CODES = (404, 502, 504)
+
+
+def make_cache(cache: Union[str, Base, None]) -> Union[Base, None]:
+    """Resolves the `transport_cache` option of axl() into a Zeep cache backend
+
+    :param cache: None (no cache), 'memory', 'sqlite' (Zeep's default SQLite file), a path to a
+        SQLite file, or any zeep.cache.Base instance
+    :return: A Zeep cache backend, or None
+    """
+    if cache is None or isinstance(cache, Base):
+        return cache
+    elif cache == "memory":
+        return InMemoryCache()
+    elif cache == "sqlite":
+        return SqliteCache()
+    elif isinstance(cache, str):
+        return SqliteCache(path=cache)
+    raise ValueError(f"Unsupported transport cache: {cache!r}")
+
+
+class _SessionRememberingSocket(ssl.SSLSocket):
+    """SSLSocket that hands its TLS session back to its context before it closes"""
+
+    def close(self) -> None:
+        self.context._remember(self)
+        super().close()
+
+
+class _SessionReusingContext(ssl.SSLContext):
+    """SSLContext that keeps the last TLS session of each (host, port) and offers it when opening
+    a new connection there, so the server can resume it instead of doing a full handshake.
+    """
+
+    sslsocket_class = _SessionRememberingSocket
+
+    def __init__(self, protocol: int = ssl.PROTOCOL_TLS_CLIENT) -> None:
+        self._sessions: Dict[tuple, ssl.SSLSession] = {}
+
+    def _remember(self, sock: ssl.SSLSocket) -> None:
+        key = getattr(sock, "_session_key", None)
+        session = sock.session if key is not None else None
+        # TLS 1.3 tickets arrive after the handshake, so closing sockets are asked again
+        if session is not None and (session.has_ticket or sock.version() != "TLSv1.3"):
+            self._sessions[key] = session
+
+    def wrap_socket(self, sock, *args, **kwargs):
+        key = None
+        if not kwargs.get("server_side"):
+            host, port = sock.getpeername()[:2]
+            key = (kwargs.get("server_hostname") or host, port)
+            if kwargs.get("session") is None:
+                kwargs["session"] = self._sessions.get(key)
+        ssl_sock = super().wrap_socket(sock, *args, **kwargs)
+        ssl_sock._session_key = key
+        self._remember(ssl_sock)
+        return ssl_sock
+
+
+def _session_reusing_context() -> _SessionReusingContext:
+    context = _SessionReusingContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    # urllib3 sets verify_mode per pool and matches hostnames itself
+    context.check_hostname = False
+    context.load_verify_locations(requests.certs.where())
+    return context
+
+
+class AXLAdapter(HTTPAdapter):
+    """HTTPAdapter for AXL sessions with a sized connection pool, TCP keep-alive and TLS session reuse"""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["keep_alive", "tls_session_reuse"]
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        tls_session_reuse: bool = True,
+    ) -> None:
+        """
+        :param pool_connections: Number of host pools to keep, defaults to 10
+        :param pool_maxsize: Connections kept open per host, defaults to 10
+        :param pool_block: Make threads wait for a free connection instead of opening (and then
+            discarding) extra ones when the pool is exhausted, defaults to False
+        :param keep_alive: Enable TCP keep-alive so idle pooled connections survive, defaults to True
+        :param tls_session_reuse: Resume the previous TLS session on new connections, defaults to True
+        """
+        self.keep_alive = keep_alive
+        self.tls_session_reuse = tls_session_reuse
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.keep_alive:
+            pool_kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        if self.tls_session_reuse:
+            pool_kwargs["ssl_context"] = _session_reusing_context()
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+
+class SessionCookieAuth(AuthBase):
+    """Basic auth that steps aside once UCM has handed out a session cookie.
+
+    UCM authenticates every request carrying an Authorization header, which is slow when it
+    checks against LDAP. Requests that carry a session cookie go without one; if UCM answers
+    such a request with 401 (the session expired) it is sent again once with credentials,
+    and the fresh cookie from that response replaces the old one.
+    """
+
+    SESSION_COOKIES = ("JSESSIONID", "JSESSIONIDSSO")
+
+    def __init__(self, username: str, password: str, reuse_session: bool = True) -> None:
+        """
+        :param username: AXL username
+        :param password: AXL password
+        :param reuse_session: Leave out credentials when a session cookie is sent, defaults to True
+        """
+        self.username = username
+        self.password = password
+        self.reuse_session = reuse_session
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    def _has_session(self, request: requests.PreparedRequest) -> bool:
+        cookies = request.headers.get("Cookie", "")
+        names = {c.split("=", 1)[0].strip() for c in cookies.split(";")}
+        return any(name in names for name in self.SESSION_COOKIES)
+
+    def _authenticate(self, request: requests.PreparedRequest) -> None:
+        request.headers["Authorization"] = _basic_auth_str(self.username, self.password)
+        request.register_hook("response", self._count_round_trip)
+
+    def _count_round_trip(self, r: requests.Response, **kwargs) -> requests.Response:
+        with self._lock:
+            self.round_trips += 1
+        return r
+
+    def handle_401(self, r: requests.Response, **kwargs) -> requests.Response:
+        if r.status_code != 401 or "Authorization" in r.request.headers:
+            return r
+
+        # release the connection so the retry can reuse it
+        r.content
+        r.close()
+        prep = r.request.copy()
+        if prep._body_position is not None:
+            rewind_body(prep)
+        # drop the expired session, whatever UCM sets on the retry takes its place
+        prep.headers.pop("Cookie", None)
+        extract_cookies_to_jar(prep._cookies, r.request, r.raw)
+        for name in self.SESSION_COOKIES:
+            prep._cookies.set(name, None)
+        prep.prepare_cookies(prep._cookies)
+        # the copy shares its hooks with the original request, so count this one directly
+        prep.headers["Authorization"] = _basic_auth_str(self.username, self.password)
+        _r = self._count_round_trip(r.connection.send(prep, **kwargs))
+        _r.history.append(r)
+        _r.request = prep
+        return _r
+
+    def __call__(self, r: requests.PreparedRequest) -> requests.PreparedRequest:
+        if self.reuse_session and self._has_session(r):
+            r.register_hook("response", self.handle_401)
+        else:
+            self._authenticate(r)
+        return r
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class ThrottleController(object):
+    """Keeps AXL requests within what UCM is willing to serve.
+
+    A request UCM throttles (HTTP 429/503, or a fault about AXL memory or load) halves the
+    number of requests allowed in flight, and a read is retried after an exponential, fully
+    jittered backoff. Writes are only retried with `retry_writes`, as UCM may have applied
+    one it then reported as throttled. A Retry-After header holds back every request for that long. Each
+    request that goes through raises the limit again by 1 / limit, i.e. by one per limit's
+    worth of successes, up to `max_concurrency`. Throttles of requests sent before the last
+    decrease don't decrease it again, so one overloaded moment halves the limit once rather
+    than once per request.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        min_concurrency: int = 1,
+        retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        retry_writes: bool = False,
+    ) -> None:
+        """
+        :param max_concurrency: Most requests allowed in flight, defaults to 10
+        :param min_concurrency: Fewest requests allowed in flight, defaults to 1
+        :param retries: Times a throttled read is sent again before its response is
+            returned as it is, defaults to 5
+        :param backoff: Upper bound of the first backoff in seconds, doubled on every
+            retry of the same request, defaults to 0.5
+        :param max_backoff: Longest backoff in seconds, defaults to 30
+        :param retry_writes: Retry throttled writes (anything but get*, list* and
+            executeSQLQuery) too, defaults to False
+        """
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError("need 1 <= min_concurrency <= max_concurrency")
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_writes = retry_writes
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.retried = 0
+        self._resume_at = 0.0
+        self._epoch = 0
+        self._condition = threading.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        """Number of requests currently allowed in flight"""
+        return int(self.limit)
+
+    @staticmethod
+    def is_throttled(response: requests.Response) -> bool:
+        """Whether UCM refused a request because it is overloaded
+
+        :param response: The response to check
+        :return: True for HTTP 429/503 and throttling faults
+        """
+        if response.status_code in THROTTLE_STATUS_CODES:
+            return True
+        if response.status_code != 500:
+            return False
+        # faults are short, don't lowercase a large body
+        text = response.content[:4096].decode("utf-8", "replace").lower()
+        return any(message in text for message in THROTTLE_MESSAGES)
+
+    def retries_for(self, operation: str) -> int:
+        """Times a throttled request for an operation is sent again
+
+        :param operation: AXL operation name, e.g. 'listPhone'
+        :return: `retries` for reads, or for writes with `retry_writes`, else 0
+        """
+        return self.retries if self.retry_writes or is_read_operation(operation) else 0
+
+    def try_acquire(self) -> Tuple[Optional[int], Optional[float]]:
+        """Takes a free slot if there is one and no backoff is in progress, without waiting
+
+        :return: (ticket to hand back to release(), None), or (None, seconds until the
+            backoff ends, or None if waiting for a slot to be released)
+        """
+        with self._condition:
+            return self._try_acquire()
+
+    def _try_acquire(self) -> Tuple[Optional[int], Optional[float]]:
+        wait = self._resume_at - time.monotonic()
+        if wait <= 0 and self.in_flight < self.concurrency:
+            self.in_flight += 1
+            return self._epoch, None
+        return None, wait if wait > 0 else None
+
+    def acquire(self) -> int:
+        """Waits for a free slot and any backoff in progress
+
+        :return: A ticket to hand back to release()
+        """
+        with self._condition:
+            while True:
+                ticket, wait = self._try_acquire()
+                if ticket is not None:
+                    return ticket
+                self._condition.wait(wait)
+
+    def release(self, ticket: int, throttled: bool, retry_after: Optional[float] = None) -> None:
+        """Frees the slot taken by acquire() and adjusts the limit to the outcome
+
+        :param ticket: What acquire() returned
+        :param throttled: Whether UCM throttled the request
+        :param retry_after: Seconds UCM asked to wait (Retry-After), if any
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self.requests += 1
+            if throttled:
+                self.throttled += 1
+                # requests sent before the last decrease were already accounted for by it
+                if ticket == self._epoch:
+                    self._epoch += 1
+                    self.limit = max(self.min_concurrency, self.limit / 2)
+                if retry_after:
+                    # UCM asked everyone to wait, not just this request
+                    self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def send(
+        self, request: Callable[[], requests.Response], operation: str = ""
+    ) -> requests.Response:
+        """Sends a request within the limit, backing off and retrying while it is throttled
+
+        :param request: Sends the request and returns its response
+        :param operation: AXL operation name, e.g. 'listPhone', which decides whether a
+            throttled request is retried (see retries_for)
+        :return: The first response that wasn't throttled, or the last one once the
+            retries are used up
+        """
+        retries = self.retries_for(operation)
+        attempt = 0
+        while True:
+            ticket = self.acquire()
+            try:
+                response = request()
+            except BaseException:
+                self.release(ticket, False)
+                raise
+            throttled = self.is_throttled(response)
+            self.release(ticket, throttled, _retry_after(response) if throttled else None)
+            if not throttled or attempt >= retries:
+                return response
+            response.close()
+            self.retrying()
+            # full jitter, so the throttled requests don't all come back at once
+            ceiling = min(self.max_backoff, self.backoff * 2 ** attempt)
+            time.sleep(random.uniform(0, ceiling))  # nosec
+            attempt += 1
+
+    def retrying(self) -> None:
+        """Counts a throttled request that is about to be sent again"""
+        with self._condition:
+            self.retried += 1
+
+    def state(self) -> Dict[str, Any]:
+        """Snapshot of the controller
+
+        :return: dict with concurrency, in_flight, requests, throttled, retried and backoff
+            (seconds until requests may be sent again, after a Retry-After)
+        """
+        with self._condition:
+            return {
+                "concurrency": self.concurrency,
+                "in_flight": self.in_flight,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "retried": self.retried,
+                "backoff": max(0.0, self._resume_at - time.monotonic()),
+            }
+
+    def __repr__(self) -> str:
+        state = ", ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+                          for k, v in self.state().items())
+        return f"ThrottleController({state})"
+
+
+def operation_name(headers: Dict[str, str]) -> str:
+    """Name of the AXL operation a request is for
+
+    :param headers: HTTP headers zeep sends, with a SOAPAction like '"CUCM:DB ver=12.5 listPhone"'
+    :return: The operation name, e.g. 'listPhone', or '' if there is none
+    """
+    return headers.get("SOAPAction", "").strip('"').rpartition(" ")[2]
+
+
+def classify_operation(operation: str) -> str:
+    """Default operation classes of RateLimiter
+
+    :param operation: AXL operation name, e.g. 'listPhone'
+    :return: 'sql' for executeSQLQuery/executeSQLUpdate, 'read' for get*/list*, else 'write'
+    """
+    for prefix, operation_class in OPERATION_CLASSES:
+        if operation.startswith(prefix):
+            return operation_class
+    return "write"
+
+
+class TokenBucket(object):
+    """Allows `rate` requests per second on average, and bursts of up to `burst`.
+
+    Callers over budget wait their turn in the order they asked, each reserving the next
+    token as it comes in rather than all competing for it when it does.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        """
+        :param rate: Tokens added per second
+        :param burst: Most tokens held at once, defaults to one second's worth (at least 1)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1.0, rate) if burst is None else burst
+        self.tokens = self.burst
+        self.waited = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Takes a token without waiting for it, e.g. to wait with asyncio.sleep() instead
+
+        :return: Seconds to wait before using the token
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            # a negative balance is the queue of callers ahead, each a token's worth of wait
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += wait
+        return wait
+
+    def acquire(self) -> float:
+        """Takes a token, waiting for it if there is none
+
+        :return: Seconds waited
+        """
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def available(self) -> float:
+        """Tokens available right now, negative while callers are waiting"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self.tokens
+
+
+class RateLimiter(object):
+    """Separate request budgets for classes of AXL operations, shared by every thread using
+    one axl object, so e.g. a bulk export through list* calls can't use up the request rate
+    that interactive get*/update* calls rely on.
+
+    By default operations are classed as 'read' (get*, list*), 'sql' (executeSQLQuery,
+    executeSQLUpdate) and 'write' (everything else). A class without a budget isn't limited.
+    Retries of throttled requests don't take tokens.
+    """
+
+    def __init__(
+        self,
+        budgets: Dict[str, Union[float, Tuple[float, float]]],
+        classify: Callable[[str], str] = classify_operation,
+    ) -> None:
+        """
+        :param budgets: Requests per second for each class, or (rate, burst) tuples,
+            e.g. {'read': 20, 'write': 5, 'sql': (2, 4)}
+        :param classify: Maps an operation name to its class, defaults to classify_operation
+        """
+        self.buckets: Dict[str, TokenBucket] = {}
+        for operation_class, budget in budgets.items():
+            rate, burst = budget if isinstance(budget, tuple) else (budget, None)
+            self.buckets[operation_class] = TokenBucket(rate, burst)
+        self.classify = classify
+        self.request_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, operation: str) -> float:
+        """Takes budget for one more request of the operation's class without waiting for it
+
+        :param operation: AXL operation name, e.g. 'listPhone'
+        :return: Seconds to wait before sending the request
+        """
+        operation_class = self.classify(operation)
+        with self._lock:
+            self.request_counts[operation_class] = self.request_counts.get(operation_class, 0) + 1
+        bucket = self.buckets.get(operation_class)
+        return bucket.reserve() if bucket is not None else 0.0
+
+    def acquire(self, operation: str) -> float:
+        """Waits until the operation's class has budget for one more request
+
+        :param operation: AXL operation name, e.g. 'listPhone'
+        :return: Seconds waited
+        """
+        wait = self.reserve(operation)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of every class seen or budgeted
+
+        :return: dict of class to rate, burst, tokens available, requests and seconds waited
+        """
+        with self._lock:
+            counts = dict(self.request_counts)
+        state: Dict[str, Dict[str, Any]] = {}
+        for operation_class in {**self.buckets, **counts}:
+            bucket = self.buckets.get(operation_class)
+            state[operation_class] = {
+                "rate": bucket.rate if bucket else None,
+                "burst": bucket.burst if bucket else None,
+                "tokens": bucket.available() if bucket else None,
+                "requests": counts.get(operation_class, 0),
+                "waited": bucket.waited if bucket else 0.0,
+            }
+        return state
+
+    def __repr__(self) -> str:
+        budgets = ", ".join(f"{c}={b.rate:g}/s" for c, b in self.buckets.items())
+        return f"RateLimiter({budgets})"
+
+
+def is_read_operation(operation: str) -> bool:
+    """Whether an AXL operation only reads, so any node of the cluster can serve it
+
+    :param operation: AXL operation name, e.g. 'listPhone'
+    :return: True for get*, list* and executeSQLQuery
+    """
+    return operation == "executeSQLQuery" or operation.startswith(("get", "list"))
+
+
+class Node(object):
+    """One AXL endpoint of a NodePool, with its health and latency"""
+
+    def __init__(self, url: str, history: int = 100) -> None:
+        """
+        :param url: AXL endpoint, e.g. https://cucm-sub1:8443/axl/
+        :param history: Number of recent latencies to keep, defaults to 100
+        """
+        self.url = url
+        self.requests = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+        self.latencies: Deque[float] = deque(maxlen=history)
+
+    def healthy(self, now: float) -> bool:
+        return self.down_until <= now
+
+    def mean_latency(self) -> float:
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    def state(self, now: float) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "healthy": self.healthy(now),
+            "requests": self.requests,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "mean_latency": self.mean_latency(),
+            "p50_latency": latencies[len(latencies) // 2] if latencies else None,
+            "p95_latency": latencies[int(len(latencies) * 0.95)] if latencies else None,
+        }
+
+
+class NodePool(object):
+    """Spreads AXL reads over several nodes of a cluster, keeping writes on the publisher.
+
+    Reads (get*, list*, executeSQLQuery) go to the read nodes in turn ('round_robin') or to
+    the one with the fewest requests in flight ('least_loaded', ties going to the fastest).
+    A read that can't connect, times out or gets a 404/502/504 is tried on the next node.
+    A node failing `failure_threshold` times in a row is taken out of rotation for
+    `cooldown` seconds, then given another chance. When no read node is healthy, reads go
+    to the publisher. Everything else always goes to the publisher.
+    """
+
+    STRATEGIES = ("round_robin", "least_loaded")
+
+    def __init__(
+        self,
+        publisher: str,
+        read_nodes: Sequence[str],
+        strategy: str = "round_robin",
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+    ) -> None:
+        """
+        :param publisher: AXL endpoint of the publisher
+        :param read_nodes: AXL endpoints that serve reads, the publisher's included if it
+            should take its share
+        :param strategy: 'round_robin' or 'least_loaded', defaults to 'round_robin'
+        :param failure_threshold: Failures in a row that take a node out of rotation, defaults to 3
+        :param cooldown: Seconds an unhealthy node stays out of rotation, defaults to 30
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"strategy must be one of {self.STRATEGIES}, got {strategy!r}")
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.publisher = Node(publisher)
+        self.nodes: Dict[str, Node] = {publisher: self.publisher}
+        for url in read_nodes:
+            self.nodes.setdefault(url, Node(url))
+        self.read_nodes: List[Node] = [self.nodes[url] for url in dict.fromkeys(read_nodes)]
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def _read_order(self) -> List[Node]:
+        """Healthy read nodes, the one to try first leading"""
+        with self._lock:
+            now = time.monotonic()
+            healthy = [node for node in self.read_nodes if node.healthy(now)]
+            if not healthy:
+                return [self.publisher]
+            if self.strategy == "least_loaded":
+                return sorted(healthy, key=lambda node: (node.in_flight, node.mean_latency()))
+            start = next(self._turn) % len(healthy)
+            return healthy[start:] + healthy[:start]
+
+    def _begin(self, node: Node) -> float:
+        with self._lock:
+            node.in_flight += 1
+        return time.perf_counter()
+
+    def _end(self, node: Node, start: float, ok: bool) -> None:
+        with self._lock:
+            node.in_flight -= 1
+            node.requests += 1
+            if ok:
+                node.latencies.append(time.perf_counter() - start)
+                node.consecutive_failures = 0
+                return
+            node.failures += 1
+            node.consecutive_failures += 1
+            if node.consecutive_failures >= self.failure_threshold:
+                node.down_until = time.monotonic() + self.cooldown
+
+    def send(
+        self, operation: str, request: Callable[[str], requests.Response]
+    ) -> requests.Response:
+        """Sends a request to the node that should serve it
+
+        :param operation: AXL operation name, e.g. 'listPhone'
+        :param request: Sends the request to the AXL endpoint it is given
+        :return: The response
+        """
+        nodes = self._read_order() if is_read_operation(operation) else [self.publisher]
+        for attempt, node in enumerate(nodes, 1):
+            start = self._begin(node)
+            try:
+                response = request(node.url)
+            except (requests.ConnectionError, requests.Timeout):
+                self._end(node, start, False)
+                if attempt == len(nodes):
+                    raise
+                continue
+            down = response.status_code in NODE_DOWN_STATUS_CODES
+            self._end(node, start, not down)
+            if not down or attempt == len(nodes):
+                return response
+            response.close()
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        """Health and latency of every node
+
+        :return: dict of endpoint to healthy, requests, failures, in_flight and mean, p50
+            and p95 latency in seconds
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {url: node.state(now) for url, node in self.nodes.items()}
+
+    def __repr__(self) -> str:
+        return f"NodePool({', '.join(self.nodes)}, strategy={self.strategy!r})"
+
+
+class AXLTransport(Transport):
+    """Zeep Transport that remembers the size of the last response each thread received.
+    Given a RateLimiter, it keeps each class of operations within its budget, given a
+    ThrottleController, it backs off and retries when UCM throttles a request, and given a
+    NodePool, it sends reads to the node the pool picks. Within streaming(), responses are
+    returned unread, to be consumed from ``response.raw``.
+    """
+
+    def __init__(
+        self,
+        *args,
+        throttle: Optional[ThrottleController] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        nodes: Optional[NodePool] = None,
+        **kwargs,
+    ) -> None:
+        """
+        :param throttle: Controller that paces requests, defaults to None (no pacing)
+        :param rate_limiter: Request budgets per operation class, defaults to None (no limit)
+        :param nodes: Where to send each operation, defaults to None (the address zeep gives)
+        :param args: Passed on to zeep's Transport
+        :param kwargs: Passed on to zeep's Transport
+        """
+        super().__init__(*args, **kwargs)
+        self.throttle = throttle
+        self.rate_limiter = rate_limiter
+        self.nodes = nodes
+        self._local = threading.local()
+
+    def post(self, address, message, headers) -> requests.Response:
+        operation = operation_name(headers)
+        streaming = getattr(self._local, "streaming", False)
+        if self.rate_limiter is not None:
+            # before taking one of the throttle's slots, so waiting calls don't hold one
+            self.rate_limiter.acquire(operation)
+        if self.nodes is None:
+            response = self._send(address, message, headers)
+        else:
+            response = self.nodes.send(
+                operation, lambda url: self._send(url, message, headers)
+            )
+        if not streaming:
+            self._local.response_size = len(response.content)
+        return response
+
+    def _post(self, address, message, headers) -> requests.Response:
+        if not getattr(self._local, "streaming", False):
+            return super().post(address, message, headers)
+        return self.session.post(
+            address,
+            data=message,
+            headers=headers,
+            timeout=self.operation_timeout,
+            stream=True,
+        )
+
+    def _send(self, address, message, headers) -> requests.Response:
+        if self.throttle is None:
+            return self._post(address, message, headers)
+        return self.throttle.send(
+            lambda: self._post(address, message, headers), operation_name(headers)
+        )
+
+    @contextlib.contextmanager
+    def streaming(self) -> Iterator[None]:
+        """Within this block, the calling thread's requests return without reading the
+        response body, which the caller then reads from ``response.raw`` and closes
+        """
+        self._local.streaming = True
+        try:
+            yield
+        finally:
+            self._local.streaming = False
+
+    def record_response_size(self, size: int) -> None:
+        """Records the size of a streamed response once it has been read
+
+        :param size: Size of the body in bytes
+        """
+        self._local.response_size = size
+
+    def last_response_size(self) -> Optional[int]:
+        """Size of the body of the last response received by the calling thread
+
+        :return: Size in bytes, or None before the first response
+        """
+        return getattr(self._local, "response_size", None)
+
+
+def build_session(
+    auth: Union[AuthBase, Tuple[str, str]], verify: bool = True, **adapter_options
+) -> Session:
+    """Creates an authenticated requests Session with an AXLAdapter mounted for https
+
+    :param auth: requests auth, e.g. a SessionCookieAuth or a (username, password) tuple
+    :param verify: Verify the server's certificate, defaults to True
+    :param adapter_options: Passed on to AXLAdapter
+    :return: A requests Session
+    """
+    session = Session()
+    session.auth = auth
+    session.verify = verify
+    session.mount("https://", AXLAdapter(**adapter_options))
+    return session
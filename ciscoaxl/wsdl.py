@@ -12,7 +12,6 @@ from ciscoaxl.exceptions import (
     TagNotValid,
     WSDLValueOnlyException,
 )
-from termcolor import colored
 
 
 class AXLElement:
@@ -157,6 +156,8 @@ class AXLElement:
         :param show_types: Shows the types of all elements next to their names, defaults to False
         :param show_required: Shows if an element is required, or only required if its parent is used, defaults to True
         """
+        from termcolor import colored
+
         branch_str = f"{'  ' * indent if indent < 2 else ('  |' * (indent - 1)) + '  '}{'┗ ' if indent else ''}"
         name_str = self.name
         atrib_str = ""
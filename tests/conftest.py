@@ -0,0 +1,13 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# the stand-in AXL server lives with the benchmarks
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+
+@pytest.fixture(scope="session")
+def schema_cache(tmp_path_factory):
+    """Schema cache shared by the tests, so they never write into the user's cache directory"""
+    return tmp_path_factory.mktemp("schema-cache")
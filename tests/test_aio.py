@@ -0,0 +1,139 @@
+import asyncio
+import itertools
+
+import pytest
+from zeep.exceptions import Fault
+
+from mock_axl import DeviceTable, MockAXLServer, PhoneInventory, default_responder
+
+pytest.importorskip("httpx")
+
+from ciscoaxl import AsyncAxl  # noqa: E402
+from ciscoaxl.aio import _Outcome  # noqa: E402
+
+OPERATIONS = ["executeSQLQuery", "getPhone", "listPhone"]
+NOT_FOUND = (
+    500,
+    "<soapenv:Fault><faultcode>soapenv:Server</faultcode>"
+    "<faultstring>Item not valid: The specified nope was not found</faultstring></soapenv:Fault>",
+)
+
+
+class Responder:
+    def __init__(self):
+        self.phones = PhoneInventory(250)
+        self.devices = DeviceTable(3)
+        self.throttle = iter(())
+
+    def __call__(self, operation, request):
+        if next(self.throttle, False):
+            return 503, "AXL service is too busy"
+        if operation == "listPhone":
+            return self.phones(operation, request)
+        if operation == "executeSQLQuery":
+            return self.devices(operation, request)
+        if operation == "getPhone":
+            return NOT_FOUND
+        return default_responder(operation, request)
+
+
+@pytest.fixture
+def run(schema_cache):
+    def run(server, test, **options):
+        async def main():
+            async with AsyncAxl(
+                "u", "p", "127.0.0.1", "12.5", cucm_port=server.port, operations=OPERATIONS,
+                schema_cache=schema_cache, **options
+            ) as ucm:
+                return await test(ucm)
+
+        return asyncio.run(main())
+
+    return run
+
+
+class TestOutcome:
+    def test_responses_are_not_copied(self):
+        records = [1, 2, 3]
+        response = {"return": {"phone": records}}
+        outcome = _Outcome("listPhone", (), {}, response=response)
+
+        assert outcome.result() is response
+        # as Paginator does
+        records.reverse()
+        del records[:]
+
+        # read again by a later replay
+        assert outcome.result() is response
+        assert records == [1, 2, 3]
+
+    def test_errors_are_raised(self):
+        outcome = _Outcome("getPhone", (), {}, error=ValueError("nope"))
+
+        with pytest.raises(ValueError):
+            outcome.result()
+
+    def test_other_responses(self):
+        assert _Outcome("doThing", (), {}, response={"return": None}).result() == {"return": None}
+        assert _Outcome("doThing", (), {}, response=None).result() is None
+
+
+class TestAsyncAxl:
+    def test_concurrent_queries_share_a_session(self, run):
+        async def test(ucm):
+            results = await asyncio.gather(
+                *(ucm.run_sql_query("select name from device") for _ in range(30))
+            )
+            return results, ucm.auth_round_trips
+
+        with MockAXLServer(responder=Responder()) as server:
+            results, round_trips = run(server, test, max_concurrency=10)
+
+            assert all(result["num_rows"] == 3 for result in results)
+            assert round_trips == server.stats["authentications"]
+            assert server.stats["requests"] == 30
+
+    def test_listing_pages(self, run):
+        async def test(ucm):
+            return await ucm.get_phones(tagfilter={"name": ""})
+
+        with MockAXLServer(responder=Responder()) as server:
+            phones = run(server, test, page_size=100)
+
+            assert [phone["name"] for phone in phones] == PhoneInventory(250).names
+            assert server.stats["requests"] == 3
+
+    def test_faults_are_handled_by_the_method(self, run):
+        async def test(ucm):
+            returned = await ucm.get_phone(name="nope")
+            with pytest.raises(Fault):
+                await ucm.call("getPhone", name="nope")
+            return returned
+
+        with MockAXLServer(responder=Responder()) as server:
+            returned = run(server, test)
+
+            assert isinstance(returned, Fault)
+            assert "nope" in returned.message
+
+    def test_throttled_requests_are_retried(self, run):
+        responder = Responder()
+
+        async def test(ucm):
+            responder.throttle = itertools.chain([True, True], itertools.repeat(False))
+            result = await ucm.run_sql_query("select name from device")
+            return result, ucm.throttle.state()
+
+        with MockAXLServer(responder=responder) as server:
+            result, state = run(server, test, throttle=True)
+
+            assert result["num_rows"] == 3
+            assert state["retried"] == 2
+            assert state["in_flight"] == 0
+
+    def test_unsupported_options(self):
+        with pytest.raises(ValueError):
+            AsyncAxl("u", "p", "127.0.0.1", "12.5", read_nodes=["10.0.0.2"])
+        with pytest.raises(ValueError):
+            AsyncAxl("u", "p", "127.0.0.1", "12.5", max_concurrency=0)
+        assert not hasattr(AsyncAxl, "sql_columns")
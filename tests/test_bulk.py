@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+from ciscoaxl.bulk import run_bulk
+
+
+def echo(value, delay=0.0):
+    time.sleep(delay)
+    if value < 0:
+        raise ValueError(value)
+    return value
+
+
+class TestRunBulk:
+    def test_results_in_input_order(self):
+        items = [{"value": i, "delay": (5 - i) * 0.01} for i in range(6)]
+
+        assert list(run_bulk(echo, items, workers=3)) == [(i, i) for i in range(6)]
+
+    def test_unordered_yields_as_completed(self):
+        items = [{"value": 0, "delay": 0.2}, {"value": 1}]
+
+        assert [index for index, _ in run_bulk(echo, items, workers=2, ordered=False)] == [1, 0]
+
+    def test_errors_are_results(self):
+        results = dict(run_bulk(echo, [{"value": 1}, {"value": -1}, {"value": 2}]))
+
+        assert results[0] == 1 and results[2] == 2
+        assert isinstance(results[1], ValueError)
+
+    def test_workers_bound_concurrency(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def call(value):
+            with lock:
+                running.append(value)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(value)
+            return value
+
+        assert len(list(run_bulk(call, ({"value": i} for i in range(20)), workers=4))) == 20
+        assert max(peak) <= 4
+
+    def test_items_are_read_lazily(self):
+        taken = []
+
+        def items():
+            for i in range(100):
+                taken.append(i)
+                yield {"value": i}
+
+        results = run_bulk(echo, items(), workers=2, window=2)
+        assert next(results) == (0, 0)
+        # one window of calls ahead of what was yielded, not the whole input
+        assert len(taken) <= 6
+        results.close()
+
+    def test_progress(self):
+        calls = []
+        list(run_bulk(echo, [{"value": 5}, {"value": 6}], progress=lambda *a: calls.append(a)))
+
+        assert calls == [(1, 2, 0, 5), (2, 2, 1, 6)]
+
+    def test_total_unknown_for_generators(self):
+        calls = []
+        items = ({"value": i} for i in range(2))
+        list(run_bulk(echo, items, progress=lambda *a: calls.append(a)))
+
+        assert [total for _, total, _, _ in calls] == [None, None]
+
+    def test_invalid_workers(self):
+        with pytest.raises(ValueError):
+            list(run_bulk(echo, [], workers=0))
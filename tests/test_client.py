@@ -0,0 +1,349 @@
+import socket
+import threading
+import time
+
+import pytest
+from zeep.exceptions import Fault
+
+from ciscoaxl import axl
+from ciscoaxl.columnar import DictionaryColumn
+from mock_axl import DeviceTable, MockAXLServer, PhoneInventory, default_responder
+
+# the stand-in server's certificate is self-signed
+pytestmark = pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+
+OPERATIONS = ["executeSQLQuery", "getPhone", "listPhone", "updatePhone"]
+PHONES = PhoneInventory(250)
+
+
+def responder(operation, request):
+    if operation == "listPhone":
+        return PHONES(operation, request)
+    if operation == "executeSQLQuery":
+        return DeviceTable(3)(operation, request)
+    return default_responder(operation, request)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # a CA bundle from the environment would override the unverified fallback session
+    monkeypatch.delenv("REQUESTS_CA_BUNDLE", raising=False)
+    monkeypatch.delenv("CURL_CA_BUNDLE", raising=False)
+    with MockAXLServer(responder=responder) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server, schema_cache):
+    def client(**options):
+        options.setdefault("operations", OPERATIONS)
+        return axl(
+            "u", "p", "127.0.0.1", "12.5", cucm_port=server.port, schema_cache=schema_cache,
+            **options,
+        )
+
+    return client
+
+
+def count_probes(monkeypatch):
+    probes = []
+    probe = axl._probe
+
+    def counting(session, url):
+        # only count the probes that got an answer, not the verified attempt
+        # the self-signed certificate fails
+        status = probe(session, url)
+        probes.append(status)
+        return status
+
+    monkeypatch.setattr(axl, "_probe", staticmethod(counting))
+    return probes
+
+
+class TestLazy:
+    def test_nothing_happens_until_first_use(self, client, server, monkeypatch):
+        probes = count_probes(monkeypatch)
+        ucm = client(lazy=True)
+
+        assert probes == []
+        assert server.stats["handshakes"] == 0
+
+        assert ucm.run_sql_query("select name from device")["num_rows"] == 3
+        assert probes == [200]
+        assert server.stats["requests"] == 1
+
+    def test_warmup_runs_once(self, client, monkeypatch):
+        probes = count_probes(monkeypatch)
+        ucm = client(lazy=True)
+
+        threads = [threading.Thread(target=ucm.warmup) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ucm.warmup()
+
+        assert len(probes) == 1
+        assert ucm.client is ucm.client
+
+    def test_eager_by_default(self, client, monkeypatch):
+        probes = count_probes(monkeypatch)
+        client()
+
+        assert len(probes) == 1
+
+    def test_probe_failure_surfaces_on_first_use(self):
+        ucm = axl(
+            "u", "p", "127.0.0.1", "12.5", cucm_port=1, lazy=True, schema_cache=False,
+            operations=OPERATIONS,
+        )
+
+        with pytest.raises(Exception, match="cannot be found"):
+            ucm.warmup()
+
+
+class TestWarmup:
+    def test_probe_and_schema_load_overlap(self, client, monkeypatch):
+        probing = threading.Event()
+        loaded = threading.Event()
+        probe = axl._probe
+        load_document = axl._load_document
+
+        def slow_probe(session, url):
+            probing.set()
+            # the schema has to finish loading while the probe is still out
+            assert loaded.wait(10)
+            return probe(session, url)
+
+        def slow_load(self, settings):
+            assert probing.wait(10)
+            document = load_document(self, settings)
+            loaded.set()
+            return document
+
+        monkeypatch.setattr(axl, "_probe", staticmethod(slow_probe))
+        monkeypatch.setattr(axl, "_load_document", slow_load)
+
+        assert client().run_sql_query("select name from device")["num_rows"] == 3
+
+
+class TestListings:
+    def test_wrappers_page(self, client, server):
+        phones = client(page_size=100).get_phones(tagfilter={"name": ""})
+
+        assert [phone["name"] for phone in phones] == PHONES.names
+        assert server.stats["requests"] == 3
+
+    def test_page_size_per_call(self, client, server):
+        phones = client(page_size=100).get_phones(tagfilter={"name": ""}, page_size=50)
+
+        assert len(phones) == 250
+        assert server.stats["requests"] == 6
+
+    def test_iterators_fetch_as_they_go(self, client, server):
+        phones = client(page_size=100).iter_phones(tagfilter={"name": ""})
+
+        assert next(phones)["name"] == PHONES.names[0]
+        assert server.stats["requests"] == 1
+        assert len(list(phones)) == 249
+        assert server.stats["requests"] == 3
+
+    def test_iter_pages(self, client):
+        pages = client().iter_pages("listPhone", {"name": "SEP%"}, {"name": ""}, page_size=100)
+
+        assert [len(page) for page in pages] == [100, 100, 50]
+
+    def test_page_workers(self, client):
+        phones = client(page_size=20, page_workers=4).get_phones(tagfilter={"name": ""})
+
+        assert [phone["name"] for phone in phones] == PHONES.names
+
+    def test_page_prefetch(self, client, server):
+        phones = client(page_size=100, page_prefetch=2).iter_phones(tagfilter={"name": ""})
+
+        assert next(phones)["name"] == PHONES.names[0]
+        # the rest of the listing is fetched in the background
+        for _ in range(100):
+            if server.stats["requests"] == 3:
+                break
+            time.sleep(0.05)
+        assert server.stats["requests"] == 3
+        assert len(list(phones)) == 249
+
+    def test_raw_listings(self, client):
+        phones = client(page_size=100, raw_listings=True).get_phones(tagfilter={"name": ""})
+
+        assert type(phones[0]) is dict
+        assert [phone["name"] for phone in phones] == PHONES.names
+
+    def test_tuples(self, client):
+        pages = client().iter_pages(
+            "listPhone", {"name": "SEP%"}, {"name": "", "description": ""}, tuples=True
+        )
+
+        assert next(pages)[0] == (PHONES.names[0], "Synthetic phone")
+
+    def test_adaptive_paging(self, client, server):
+        server.responder = PhoneInventory(250, max_rows=60)
+        ucm = client(page_size=100, adaptive_paging=True)
+
+        assert len(ucm.get_phones(tagfilter={"name": ""})) == 250
+        assert ucm.last_paging_stats.faults == 1
+        assert ucm.last_paging_stats.largest_page_size <= 60
+        assert ucm.last_paging_stats.records == 250
+
+
+class TestPartitioned:
+    def test_lists_by_partition(self, client):
+        ucm = client(page_size=20)
+        phones = ucm.iter_partitioned(
+            "listPhone", {"name": "SEP%"}, {"name": ""}, partition_size=40
+        )
+
+        assert [phone["name"] for phone in phones] == PHONES.names
+        assert ucm.last_paging_stats.records == 250
+        assert ucm.last_paging_stats.bytes > 0
+
+    def test_count_query(self, client, server):
+        server.responder = PHONES
+        ucm = client(page_size=20)
+
+        def count(prefix):
+            query = f"select count(*) from device where name like '{prefix}%'"
+            return int(ucm.run_sql_query(query)["rows"][0]["count"])
+
+        phones = ucm.iter_partitioned(
+            "listPhone", {"name": "SEP%"}, {"name": ""}, partition_size=40, count=count
+        )
+
+        assert [phone["name"] for phone in phones] == PHONES.names
+        assert max(skip for skip, *_ in ucm.last_paging_stats.decisions) <= 40
+
+
+class TestBulk:
+    def test_results_per_item(self, client, server):
+        def get_phone(operation, request):
+            name = request.decode().split("<name>")[1].split("</name>")[0]
+            if name not in PHONES.names:
+                return 500, (
+                    "<soapenv:Fault><faultcode>soapenv:Server</faultcode>"
+                    f"<faultstring>Item not valid: {name}</faultstring></soapenv:Fault>"
+                )
+            return (
+                '<ns:getPhoneResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+                f"<return>{PHONES.record(name)}</return></ns:getPhoneResponse>"
+            )
+
+        server.responder = get_phone
+        names = PHONES.names[:20] + ["SEPMISSING"]
+        results = client().bulk("get_phone", [{"name": name} for name in names], workers=4)
+
+        assert [phone["name"] for phone in results[:20]] == PHONES.names[:20]
+        assert "Item not valid" in str(results[20])
+
+    def test_axl_operations(self, client, server):
+        progress = []
+        ucm = client()
+
+        results = list(ucm.iter_bulk(
+            "executeSQLQuery",
+            [{"sql": "select name from device"}] * 3,
+            ordered=False,
+            progress=lambda *args: progress.append(args[:2]),
+        ))
+
+        assert sorted(index for index, _ in results) == [0, 1, 2]
+        assert all(len(result["return"]["row"]) == 3 for _, result in results)
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+class TestReadNodes:
+    def test_reads_fail_over_and_writes_stay_on_publisher(self, client, server):
+        with socket.socket() as closed:
+            closed.bind(("127.0.0.1", 0))
+            dead = closed.getsockname()[1]
+        # both servers are 127.0.0.1, so each one's session cookie costs the other an extra
+        # 401: count the requests each one answers instead
+        answered = {"publisher": [], "subscriber": []}
+
+        def answering(node):
+            def answer(operation, request):
+                answered[node].append(operation)
+                return responder(operation, request)
+
+            return answer
+
+        server.responder = answering("publisher")
+        with MockAXLServer(responder=answering("subscriber")) as subscriber:
+            ucm = client(read_nodes=[f"127.0.0.1:{dead}", f"127.0.0.1:{subscriber.port}"])
+
+            # every other read starts on the dead node, until 3 failures take it out
+            for _ in range(8):
+                assert ucm.run_sql_query("select name from device")["num_rows"] == 3
+            ucm.client.updatePhone(name=PHONES.names[0])
+
+            assert answered == {
+                "publisher": ["updatePhone"], "subscriber": ["executeSQLQuery"] * 8
+            }
+            state = ucm.nodes.state()
+            assert not state[f"https://127.0.0.1:{dead}/axl/"]["healthy"]
+            assert state[f"https://127.0.0.1:{dead}/axl/"]["failures"] == 3
+            assert state[f"https://127.0.0.1:{subscriber.port}/axl/"]["failures"] == 0
+
+
+class TestIterResponse:
+    def test_listing(self, client):
+        ucm = client()
+        phones = ucm.iter_response(
+            "listPhone", searchCriteria={"name": "SEP%"}, returnedTags={"name": ""}
+        )
+
+        assert [phone["name"] for phone in phones] == PHONES.names
+        # counted as the body streamed past
+        assert ucm._zeep.transport.last_response_size() > 250 * 100
+
+    def test_sql_rows(self, client):
+        rows = client().iter_response("executeSQLQuery", sql="select name from device")
+
+        assert [row["name"] for row in rows] == [f"SEP{i:012X}" for i in range(3)]
+
+    def test_tuples(self, client):
+        phones = client().iter_response(
+            "listPhone", tuples=True,
+            searchCriteria={"name": "SEP%"}, returnedTags={"description": "", "name": ""},
+        )
+
+        assert next(phones) == ("Synthetic phone", PHONES.names[0])
+
+    def test_fault(self, client, server):
+        server.responder = PhoneInventory(250, max_rows=60)
+        phones = client().iter_response(
+            "listPhone", searchCriteria={"name": "SEP%"}, returnedTags={"name": ""}
+        )
+
+        with pytest.raises(Fault, match="Query request too large"):
+            next(phones)
+
+    def test_item_name_needed(self, client):
+        with pytest.raises(ValueError):
+            next(client().iter_response("getPhone", name="SEP000000000000"))
+
+
+class TestColumns:
+    def test_list_columns(self, client):
+        result = client(page_size=100).list_columns(
+            "listPhone", {"name": "SEP%"}, {"name": "", "description": ""}
+        )
+
+        assert result.num_rows == 250
+        assert list(result["name"]) == PHONES.names
+        assert isinstance(result["description"], DictionaryColumn)
+        assert result["description"].values == ["Synthetic phone"]
+
+    def test_sql_columns(self, client):
+        result = client().sql_columns(
+            "select name, tkmodel from device", types={"tkmodel": "int"}
+        )
+
+        assert list(result["tkmodel"]) == [36213, 36214, 36215]
+        assert list(result["name"]) == [f"SEP{i:012X}" for i in range(3)]
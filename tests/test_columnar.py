@@ -0,0 +1,118 @@
+from array import array
+from collections import namedtuple
+
+import pytest
+
+from ciscoaxl.columnar import MIN_DICTIONARY_VALUES, ColumnarResult, DictionaryColumn
+
+Row = namedtuple("Row", ["name", "tkmodel", "isactive", "pool"])
+ROWS = [
+    Row("SEP001", 36, True, "Default"),
+    Row("SEP002", 36, False, "Default"),
+    Row("SEP003", 503, True, None),
+]
+TYPES = {"tkmodel": "int", "isactive": "bool"}
+
+
+class TestDictionaryColumn:
+    def test_codes(self):
+        column = DictionaryColumn()
+        for value in ["a", "b", None, "a"]:
+            column.append(value)
+
+        assert list(column.codes) == [0, 1, -1, 0]
+        assert column.values == ["a", "b"]
+        assert list(column) == ["a", "b", None, "a"]
+        assert column[2] is None
+
+    def test_only_strings(self):
+        with pytest.raises(TypeError):
+            DictionaryColumn().append(5)
+
+
+class TestColumnarResult:
+    def test_from_rows(self):
+        result = ColumnarResult.from_rows(ROWS, types=TYPES)
+
+        assert result.num_rows == 3
+        assert list(result) == ["name", "tkmodel", "isactive", "pool"]
+        assert result["tkmodel"] == array("q", [36, 36, 503])
+        assert isinstance(result["pool"], DictionaryColumn)
+        assert result["pool"].values == ["Default"]
+        assert list(result.rows()) == [(r.name, r.tkmodel, int(r.isactive), r.pool) for r in ROWS]
+
+    def test_dict_rows(self):
+        result = ColumnarResult.from_rows([{"name": "a", "pool": "x"}, {"name": "b"}])
+
+        assert list(result["pool"]) == ["x", None]
+
+    def test_empty(self):
+        result = ColumnarResult.from_rows([], names=["name"])
+
+        assert result.num_rows == 0
+        assert list(result["name"]) == []
+
+    def test_none_in_typed_column_becomes_list(self):
+        result = ColumnarResult(["tkmodel"], types={"tkmodel": "int"})
+        result.append((1,))
+        result.append((None,))
+
+        assert result["tkmodel"] == [1, None]
+
+    def test_only_the_failing_column_becomes_list(self):
+        # equal columns must not be mistaken for one another
+        result = ColumnarResult(["a", "b"], types={"a": "int", "b": "int"})
+        result.append((1, 1))
+        result.append((2, None))
+
+        assert result["a"] == array("q", [1, 2])
+        assert result["b"] == [1, None]
+
+    def test_non_string_in_dictionary_column_becomes_list(self):
+        result = ColumnarResult(["name"])
+        result.append(("a",))
+        result.append(({"_value_1": "b"},))
+
+        assert result["name"] == ["a", {"_value_1": "b"}]
+
+    def test_high_cardinality_falls_back(self):
+        result = ColumnarResult(["name", "pool"])
+        for i in range(MIN_DICTIONARY_VALUES * 2):
+            result.append((f"SEP{i}", "Default"))
+
+        assert isinstance(result["name"], list)
+        assert isinstance(result["pool"], DictionaryColumn)
+        assert result["name"][-1] == f"SEP{MIN_DICTIONARY_VALUES * 2 - 1}"
+
+    def test_dictionary_choice(self):
+        named = ColumnarResult(["name", "pool"], dictionary=["name"])
+        for i in range(MIN_DICTIONARY_VALUES * 2):
+            named.append((f"SEP{i}", "Default"))
+
+        assert isinstance(named["name"], DictionaryColumn)
+        assert isinstance(named["pool"], list)
+        assert isinstance(ColumnarResult(["pool"], dictionary=False)["pool"], list)
+
+    def test_to_numpy(self):
+        numpy = pytest.importorskip("numpy")
+        arrays = ColumnarResult.from_rows(ROWS, types=TYPES).to_numpy()
+
+        assert arrays["tkmodel"].dtype == numpy.int64
+        assert arrays["isactive"].tolist() == [True, False, True]
+        assert arrays["pool"].tolist() == ["Default", "Default", None]
+
+    def test_to_arrow(self):
+        pyarrow = pytest.importorskip("pyarrow")
+        table = ColumnarResult.from_rows(ROWS, types=TYPES).to_arrow()
+
+        assert pyarrow.types.is_dictionary(table.schema.field("pool").type)
+        assert table.column("pool").to_pylist() == ["Default", "Default", None]
+        assert table.column("tkmodel").to_pylist() == [36, 36, 503]
+
+    def test_to_pandas(self):
+        pytest.importorskip("pandas")
+        frame = ColumnarResult.from_rows(ROWS, types=TYPES).to_pandas()
+
+        assert list(frame.columns) == ["name", "tkmodel", "isactive", "pool"]
+        assert str(frame["pool"].dtype) == "category"
+        assert frame["pool"].isna().tolist() == [False, False, True]
@@ -0,0 +1,298 @@
+import random
+import threading
+import time
+
+import pytest
+from zeep.exceptions import Fault
+
+from ciscoaxl.paging import AdaptivePageSize, Paginator, PrefixPartitioner, suggested_rows
+
+TOO_LARGE = (
+    "Query request too large. Total rows matched: 5000 rows. "
+    "Suggestive Row Fetch: less than {} rows"
+)
+
+
+class ListOperation:
+    """Stands in for a zeep list* operation over a list of names"""
+
+    def __init__(self, names, max_rows=None, fail_at=None, jitter=0.0):
+        self.names = sorted(names)
+        self.max_rows = max_rows
+        self.fail_at = fail_at
+        self.jitter = jitter
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, searchCriteria, returnedTags, skip, first):
+        with self._lock:
+            self.calls.append((searchCriteria["name"], skip, first))
+        if self.jitter:
+            time.sleep(random.uniform(0, self.jitter))
+        if self.fail_at is not None and skip >= self.fail_at:
+            raise Fault("Item not valid")
+        prefix = searchCriteria["name"].rstrip("%")
+        if searchCriteria["name"].endswith("%"):
+            matching = [n for n in self.names if n.startswith(prefix)]
+        else:
+            matching = [n for n in self.names if n == prefix]
+        if self.max_rows and min(skip + first, len(matching)) - skip > self.max_rows:
+            raise Fault(TOO_LARGE.format(self.max_rows + 1))
+        page = [{"name": n} for n in matching[skip : skip + first]]
+        return {"return": {"phone": page} if page else None}
+
+
+def names(count):
+    return [f"SEP{i:04X}" for i in range(count)]
+
+
+def listed(records):
+    return [record["name"] for record in records]
+
+
+class TestPaginator:
+    def test_short_page_ends_listing(self):
+        operation = ListOperation(names(25))
+        records = list(Paginator(operation, "phone", {"name": "%"}, {"name": ""}, 10))
+
+        assert listed(records) == names(25)
+        assert [(skip, first) for _, skip, first in operation.calls] == [
+            (0, 10),
+            (10, 10),
+            (20, 10),
+        ]
+
+    def test_full_last_page_ends_at_empty_page(self):
+        operation = ListOperation(names(20))
+        records = list(Paginator(operation, "phone", {"name": "%"}, {"name": ""}, 10))
+
+        assert listed(records) == names(20)
+        assert [skip for _, skip, _ in operation.calls] == [0, 10, 20]
+
+    def test_empty_result(self):
+        operation = ListOperation([])
+
+        assert list(Paginator(operation, "phone", {"name": "%"}, {"name": ""}, 10)) == []
+        assert len(operation.calls) == 1
+
+    def test_workers_yield_pages_in_order(self):
+        operation = ListOperation(names(101), jitter=0.005)
+        paginator = Paginator(operation, "phone", {"name": "%"}, {"name": ""}, 7, workers=4)
+
+        assert listed(paginator) == names(101)
+
+    def test_total_stops_at_the_end(self):
+        operation = ListOperation(names(30))
+        paginator = Paginator(
+            operation, "phone", {"name": "%"}, {"name": ""}, 10, workers=4, total=30
+        )
+
+        assert listed(paginator) == names(30)
+        assert max(skip for _, skip, _ in operation.calls) < 30
+
+    def test_prefetch_yields_pages_in_order(self):
+        operation = ListOperation(names(55), jitter=0.002)
+        paginator = Paginator(
+            operation, "phone", {"name": "%"}, {"name": ""}, 5, workers=2, prefetch=3
+        )
+
+        assert listed(paginator) == names(55)
+
+    def test_prefetch_raises_faults(self):
+        operation = ListOperation(names(50), fail_at=20)
+        paginator = Paginator(operation, "phone", {"name": "%"}, {"name": ""}, 10, prefetch=2)
+
+        with pytest.raises(Fault):
+            list(paginator)
+
+    def test_adaptive_retries_refused_pages_smaller(self):
+        operation = ListOperation(names(40), max_rows=6)
+        paginator = Paginator(
+            operation,
+            "phone",
+            {"name": "%"},
+            {"name": ""},
+            10,
+            adaptive=AdaptivePageSize(min_page_size=1, max_page_size=10),
+        )
+
+        assert listed(paginator) == names(40)
+        assert paginator.stats.faults == 1
+        assert paginator.stats.largest_page_size <= 6
+        assert paginator.stats.records == 40
+
+    def test_fault_without_adaptive_is_raised(self):
+        operation = ListOperation(names(40), max_rows=6)
+
+        with pytest.raises(Fault):
+            list(Paginator(operation, "phone", {"name": "%"}, {"name": ""}, 10))
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            Paginator(ListOperation([]), "phone", {}, {}, 0)
+        with pytest.raises(ValueError):
+            Paginator(ListOperation([]), "phone", {}, {}, 10, workers=0)
+        with pytest.raises(ValueError):
+            Paginator(ListOperation([]), "phone", {}, {}, 10, prefetch=-1)
+
+
+class TestAdaptivePageSize:
+    def test_grows_at_most_double(self):
+        policy = AdaptivePageSize(min_page_size=10, max_page_size=5000)
+
+        assert policy.after_page(100, 100, 1000, 0.01) == (200, "latency")
+
+    def test_shrinks_at_most_half_for_large_responses(self):
+        policy = AdaptivePageSize(target_bytes=1000)
+
+        assert policy.after_page(1000, 1000, 8000, 0.1) == (500, "bytes")
+        assert policy.after_page(1000, 1000, 1600, 0.1) == (625, "bytes")
+
+    def test_slow_pages_shrink(self):
+        policy = AdaptivePageSize(target_seconds=1.0)
+
+        assert policy.after_page(1000, 1000, None, 1.25) == (800, "latency")
+
+    def test_short_page_doesnt_grow(self):
+        policy = AdaptivePageSize()
+
+        assert policy.after_page(100, 10, 100, 0.01) == (100, "latency")
+
+    def test_empty_page_and_no_data(self):
+        policy = AdaptivePageSize()
+
+        assert policy.after_page(100, 0, None, 0.5) == (100, "empty")
+        assert policy.after_page(100, 100, None, 0.0) == (100, "no data")
+
+    def test_ceiling_and_bounds(self):
+        policy = AdaptivePageSize(min_page_size=50, max_page_size=300)
+
+        assert policy.after_page(200, 200, 10, 0.001) == (300, "latency")
+        assert policy.after_page(200, 200, 10, 0.001, ceiling=250) == (250, "latency")
+        assert policy.after_page(60, 60, 10 ** 9, 100.0)[0] == 50
+
+    def test_after_fault(self):
+        policy = AdaptivePageSize(min_page_size=10)
+
+        assert policy.after_fault(1000, Fault(TOO_LARGE.format(300))) == (299, "fault: too large")
+        assert policy.after_fault(1000, Fault("Maximum AXL Memory Allocation Consumed")) == (
+            500,
+            "fault: throttled",
+        )
+        assert policy.after_fault(1000, Fault("Item not valid")) is None
+        assert policy.after_fault(10, Fault(TOO_LARGE.format(5))) is None
+
+    def test_invalid_bounds(self):
+        with pytest.raises(ValueError):
+            AdaptivePageSize(min_page_size=0)
+        with pytest.raises(ValueError):
+            AdaptivePageSize(min_page_size=100, max_page_size=10)
+
+
+class TestSuggestedRows:
+    def test_too_large(self):
+        assert suggested_rows(Fault(TOO_LARGE.format(3841))) == 3840
+
+    def test_other_faults(self):
+        assert suggested_rows(Fault("Item not valid")) is None
+        assert suggested_rows(Fault(None)) is None
+
+
+class TestPrefixPartitioner:
+    def test_lists_every_record_in_order(self):
+        inventory = names(300) + ["SEP"]
+        operation = ListOperation(inventory)
+        partitioner = PrefixPartitioner(
+            operation, "phone", {"name": "SEP%"}, {"name": ""}, partition_size=40, page_size=15
+        )
+
+        assert listed(partitioner) == sorted(inventory)
+        assert partitioner.splits > 0
+        # pages within a partition never go deeper than the partition
+        assert all(skip <= 40 for _, skip, first in operation.calls if first != 1)
+
+    def test_workers_keep_partition_order(self):
+        inventory = names(500)
+        operation = ListOperation(inventory, jitter=0.002)
+        partitioner = PrefixPartitioner(
+            operation,
+            "phone",
+            {"name": "SEP%"},
+            {"name": ""},
+            partition_size=30,
+            page_size=10,
+            workers=4,
+        )
+
+        assert listed(partitioner) == inventory
+
+    def test_small_listing_isnt_split(self):
+        operation = ListOperation(names(20))
+        partitioner = PrefixPartitioner(
+            operation, "phone", {"name": "SEP%"}, {"name": ""}, partition_size=50
+        )
+
+        assert listed(partitioner) == names(20)
+        assert partitioner.splits == 0
+        assert partitioner.partitions == 1
+
+    def test_keys_outside_alphabet_raise(self):
+        inventory = names(100) + ["SEPZ001"]
+        partitioner = PrefixPartitioner(
+            ListOperation(inventory), "phone", {"name": "SEP%"}, {"name": ""}, partition_size=20
+        )
+
+        with pytest.raises(ValueError, match="SEPZ001"):
+            list(partitioner)
+
+    def test_one_deep_check_without_count(self):
+        operation = ListOperation(names(300))
+        partitioner = PrefixPartitioner(
+            operation, "phone", {"name": "SEP%"}, {"name": ""}, partition_size=40, page_size=15
+        )
+
+        assert listed(partitioner) == names(300)
+        assert [(skip, first) for _, skip, first in operation.calls if skip > 40] == [(300, 1)]
+
+    def test_count_checks_without_deep_skips(self):
+        inventory = names(300)
+        operation = ListOperation(inventory)
+        counted = []
+
+        def count(prefix):
+            counted.append(prefix)
+            return sum(name.startswith(prefix) for name in inventory)
+
+        partitioner = PrefixPartitioner(
+            operation, "phone", {"name": "SEP%"}, {"name": ""}, partition_size=40, page_size=15,
+            count=count,
+        )
+
+        assert listed(partitioner) == inventory
+        assert max(skip for _, skip, _ in operation.calls) <= 40
+        assert len(counted) == partitioner.splits
+
+    def test_count_finds_keys_outside_alphabet(self):
+        inventory = names(100) + ["SEPZ001"]
+        partitioner = PrefixPartitioner(
+            ListOperation(inventory), "phone", {"name": "SEP%"}, {"name": ""}, partition_size=20,
+            count=lambda prefix: sum(name.startswith(prefix) for name in inventory),
+        )
+
+        with pytest.raises(ValueError, match="'SEP%'.*outside alphabet"):
+            list(partitioner)
+
+    def test_response_sizes_are_recorded(self):
+        partitioner = PrefixPartitioner(
+            ListOperation(names(100)), "phone", {"name": "SEP%"}, {"name": ""},
+            partition_size=20, response_size=lambda: 1000,
+        )
+        list(partitioner)
+
+        assert partitioner.stats.bytes == 1000 * partitioner.stats.requests
+
+    def test_needs_a_prefix_search(self):
+        with pytest.raises(ValueError):
+            PrefixPartitioner(ListOperation([]), "phone", {"name": "SEP"}, {"name": ""})
+        with pytest.raises(ValueError):
+            PrefixPartitioner(ListOperation([]), "phone", {"name": "S%P%"}, {"name": ""})
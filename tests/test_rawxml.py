@@ -0,0 +1,65 @@
+import io
+
+from ciscoaxl.rawxml import iter_records, parse_records
+
+RESPONSE = b"""<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">
+<soapenv:Body><ns:listPhoneResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5">
+<return>
+  <phone uuid="{11111111-0000-0000-0000-000000000001}">
+    <name>SEP001122334455</name>
+    <description></description>
+    <locationName uuid="{22222222-0000-0000-0000-000000000002}">Hub_None</locationName>
+    <lines>
+      <line><index>1</index><dirn><pattern>1000</pattern></dirn></line>
+      <line><index>2</index><dirn><pattern>1001</pattern></dirn></line>
+    </lines>
+  </phone>
+  <phone uuid="{11111111-0000-0000-0000-000000000002}">
+    <name>SEP00AABBCCDDEE</name>
+    <lines><line><index>1</index><dirn><pattern>2000</pattern></dirn></line></lines>
+  </phone>
+</return>
+</ns:listPhoneResponse></soapenv:Body></soapenv:Envelope>"""
+
+
+class TestIterRecords:
+    def test_dicts(self):
+        first, second = iter_records(io.BytesIO(RESPONSE), "phone")
+
+        assert first["name"] == "SEP001122334455"
+        assert first["description"] is None
+        # references are their text, without zeep's _value_1
+        assert first["locationName"] == "Hub_None"
+        assert first["uuid"] == "{11111111-0000-0000-0000-000000000001}"
+        # repeated children become a list, a single one stays a dict
+        assert [line["dirn"]["pattern"] for line in first["lines"]["line"]] == ["1000", "1001"]
+        assert second["lines"]["line"]["dirn"]["pattern"] == "2000"
+
+    def test_tuples_in_field_order(self):
+        records = list(
+            iter_records(io.BytesIO(RESPONSE), "phone", ["uuid", "name", "locationName", "product"])
+        )
+
+        assert records == [
+            (
+                "{11111111-0000-0000-0000-000000000001}",
+                "SEP001122334455",
+                "Hub_None",
+                None,
+            ),
+            ("{11111111-0000-0000-0000-000000000002}", "SEP00AABBCCDDEE", None, None),
+        ]
+
+    def test_no_records(self):
+        empty = (
+            b"<Envelope><Body><listPhoneResponse><return/>"
+            b"</listPhoneResponse></Body></Envelope>"
+        )
+
+        assert parse_records(empty, "phone") == []
+
+    def test_parse_records(self):
+        assert [r["name"] for r in parse_records(RESPONSE, "phone")] == [
+            "SEP001122334455",
+            "SEP00AABBCCDDEE",
+        ]
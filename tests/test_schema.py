@@ -0,0 +1,133 @@
+import os
+import sys
+
+import pytest
+from zeep.transports import Transport
+
+from ciscoaxl import axl, schema
+from ciscoaxl.schema import (
+    CACHE_FILE_NAME,
+    build_cache,
+    cache_path,
+    clear_shared_documents,
+    default_settings,
+    get_shared_document,
+    load_document,
+    make_private_dirs,
+    user_cache_dir,
+)
+from ciscoaxl.subset import subset_dir
+
+OPERATIONS = ["getPhone"]
+
+posix_only = pytest.mark.skipif(not hasattr(os, "geteuid"), reason="no file owners to check")
+
+
+def load(cache_dir, operations=OPERATIONS):
+    return load_document(
+        "12.5", default_settings(), Transport(), cache_dir=cache_dir, operations=operations
+    )
+
+
+def not_parsed(*args, **kwargs):
+    raise AssertionError("the schema was parsed instead of read from the cache")
+
+
+class TestCacheLocation:
+    def test_user_cache_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        if sys.platform.startswith("linux"):
+            assert user_cache_dir() == tmp_path / "ciscoaxl"
+        assert cache_path("12.5") == user_cache_dir() / "12.5" / CACHE_FILE_NAME
+        assert subset_dir("12.5", OPERATIONS).parent.parent == user_cache_dir() / "12.5"
+
+    def test_explicit_dir(self, tmp_path):
+        assert cache_path("12.5", tmp_path) == tmp_path / "12.5" / CACHE_FILE_NAME
+
+    def test_private_dirs(self, tmp_path):
+        make_private_dirs(tmp_path / "a" / "b")
+
+        assert (tmp_path / "a" / "b").is_dir()
+        if hasattr(os, "geteuid"):
+            assert (tmp_path / "a").stat().st_mode & 0o777 == 0o700
+
+
+class TestDocumentCache:
+    def test_round_trip(self, tmp_path, monkeypatch):
+        document = load(tmp_path)
+        artifact = subset_dir("12.5", OPERATIONS, tmp_path) / CACHE_FILE_NAME
+        assert artifact.exists()
+
+        monkeypatch.setattr(schema, "Document", not_parsed)
+        cached = load(tmp_path)
+
+        assert cached is not document
+        binding = next(iter(cached.bindings.values()))
+        assert list(binding.all()) == ["getPhone"]
+
+    def test_stale_artifact_is_rebuilt(self, tmp_path):
+        load(tmp_path)
+        artifact = subset_dir("12.5", OPERATIONS, tmp_path) / CACHE_FILE_NAME
+        data = artifact.read_bytes().split(b"\n", 2)
+        artifact.write_bytes(b"\n".join([data[0], b"stale", data[2]]))
+
+        load(tmp_path)
+
+        assert artifact.read_bytes().split(b"\n", 2)[1] == data[1]
+
+    @posix_only
+    def test_writable_artifact_is_not_unpickled(self, tmp_path, monkeypatch):
+        load(tmp_path)
+        artifact = subset_dir("12.5", OPERATIONS, tmp_path) / CACHE_FILE_NAME
+        assert artifact.stat().st_mode & 0o777 == 0o644
+        os.chmod(artifact, 0o664)
+
+        monkeypatch.setattr(schema, "Document", not_parsed)
+        with pytest.raises(AssertionError, match="parsed"):
+            load(tmp_path)
+
+    def test_prebuilt_artifact_is_read(self, tmp_path, monkeypatch):
+        prebuilt = build_cache("12.5", tmp_path / "bundled")
+        monkeypatch.setattr(schema, "bundled_cache_path", lambda version: prebuilt)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "user"))
+        monkeypatch.setattr(schema, "Document", not_parsed)
+
+        assert "listPhone" in next(iter(load(None, None).bindings.values())).all()
+        assert not (tmp_path / "user").exists()
+
+
+class TestSharedDocument:
+    @pytest.fixture(autouse=True)
+    def registry(self):
+        clear_shared_documents()
+        yield
+        clear_shared_documents()
+
+    def test_one_document_per_schema(self, schema_cache):
+        document = get_shared_document("12.5", cache_dir=schema_cache, operations=OPERATIONS)
+
+        assert get_shared_document(
+            "12.5", cache_dir=schema_cache, operations=OPERATIONS * 2
+        ) is document
+        assert get_shared_document(
+            "12.5", cache_dir=schema_cache, operations=["getPhone", "listPhone"]
+        ) is not document
+
+    def test_clear(self, schema_cache):
+        document = get_shared_document("12.5", cache_dir=schema_cache, operations=OPERATIONS)
+        clear_shared_documents()
+
+        assert get_shared_document(
+            "12.5", cache_dir=schema_cache, operations=OPERATIONS
+        ) is not document
+
+    def test_clients_share_it(self, schema_cache):
+        options = dict(lazy=True, schema_cache=schema_cache, operations=OPERATIONS)
+        first = axl("u", "p", "127.0.0.1", "12.5", **options)
+        second = axl("u", "p", "127.0.0.2", "12.5", **options)
+        private = axl("u", "p", "127.0.0.1", "12.5", shared_schema=False, **options)
+        settings = default_settings()
+
+        document = first._load_document(settings)
+        assert second._load_document(settings) is document
+        assert private._load_document(settings) is not document
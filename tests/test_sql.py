@@ -0,0 +1,181 @@
+import io
+import uuid
+
+import pytest
+from zeep.exceptions import Fault
+
+from ciscoaxl import axl
+from ciscoaxl.sql import SQLChunks, chunk_query, converters, has_order_by, iter_sql_rows, row_class
+from mock_axl import DeviceTable, MockAXLServer
+
+RESPONSE = b"""<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">
+<soapenv:Body><ns:executeSQLQueryResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5">
+<return>
+<row><pkid>1d7a2e8e-0f4b-4c39-9b9e-5ab2e3c1f001</pkid><name>SEP001</name><tkmodel>36</tkmodel><isactive>t</isactive></row>
+<row><pkid>1d7a2e8e-0f4b-4c39-9b9e-5ab2e3c1f002</pkid><name>SEP002</name><tkmodel></tkmodel><isactive>f</isactive></row>
+</return>
+</ns:executeSQLQueryResponse></soapenv:Body></soapenv:Envelope>"""
+
+
+class TestChunkQuery:
+    def test_rewrites_select(self):
+        assert (
+            chunk_query("select name from device order by pkid", 1000, 500)
+            == "select skip 1000 first 500 name from device order by pkid"
+        )
+        assert chunk_query("  SELECT * FROM device ORDER BY name", 0, 10).startswith(
+            "select skip 0 first 10 *"
+        )
+
+    def test_refuses_what_cant_be_chunked(self):
+        with pytest.raises(ValueError, match="SELECT"):
+            chunk_query("update device set name='x'", 0, 10)
+        with pytest.raises(ValueError, match="already"):
+            chunk_query("select first 5 name from device order by pkid", 0, 10)
+        with pytest.raises(ValueError, match="UNION"):
+            chunk_query("select name from device union select name from enduser order by 1", 0, 10)
+        with pytest.raises(ValueError, match="ORDER BY"):
+            chunk_query("select name from device", 0, 10)
+
+    def test_order_by_only_counts_at_top_level(self):
+        assert has_order_by("select name from device order by pkid")
+        assert has_order_by("select name from (select name from device) d order by name")
+        assert not has_order_by(
+            "select name from (select first 1 name from device order by name) d"
+        )
+        assert not has_order_by("select name from device where description = 'order by x'")
+        assert not has_order_by("select name from device")
+
+
+class TestSQLChunks:
+    def test_runs_chunks(self):
+        queries = []
+
+        def execute(query):
+            queries.append(query)
+            return [] if "skip 4" in query else [("a",), ("b",)]
+
+        chunks = SQLChunks(execute, "select name from device order by pkid")
+
+        assert chunks(0, 2) == {"return": {"row": [("a",), ("b",)]}}
+        assert chunks(4, 2) == {"return": None}
+        assert queries[0] == "select skip 0 first 2 name from device order by pkid"
+
+    def test_refuses_unordered_query(self):
+        with pytest.raises(ValueError):
+            SQLChunks(lambda query: [], "select name from device")
+
+
+class TestSQLRows:
+    def test_rows_share_one_class(self):
+        rows = list(iter_sql_rows(io.BytesIO(RESPONSE)))
+
+        assert [row.name for row in rows] == ["SEP001", "SEP002"]
+        assert rows[0]._fields == ("pkid", "name", "tkmodel", "isactive")
+        assert type(rows[0]) is type(rows[1])
+        assert rows[1].tkmodel is None
+
+    def test_types(self):
+        rows = list(
+            iter_sql_rows(
+                io.BytesIO(RESPONSE), {"pkid": "uuid", "tkmodel": "int", "isactive": "bool"}
+            )
+        )
+
+        assert rows[0].pkid == uuid.UUID("1d7a2e8e-0f4b-4c39-9b9e-5ab2e3c1f001")
+        assert rows[0].tkmodel == 36
+        assert rows[0].isactive is True
+        assert rows[1].tkmodel is None
+        assert rows[1].isactive is False
+
+    def test_function_types(self):
+        rows = list(iter_sql_rows(io.BytesIO(RESPONSE), {"name": str.lower}))
+
+        assert rows[0].name == "sep001"
+
+    def test_unknown_type_column(self):
+        with pytest.raises(ValueError, match="nope"):
+            converters(("pkid", "name"), {"nope": "int"})
+
+    def test_row_class_is_cached(self):
+        assert row_class(("a", "b")) is row_class(("a", "b"))
+        assert row_class(("a", "1b"))._fields == ("a", "_1")
+
+
+@pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+class TestSQLQuery:
+    """iter_sql_query against the stand-in server"""
+
+    query = "select pkid, name, tkmodel, isactive from device order by pkid"
+
+    @pytest.fixture
+    def ucm(self, monkeypatch, schema_cache):
+        # a CA bundle from the environment would override the unverified fallback session
+        monkeypatch.delenv("REQUESTS_CA_BUNDLE", raising=False)
+        monkeypatch.delenv("CURL_CA_BUNDLE", raising=False)
+        with MockAXLServer(responder=DeviceTable(250)) as server:
+            yield axl(
+                "u", "p", "127.0.0.1", "12.5", cucm_port=server.port,
+                operations=["executeSQLQuery"], schema_cache=schema_cache,
+            )
+
+    def test_rows(self, ucm):
+        rows = list(ucm.iter_sql_query(self.query, types={"tkmodel": "int", "isactive": "bool"}))
+
+        assert [row.name for row in rows] == [f"SEP{i:012X}" for i in range(250)]
+        assert rows[1].tkmodel == 36214
+        assert rows[0].isactive is False and rows[1].isactive is True
+
+
+@pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+class TestChunkedQuery:
+    """iter_sql_query against the stand-in server, which refuses more than 100 rows at once"""
+
+    query = "select pkid, name from device order by pkid"
+
+    @pytest.fixture
+    def ucm(self, monkeypatch, schema_cache):
+        # a CA bundle from the environment would override the unverified fallback session
+        monkeypatch.delenv("REQUESTS_CA_BUNDLE", raising=False)
+        monkeypatch.delenv("CURL_CA_BUNDLE", raising=False)
+        with MockAXLServer(responder=DeviceTable(250, max_rows=100)) as server:
+            yield axl(
+                "u", "p", "127.0.0.1", "12.5", cucm_port=server.port,
+                operations=["executeSQLQuery"], schema_cache=schema_cache,
+            )
+
+    def test_too_large_result_is_chunked(self, ucm):
+        rows = list(ucm.iter_sql_query(self.query))
+
+        assert [row.name for row in rows] == [f"SEP{i:012X}" for i in range(250)]
+        assert ucm.last_paging_stats.records == 250
+        assert ucm.last_paging_stats.largest_page_size == 100
+
+    def test_chunk_size(self, ucm):
+        rows = list(ucm.iter_sql_query(self.query, chunk_size=40, workers=3))
+
+        assert len(rows) == 250
+        assert ucm.last_paging_stats.largest_page_size == 40
+
+    def test_unordered_query_raises_the_fault(self, ucm):
+        with pytest.raises(Fault, match="too large"):
+            list(ucm.iter_sql_query("select pkid, name from device"))
+        with pytest.raises(ValueError, match="ORDER BY"):
+            list(ucm.iter_sql_query("select pkid, name from device", chunk_size=50))
+
+    def test_run_sql_query_is_chunked(self, ucm):
+        result = ucm.run_sql_query(self.query)
+
+        assert result["num_rows"] == 250
+        assert [row["name"] for row in result["rows"]] == [f"SEP{i:012X}" for i in range(250)]
+        assert ucm.last_paging_stats.largest_page_size == 100
+
+    def test_sql_query_is_chunked(self, ucm):
+        rows = ucm.sql_query(self.query)["row"]
+
+        assert [row[1].text for row in rows] == [f"SEP{i:012X}" for i in range(250)]
+
+    def test_unordered_run_sql_query_keeps_the_fault(self, ucm):
+        assert ucm.run_sql_query("select pkid, name from device")["num_rows"] == 0
+        assert "too large" in str(ucm.last_exception)
+        assert "too large" in str(ucm.sql_query("select pkid, name from device"))
@@ -0,0 +1,107 @@
+import pytest
+from lxml import etree
+
+from ciscoaxl.exceptions import WSDLException
+from ciscoaxl.subset import prune_wsdl, prune_xsd
+
+WSDL = b"""<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:s0="http://www.cisco.com/AXLAPIService/" xmlns:xsd1="http://www.cisco.com/AXL/API/12.5"
+    targetNamespace="http://www.cisco.com/AXLAPIService/">
+  <message name="getPhoneIn"><part element="xsd1:getPhone" name="axlParams"/></message>
+  <message name="getPhoneOut"><part element="xsd1:getPhoneResponse" name="axlReturn"/></message>
+  <message name="listLineIn"><part element="xsd1:listLine" name="axlParams"/></message>
+  <message name="listLineOut"><part element="xsd1:listLineResponse" name="axlReturn"/></message>
+  <portType name="AXLPort">
+    <operation name="getPhone">
+      <input message="s0:getPhoneIn"/><output message="s0:getPhoneOut"/>
+    </operation>
+    <operation name="listLine">
+      <input message="s0:listLineIn"/><output message="s0:listLineOut"/>
+    </operation>
+  </portType>
+  <binding name="AXLAPIBinding" type="s0:AXLPort">
+    <operation name="getPhone"/>
+    <operation name="listLine"/>
+  </binding>
+</definitions>"""
+
+XSD = b"""<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+    xmlns:axlapi="http://www.cisco.com/AXL/API/12.5"
+    targetNamespace="http://www.cisco.com/AXL/API/12.5">
+  <xsd:annotation><xsd:documentation>AXL</xsd:documentation></xsd:annotation>
+  <xsd:element name="getPhone" type="axlapi:GetPhoneReq"/>
+  <xsd:element name="getPhoneResponse" type="axlapi:GetPhoneRes"/>
+  <xsd:element name="listLine" type="axlapi:ListLineReq"/>
+  <xsd:complexType name="GetPhoneReq">
+    <xsd:sequence><xsd:element name="name" type="axlapi:String50"/></xsd:sequence>
+  </xsd:complexType>
+  <xsd:complexType name="GetPhoneRes">
+    <xsd:complexContent>
+      <xsd:extension base="axlapi:APIResponse">
+        <xsd:sequence><xsd:element ref="axlapi:phone"/></xsd:sequence>
+      </xsd:extension>
+    </xsd:complexContent>
+  </xsd:complexType>
+  <xsd:element name="phone" type="axlapi:RPhone"/>
+  <xsd:complexType name="RPhone">
+    <xsd:sequence><xsd:element name="protocol" type="axlapi:Protocol"/></xsd:sequence>
+  </xsd:complexType>
+  <xsd:simpleType name="Protocol">
+    <xsd:union memberTypes="axlapi:String50 axlapi:XProtocol"/>
+  </xsd:simpleType>
+  <xsd:simpleType name="XProtocol"><xsd:restriction base="xsd:string"/></xsd:simpleType>
+  <xsd:simpleType name="String50"><xsd:restriction base="xsd:string"/></xsd:simpleType>
+  <xsd:complexType name="APIResponse"/>
+  <xsd:complexType name="ListLineReq"/>
+  <xsd:complexType name="Unused"/>
+</xsd:schema>"""
+
+
+def names(root, tag):
+    return {node.get("name") for node in root.iter(tag)}
+
+
+class TestPruneWSDL:
+    def test_keeps_only_wanted_operations(self):
+        root = etree.fromstring(WSDL)
+
+        assert prune_wsdl(root, ["getPhone"]) == ["getPhone", "getPhoneResponse"]
+        assert names(root, "{http://schemas.xmlsoap.org/wsdl/}operation") == {"getPhone"}
+        assert names(root, "{http://schemas.xmlsoap.org/wsdl/}message") == {
+            "getPhoneIn",
+            "getPhoneOut",
+        }
+
+    def test_unknown_operation(self):
+        with pytest.raises(WSDLException, match="getNothing"):
+            prune_wsdl(etree.fromstring(WSDL), ["getPhone", "getNothing"])
+
+
+class TestPruneXSD:
+    def test_keeps_what_the_elements_reach(self):
+        root = etree.fromstring(XSD)
+
+        counts = prune_xsd(root, ["getPhone", "getPhoneResponse"])
+
+        assert {child.get("name") for child in root} == {
+            "getPhone",
+            "getPhoneResponse",
+            "GetPhoneReq",
+            "GetPhoneRes",
+            "APIResponse",
+            "phone",
+            "RPhone",
+            "Protocol",
+            "XProtocol",
+            "String50",
+        }
+        # listLine, ListLineReq, Unused and the annotation
+        assert counts == {"kept": 10, "removed": 4}
+
+    def test_wsdl_and_xsd_together(self):
+        wsdl = etree.fromstring(WSDL)
+        xsd = etree.fromstring(XSD)
+
+        prune_xsd(xsd, prune_wsdl(wsdl, ["listLine"]))
+
+        assert {child.get("name") for child in xsd} == {"listLine", "ListLineReq"}
@@ -0,0 +1,432 @@
+import itertools
+import pickle
+import socket
+import threading
+import time
+
+import pytest
+import requests
+from zeep.cache import InMemoryCache, SqliteCache
+
+from ciscoaxl import axl
+from ciscoaxl.transport import (
+    AXLAdapter,
+    AXLTransport,
+    NodePool,
+    RateLimiter,
+    SessionCookieAuth,
+    ThrottleController,
+    TokenBucket,
+    build_session,
+    classify_operation,
+    make_cache,
+    operation_name,
+)
+from mock_axl import MockAXLServer, default_responder
+
+# the stand-in server's certificate is self-signed
+pytestmark = pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+
+
+class Response:
+    """Just enough of a requests Response for ThrottleController"""
+
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def session(auth, **options):
+    result = build_session(auth, verify=False, **options)
+    # a CA bundle from the environment would override verify=False
+    result.trust_env = False
+    return result
+
+
+class TestMakeCache:
+    def test_backends(self, tmp_path):
+        assert make_cache(None) is None
+        assert isinstance(make_cache("memory"), InMemoryCache)
+        path = str(tmp_path / "zeep.db")
+        cache = make_cache(path)
+        assert isinstance(cache, SqliteCache)
+        assert cache._db_path == path
+
+    def test_instances_are_used_as_is(self):
+        cache = InMemoryCache()
+
+        assert make_cache(cache) is cache
+
+    def test_unsupported(self):
+        with pytest.raises(ValueError, match="Unsupported"):
+            make_cache(5)
+
+    def test_round_trip(self, tmp_path):
+        cache = make_cache(str(tmp_path / "zeep.db"))
+        cache.add("https://example.com/AXLAPI.wsdl", b"<definitions/>")
+
+        assert cache.get("https://example.com/AXLAPI.wsdl") == b"<definitions/>"
+
+    def test_axl_option(self):
+        assert axl("u", "p", "127.0.0.1", "12.5", lazy=True).transport_cache is None
+        assert isinstance(
+            axl("u", "p", "127.0.0.1", "12.5", lazy=True, transport_cache="memory").transport_cache,
+            InMemoryCache,
+        )
+
+
+class TestAXLAdapter:
+    def test_pool_options(self):
+        adapter = AXLAdapter(pool_maxsize=5, pool_block=True)
+        options = adapter.poolmanager.connection_pool_kw
+
+        assert options["maxsize"] == 5
+        assert options["block"] is True
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options["socket_options"]
+        assert "ssl_context" in options
+
+    def test_plain_options(self):
+        adapter = AXLAdapter(keep_alive=False, tls_session_reuse=False)
+        options = adapter.poolmanager.connection_pool_kw
+
+        assert "socket_options" not in options
+        assert "ssl_context" not in options
+
+    def test_pickles_with_its_options(self):
+        adapter = pickle.loads(pickle.dumps(AXLAdapter(pool_maxsize=5, keep_alive=False)))
+
+        assert adapter.keep_alive is False
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 5
+
+    @pytest.mark.parametrize("reuse", [True, False])
+    def test_reconnects_resume_the_tls_session(self, reuse):
+        with MockAXLServer() as server:
+            url = f"https://127.0.0.1:{server.port}/axl/"
+            axl_session = session(("u", "p"), tls_session_reuse=reuse)
+            for _ in range(3):
+                axl_session.get(url).content
+                axl_session.get_adapter(url).poolmanager.clear()
+
+            assert server.stats["handshakes"] == 3
+            assert server.stats["resumed"] == (2 if reuse else 0)
+
+    def test_sessions_are_kept_per_server(self):
+        with MockAXLServer() as first, MockAXLServer() as second:
+            axl_session = session(("u", "p"))
+            for _ in range(2):
+                for server in (first, second):
+                    url = f"https://127.0.0.1:{server.port}/axl/"
+                    axl_session.get(url).content
+                    axl_session.get_adapter(url).poolmanager.clear()
+
+            assert first.stats["resumed"] == 1
+            assert second.stats["resumed"] == 1
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=10, burst=2)
+
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        # callers over budget queue up a token's worth apart
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+        assert bucket.available() < 0
+
+    def test_default_burst(self):
+        assert TokenBucket(rate=5).burst == 5
+        assert TokenBucket(rate=0.5).burst == 1
+
+    def test_acquire_waits(self):
+        bucket = TokenBucket(rate=50, burst=1)
+        bucket.acquire()
+
+        assert bucket.acquire() == pytest.approx(0.02, abs=0.01)
+        assert bucket.waited == pytest.approx(0.02, abs=0.01)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimiter:
+    def test_classes(self):
+        assert classify_operation("listPhone") == "read"
+        assert classify_operation("getPhone") == "read"
+        assert classify_operation("executeSQLQuery") == "sql"
+        assert classify_operation("updatePhone") == "write"
+        assert operation_name({"SOAPAction": '"CUCM:DB ver=12.5 listPhone"'}) == "listPhone"
+        assert operation_name({}) == ""
+
+    def test_budgets_per_class(self):
+        limiter = RateLimiter({"write": (10, 1)})
+
+        assert limiter.reserve("listPhone") == 0.0
+        assert limiter.reserve("updatePhone") == 0.0
+        assert limiter.reserve("updatePhone") == pytest.approx(0.1, abs=0.01)
+        state = limiter.state()
+        assert state["read"]["requests"] == 1
+        assert state["write"]["requests"] == 2
+
+
+class TestThrottleController:
+    def test_throttle_halves_the_limit(self):
+        throttle = ThrottleController(max_concurrency=8)
+        ticket = throttle.acquire()
+        throttle.release(ticket, throttled=True)
+
+        assert throttle.concurrency == 4
+        assert throttle.state()["throttled"] == 1
+
+    def test_one_overload_halves_once(self):
+        throttle = ThrottleController(max_concurrency=8)
+        tickets = [throttle.acquire() for _ in range(3)]
+        for ticket in tickets:
+            throttle.release(ticket, throttled=True)
+
+        assert throttle.concurrency == 4
+
+    def test_successes_raise_the_limit_additively(self):
+        throttle = ThrottleController(max_concurrency=8, min_concurrency=2)
+        for _ in range(3):
+            throttle.release(throttle.acquire(), throttled=True)
+        assert throttle.concurrency == 2
+
+        # 2 + 1/2 + 1/2.5 + 1/2.9
+        for _ in range(3):
+            throttle.release(throttle.acquire(), throttled=False)
+        assert throttle.concurrency == 3
+        for _ in range(100):
+            throttle.release(throttle.acquire(), throttled=False)
+        assert throttle.concurrency == 8
+
+    def test_try_acquire_respects_limit_and_retry_after(self):
+        throttle = ThrottleController(max_concurrency=1)
+        ticket, wait = throttle.try_acquire()
+        assert ticket is not None and wait is None
+        assert throttle.try_acquire() == (None, None)
+
+        throttle.release(ticket, throttled=True, retry_after=30)
+        ticket, wait = throttle.try_acquire()
+        assert ticket is None
+        assert 29 < wait <= 30
+        assert throttle.state()["backoff"] > 29
+
+    def test_send_retries_throttled_requests(self):
+        responses = iter(
+            [Response(503), Response(500, b"Maximum AXL Memory Allocation Consumed"), Response()]
+        )
+        throttle = ThrottleController(backoff=0)
+
+        assert throttle.send(lambda: next(responses), "listPhone").status_code == 200
+        state = throttle.state()
+        assert (state["requests"], state["throttled"], state["retried"]) == (3, 2, 2)
+        assert state["in_flight"] == 0
+
+    def test_send_gives_up_after_retries(self):
+        throttle = ThrottleController(retries=2, backoff=0)
+
+        response = throttle.send(lambda: Response(429), "getPhone")
+        assert response.status_code == 429
+        assert throttle.state()["requests"] == 3
+
+    def test_writes_are_not_retried(self):
+        throttle = ThrottleController(backoff=0)
+
+        assert throttle.send(lambda: Response(503), "updatePhone").status_code == 503
+        state = throttle.state()
+        assert (state["requests"], state["throttled"], state["retried"]) == (1, 1, 0)
+        assert throttle.concurrency == 5
+
+        responses = iter([Response(503), Response()])
+        throttle = ThrottleController(backoff=0, retry_writes=True)
+        assert throttle.send(lambda: next(responses), "updatePhone").status_code == 200
+
+    def test_retries_for(self):
+        throttle = ThrottleController(retries=3)
+
+        assert throttle.retries_for("listPhone") == 3
+        assert throttle.retries_for("executeSQLQuery") == 3
+        assert throttle.retries_for("executeSQLUpdate") == 0
+        assert throttle.retries_for("addPhone") == 0
+
+    def test_send_releases_on_error(self):
+        throttle = ThrottleController()
+
+        def fail():
+            raise ConnectionError
+
+        with pytest.raises(ConnectionError):
+            throttle.send(fail)
+        assert throttle.state()["in_flight"] == 0
+
+    def test_is_throttled(self):
+        assert ThrottleController.is_throttled(Response(503))
+        assert ThrottleController.is_throttled(Response(500, b"AXL service is too busy"))
+        assert not ThrottleController.is_throttled(Response(500, b"Item not valid"))
+        assert not ThrottleController.is_throttled(Response(200, b"throttled"))
+
+    def test_invalid_bounds(self):
+        with pytest.raises(ValueError):
+            ThrottleController(max_concurrency=2, min_concurrency=3)
+
+
+class TestSessionCookieAuth:
+    def test_credentials_until_session(self):
+        auth = SessionCookieAuth("u", "p")
+        with MockAXLServer() as server:
+            http = session(auth)
+            url = f"https://127.0.0.1:{server.port}/axl/"
+            for _ in range(5):
+                assert http.get(url).status_code == 200
+
+            assert auth.round_trips == 1
+            assert server.stats["authentications"] == 1
+
+    def test_expired_session_is_renewed(self):
+        auth = SessionCookieAuth("u", "p")
+        with MockAXLServer() as server:
+            http = session(auth)
+            url = f"https://127.0.0.1:{server.port}/axl/"
+            http.get(url)
+            server.expire_sessions()
+
+            response = http.get(url)
+            assert response.status_code == 200
+            assert [r.status_code for r in response.history] == [401]
+            assert auth.round_trips == 2
+            # the new session is used from then on
+            assert http.get(url).status_code == 200
+            assert server.stats["authentications"] == 2
+
+    def test_without_session_reuse(self):
+        auth = SessionCookieAuth("u", "p", reuse_session=False)
+        with MockAXLServer() as server:
+            http = session(auth)
+            url = f"https://127.0.0.1:{server.port}/axl/"
+            for _ in range(3):
+                http.get(url)
+
+            assert auth.round_trips == 3
+            assert server.stats["authentications"] == 3
+
+
+class TestNodePool:
+    PUBLISHER = "https://pub/axl/"
+    SUBS = ["https://sub1/axl/", "https://sub2/axl/"]
+
+    def test_round_robin_reads(self):
+        pool = NodePool(self.PUBLISHER, self.SUBS)
+        urls = []
+
+        def request(url):
+            urls.append(url)
+            return Response()
+
+        for _ in range(4):
+            pool.send("listPhone", request)
+        pool.send("updatePhone", request)
+
+        assert urls == self.SUBS * 2 + [self.PUBLISHER]
+
+    def test_least_loaded(self):
+        pool = NodePool(self.PUBLISHER, self.SUBS, strategy="least_loaded")
+        pool.nodes[self.SUBS[0]].in_flight = 2
+
+        assert pool._read_order()[0].url == self.SUBS[1]
+
+    def test_failover(self):
+        pool = NodePool(self.PUBLISHER, self.SUBS, failure_threshold=1)
+
+        def request(url):
+            if url == self.SUBS[0]:
+                raise requests.ConnectionError
+            return Response(502) if url == self.SUBS[1] else Response()
+
+        # both read nodes fail, and are then out of rotation for reads
+        assert pool.send("getPhone", request).status_code == 502
+        assert pool.send("getPhone", request).status_code == 200
+        state = pool.state()
+        assert not state[self.SUBS[0]]["healthy"] and not state[self.SUBS[1]]["healthy"]
+        assert state[self.PUBLISHER]["requests"] == 1
+
+    def test_node_comes_back_after_cooldown(self):
+        pool = NodePool(self.PUBLISHER, self.SUBS[:1], failure_threshold=2, cooldown=0.05)
+
+        def fail(url):
+            raise requests.Timeout
+
+        for _ in range(2):
+            with pytest.raises(requests.Timeout):
+                pool.send("getPhone", fail)
+        assert pool._read_order()[0] is pool.publisher
+        time.sleep(0.06)
+        assert pool._read_order()[0].url == self.SUBS[0]
+
+    def test_invalid_strategy(self):
+        with pytest.raises(ValueError):
+            NodePool(self.PUBLISHER, self.SUBS, strategy="random")
+
+
+class TestAXLTransport:
+    def test_retries_throttled_posts(self):
+        statuses = itertools.chain([503, 503], itertools.repeat(200))
+
+        def responder(operation, request):
+            return next(statuses), default_responder(operation, request)
+
+        throttle = ThrottleController(backoff=0)
+        limiter = RateLimiter({"read": 100})
+        with MockAXLServer(responder=responder) as server:
+            transport = AXLTransport(
+                session=session(SessionCookieAuth("u", "p")),
+                throttle=throttle,
+                rate_limiter=limiter,
+            )
+            response = transport.post(
+                f"https://127.0.0.1:{server.port}/axl/",
+                b"<listPhone/>",
+                {"SOAPAction": '"CUCM:DB ver=12.5 listPhone"'},
+            )
+
+            assert response.status_code == 200
+            assert server.stats["requests"] == 3
+            assert throttle.state()["retried"] == 2
+            # retries don't take from the budget
+            assert limiter.state()["read"]["requests"] == 1
+            assert transport.last_response_size() == len(response.content)
+
+    def test_streaming(self):
+        headers = {"SOAPAction": '"CUCM:DB ver=12.5 listPhone"'}
+        with MockAXLServer() as server:
+            url = f"https://127.0.0.1:{server.port}/axl/"
+            transport = AXLTransport(session=session(SessionCookieAuth("u", "p")))
+            other = []
+
+            with transport.streaming():
+                response = transport.post(url, b"<listPhone/>", headers)
+                # only the calling thread streams
+                thread = threading.Thread(
+                    target=lambda: other.append(transport.post(url, b"<listPhone/>", headers))
+                )
+                thread.start()
+                thread.join()
+
+            assert not response._content_consumed
+            assert transport.last_response_size() is None
+            body = response.raw.read()
+            response.close()
+            assert b"listPhoneResponse" in body
+            assert other[0]._content_consumed
+
+            transport.record_response_size(len(body))
+            assert transport.last_response_size() == len(body)
+            response = transport.post(url, b"<listPhone/>", headers)
+            assert response._content_consumed
+            assert transport.last_response_size() == len(response.content)